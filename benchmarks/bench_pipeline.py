@@ -0,0 +1,211 @@
+# Per-stage and end-to-end benchmarks of the arbitrage pipeline, compared
+# against benchmarks/baseline.json so regressions show up.
+# Run from the repository root:
+#   python benchmarks/bench_pipeline.py                  # run and compare with the baseline
+#   python benchmarks/bench_pipeline.py --save-baseline  # run and store a new baseline
+#   python benchmarks/bench_pipeline.py --quick          # shorter runs, e.g. in CI
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import fake_exchange  # noqa: E402
+from crypto_arbitrage_bot import clients, market_data, reporting, strategy  # noqa: E402
+from crypto_arbitrage_bot.config import settings  # noqa: E402
+from crypto_arbitrage_bot.price_fetcher import ConcurrentPriceFetcher  # noqa: E402
+from crypto_arbitrage_bot.pricing import calculate_profit, is_arbitrage_opportunity  # noqa: E402
+from crypto_arbitrage_bot.trade_journal import JOURNAL_HEADER, TradeJournal  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.3  # fraction a result may worsen before it counts as a regression
+# Noisier benchmarks get more room: sub-microsecond calls move with CPU
+# frequency and cache state, thread hand-offs and tail latency with whatever
+# else is running
+TOLERANCES = {
+    'calculate_profit': 1.0,
+    'is_arbitrage_opportunity_miss': 1.0,
+    'is_arbitrage_opportunity_hit': 1.0,
+    'fetch_pair_mocked': 1.0,
+    'journal_append': 0.5,
+    'journal_rows_per_second': 0.5,
+    'end_to_end_tick_p99': 0.5,
+}
+REPEATS = 5  # microbenchmarks report the fastest of this many runs
+
+
+# One measurement; `better` says which direction is an improvement
+def result(value, unit, better='lower'):
+    return {'value': float(f'{value:.6g}'), 'unit': unit, 'better': better}
+
+
+# Fastest of REPEATS runs: the least disturbed one, so the most repeatable
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=REPEATS)) / number * 1e6
+
+
+def bench_pricing(scale):
+    return {
+        'calculate_profit': result(per_call_us(lambda: calculate_profit(50000.0, 50012.5, 0.0005), 200000 // scale), 'us'),
+        'is_arbitrage_opportunity_miss': result(per_call_us(lambda: is_arbitrage_opportunity(50000.0, 50004.0, 10), 200000 // scale), 'us'),
+        'is_arbitrage_opportunity_hit': result(per_call_us(lambda: is_arbitrage_opportunity(50000.0, 50040.0, 10), 200000 // scale), 'us'),
+    }
+
+
+# Concurrent fetch overhead with in-process clients (no network)
+def bench_price_fetch(scale):
+    fetcher = ConcurrentPriceFetcher({'Binance': lambda: 50000.0, 'KuCoin': lambda: 50010.0})
+    try:
+        return {'fetch_pair_mocked': result(per_call_us(lambda: fetcher.fetch_pair('Binance', 'KuCoin'), 5000 // scale), 'us')}
+    finally:
+        fetcher.close()
+
+
+def journal_row(i):
+    return [f'2024-07-{1 + i % 28:02d} 12:00:00', '$50000.0', '$50012.5', '$12.50', f'${(i % 7 - 3) * 0.01:.2f}',
+            'Successful' if i % 7 > 3 else 'Failed', 'Buy on Binance and sell on Kucoin']
+
+
+# Best of REPEATS fresh journals
+def bench_journal(directory, scale):
+    rows = 20000 // scale
+    best_queued = best_written = None
+    for repeat in range(REPEATS):
+        journal = TradeJournal(os.path.join(directory, f'bench_journal_{repeat}.csv')).start()
+        started = time.perf_counter()
+        for i in range(rows):
+            journal.append(journal_row(i))
+        queued = time.perf_counter() - started
+        journal.flush()
+        written = time.perf_counter() - started
+        journal.close()
+        best_queued = queued if best_queued is None else min(best_queued, queued)
+        best_written = written if best_written is None else min(best_written, written)
+    return {
+        'journal_append': result(best_queued / rows * 1e6, 'us'),
+        'journal_rows_per_second': result(rows / best_written, 'rows/s', better='higher'),
+    }
+
+
+# calculate_trade_summaries re-reads the whole file, so it grows with the file
+def bench_trade_summaries(directory, scale):
+    results = {}
+    for rows in (1000, 10000, 100000):
+        if scale > 1 and rows == 100000:
+            continue
+        path = os.path.join(directory, f'summaries_{rows}.csv')
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(JOURNAL_HEADER)
+            writer.writerows(journal_row(i) for i in range(rows))
+        number = max(1, 200000 // rows // scale)
+        seconds = min(timeit.repeat(lambda: reporting.calculate_trade_summaries(path), number=number,
+                                    repeat=REPEATS)) / number
+        results[f'calculate_trade_summaries_{rows}_rows'] = result(seconds * 1e3, 'ms')
+    return results
+
+
+# Full execute_arbitrage ticks (HTTP fetch of both tickers, order books on
+# opportunities, inventory check, journal/store/totals) against the fake exchange
+def bench_end_to_end(directory, duration):
+    server, url = fake_exchange.start_server()
+    fake_exchange.install(url)
+    settings.headless = True
+    settings.trading_enabled = False
+    for venue in ('Binance', 'KuCoin'):
+        market_data.inventory.reconcile(venue, {'BTC': (10.0, 0.0), 'USDT': (1e6, 0.0)})
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        strategy.execute_arbitrage()  # warm up connections and open the trade logs
+        latencies = []
+        started = time.perf_counter()
+        while time.perf_counter() - started < duration:
+            tick_started = time.perf_counter()
+            strategy.execute_arbitrage()
+            latencies.append(time.perf_counter() - tick_started)
+        elapsed = time.perf_counter() - started
+        reporting.close_trade_logs()
+    finally:
+        os.chdir(cwd)
+        clients.close()
+        server.shutdown()
+        server.server_close()
+    latencies.sort()
+    return {
+        'end_to_end_ticks_per_second': result(len(latencies) / elapsed, 'ticks/s', better='higher'),
+        'end_to_end_tick_p50': result(latencies[len(latencies) // 2] * 1e3, 'ms'),
+        'end_to_end_tick_p99': result(latencies[int(len(latencies) * 0.99)] * 1e3, 'ms'),
+    }
+
+
+def run(quick=False):
+    scale = 10 if quick else 1
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        results.update(bench_pricing(scale))
+        results.update(bench_price_fetch(scale))
+        results.update(bench_journal(directory, scale))
+        results.update(bench_trade_summaries(directory, scale))
+        results.update(bench_end_to_end(directory, 1.0 if quick else 5.0))
+    return results
+
+
+# Relative change per benchmark, positive when worse than the baseline
+def compare(results, baseline):
+    changes = {}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous['value']:
+            continue
+        change = (current['value'] - previous['value']) / previous['value']
+        changes[name] = change if current['better'] == 'lower' else -change
+    return changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the arbitrage pipeline stages')
+    parser.add_argument('--save-baseline', action='store_true', help=f'write the results to {BASELINE}')
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help='one tolerance for every benchmark instead of the per-benchmark ones')
+    parser.add_argument('--quick', action='store_true', help='fewer iterations and a 1 s end-to-end run')
+    args = parser.parse_args(argv)
+
+    results = run(args.quick)
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as file:
+            baseline = json.load(file).get('results', {})
+    changes = compare(results, baseline)
+
+    print(f"{'benchmark':<40} {'value':>12} {'unit':<8} {'baseline':>12} {'change':>8} {'allowed':>8}")
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name, {}).get('value')
+        change = changes.get(name)
+        flag = ''
+        tolerance = args.tolerance if args.tolerance is not None else TOLERANCES.get(name, DEFAULT_TOLERANCE)
+        if change is not None and change > tolerance:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<40} {current['value']:>12.3f} {current['unit']:<8} "
+              f"{'' if previous is None else f'{previous:.3f}':>12} {'' if change is None else f'{change:+.0%}':>8} {f'{tolerance:.0%}':>8}{flag}")
+
+    if args.save_baseline:
+        with open(BASELINE, 'w') as file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results}, file, indent=2)
+            file.write('\n')
+        print(f'Saved baseline to {BASELINE}')
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) regressed beyond their tolerance: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
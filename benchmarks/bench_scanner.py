@@ -0,0 +1,37 @@
+# Scan time per tick of OpportunityScanner at 10, 100 and 1000 symbols.
+# Run from the repository root: python benchmarks/bench_scanner.py
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from crypto_arbitrage_bot.scanner import OpportunityScanner  # noqa: E402
+
+EXCHANGES = ['Binance', 'KuCoin', 'OKX', 'Kraken', 'Bybit']
+
+
+def build_scanner(n_symbols, seed=0):
+    rng = np.random.default_rng(seed)
+    scanner = OpportunityScanner([f'SYM{i}/USDT' for i in range(n_symbols)], EXCHANGES)
+    mids = rng.uniform(0.01, 60000, size=(n_symbols, 1))
+    noise = rng.normal(0, 0.002, size=(n_symbols, len(EXCHANGES)))
+    scanner.bids[:] = mids * (1 + noise - 0.0002)
+    scanner.asks[:] = mids * (1 + noise + 0.0002)
+    return scanner
+
+
+def main():
+    print(f"{'symbols':>8} {'exchanges':>10} {'pairs':>8} {'scan (us)':>10} {'found':>6}")
+    for n_symbols in (10, 100, 1000):
+        scanner = build_scanner(n_symbols)
+        runs = 200
+        seconds = timeit.timeit(lambda: scanner.scan(min_spread_pct=0.0005, limit=50), number=runs) / runs
+        pairs = n_symbols * len(EXCHANGES) * (len(EXCHANGES) - 1)
+        found = len(scanner.scan(min_spread_pct=0.0005, limit=50))
+        print(f'{n_symbols:>8} {len(EXCHANGES):>10} {pairs:>8} {seconds * 1e6:>10.1f} {found:>6}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Detection throughput of ShardSupervisor with 1, 2, 4 ... worker processes:
+# the supervisor rewrites every symbol's quotes as fast as it can and the
+# workers count the rows they scan. Scaling is bounded by the number of cores.
+# Run from the repository root: python benchmarks/bench_sharding.py [--symbols 4000] [--seconds 3]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from crypto_arbitrage_bot.sharding import ShardSupervisor  # noqa: E402
+
+EXCHANGES = ['Binance', 'KuCoin', 'OKX', 'Kraken', 'Bybit']
+
+
+def ignore(opportunity):
+    pass
+
+
+def measure(n_symbols, workers, seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    symbols = [f'SYM{i}/USDT' for i in range(n_symbols)]
+    rows = np.repeat(np.arange(n_symbols), len(EXCHANGES))
+    columns = np.tile(np.arange(len(EXCHANGES)), n_symbols)
+    mids = np.repeat(rng.uniform(0.01, 60000, size=n_symbols), len(EXCHANGES))
+    supervisor = ShardSupervisor(symbols, EXCHANGES, workers=workers, min_spread_pct=0.0005, handler=ignore)
+    with supervisor:
+        time.sleep(1.0)  # let the spawned workers import and attach
+        before = sum(worker['rows'] for worker in supervisor.stats()['workers'])
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            noise = rng.normal(0, 0.002, size=mids.size)
+            # One exchange column per call keeps the row indices unique
+            for column in range(len(EXCHANGES)):
+                selected = columns == column
+                supervisor.publish_many(rows[selected], column, (mids * (1 + noise - 0.0002))[selected],
+                                        (mids * (1 + noise + 0.0002))[selected])
+        elapsed = time.perf_counter() - started
+        scanned = sum(worker['rows'] for worker in supervisor.stats()['workers']) - before
+    return scanned / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark sharded detection across worker processes')
+    parser.add_argument('--symbols', type=int, default=4000)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1))) or [1]
+    print(f'{cores} cores, {args.symbols} symbols x {len(EXCHANGES)} exchanges')
+    print(f"{'workers':>8} {'rows/s':>12} {'speedup':>8}")
+    single = None
+    for workers in counts:
+        rate = measure(args.symbols, workers, args.seconds)
+        single = single or rate
+        print(f'{workers:>8} {rate:>12.0f} {rate / single:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+# Offline load test and fuzzer of the bot against two simulated exchanges.
+# Each tick moves both venues' order books and runs the bot's own pipeline
+# over them. SDK-shaped clients over the simulated venues sit behind the
+# shared client registry. strategy.execute_arbitrage fetches the quotes and
+# books through the Binance/KuCoin adapters, and orders.execute_trade places
+# both legs through the DualLegExecutor with its client order ids, retries,
+# lookups and unwinds. The simulated calls cost next to nothing, so the
+# figure is the bot's own overhead per tick: about 2,000 ticks/s on a laptop,
+# bounded by the thread-pool handoffs of the concurrent fetches and legs.
+# --fuzz randomises latency, failures (including order responses lost after
+# the order executed), book shapes and clock offsets, and checks after every
+# tick that no balance goes negative and that the local inventory still
+# matches the exchanges when reconciled, except after a trade the executor
+# reported as exposed.
+# --adapters instead times a pure adapter microbenchmark: quotes, books and
+# orders straight on the SimulatedExchange adapters under one event loop,
+# with none of the bot's strategy or order code.
+# Run from the repository root:
+#   python benchmarks/bench_simulated.py [--ticks 20000] [--latency 0]
+#   python benchmarks/bench_simulated.py --fuzz [--seed 1] [--ticks 2000]
+#   python benchmarks/bench_simulated.py --adapters
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from crypto_arbitrage_bot import clients, market_data, orders, strategy  # noqa: E402
+from crypto_arbitrage_bot.config import settings  # noqa: E402
+from crypto_arbitrage_bot.exchanges import ExchangeError, NetworkError, SimulatedExchange  # noqa: E402
+from crypto_arbitrage_bot.exchanges.binance import BINANCE_UNKNOWN_ORDER  # noqa: E402
+from crypto_arbitrage_bot.market_stream import executable_prices  # noqa: E402
+from crypto_arbitrage_bot.pricing import FEE_RATE  # noqa: E402
+from crypto_arbitrage_bot.rate_limiter import RequestScheduler  # noqa: E402
+from crypto_arbitrage_bot.sessions import ExchangeSessionRegistry  # noqa: E402
+
+SYMBOL = 'BTC/USDT'
+BASE, QUOTE = 'BTC', 'USDT'
+START_BALANCES = {BASE: 1.0, QUOTE: 50000.0}
+
+
+# Function to run a SimulatedExchange call to completion on the calling
+# thread, as a blocking SDK call would. The exchanges sleep with
+# blocking_sleep, so their coroutines never suspend.
+def settle(coroutine):
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    coroutine.close()
+    raise RuntimeError('simulated exchange call suspended')
+
+
+async def blocking_sleep(delay):
+    time.sleep(delay)
+
+
+# Two simulated venues whose prices drift apart often enough, past the fees,
+# for trades to happen
+class Simulation:
+    def __init__(self, seed=0, fuzz=False, latency=0.0, sleep=asyncio.sleep):
+        self.rng = random.Random(seed)
+        self.fuzz = fuzz
+        self.price = 50000.0
+        self.offset = 0.0
+        self.venues = [self.exchange('Binance', latency, seed, sleep),
+                       self.exchange('KuCoin', latency, seed + 1, sleep)]
+        self.violations = []
+
+    # The venues charge pricing.FEE_RATE, the fee the order code books fills with
+    def exchange(self, venue, latency, seed, sleep):
+        if not self.fuzz:
+            return SimulatedExchange(venue, fee_rate=FEE_RATE, latency=latency, balances=START_BALANCES, seed=seed,
+                                     sleep=sleep)
+        return SimulatedExchange(venue, fee_rate=FEE_RATE,
+                                 latency=self.rng.choice([0.0, 0.0, 0.0001]), jitter=self.rng.choice([0.0, 0.0002]),
+                                 error_rate=self.rng.choice([0.0, 0.01, 0.05]), clock_offset=self.rng.uniform(-0.5, 0.5),
+                                 balances=START_BALANCES, seed=seed, sleep=sleep)
+
+    # Random walk of the price, with KuCoin drifting around Binance
+    def move(self):
+        self.price += self.rng.gauss(0, 2)
+        self.offset = 0.9 * self.offset + self.rng.gauss(0, 60)
+        for venue, mid in zip(self.venues, (self.price, self.price + self.offset)):
+            if self.fuzz:
+                venue.set_mid(SYMBOL, mid, spread=self.rng.uniform(0.01, 5), levels=self.rng.randint(1, 20),
+                              size=self.rng.uniform(0.001, 0.2), tick=self.rng.uniform(0.01, 2))
+            else:
+                venue.set_mid(SYMBOL, mid)
+
+
+# Pure adapter microbenchmark: per tick, both quotes and both books
+# concurrently, and a small buy and sell when the quotes cross. It exercises
+# the adapter interface and the simulated matching only, none of the bot's
+# decisions.
+class AdapterRun(Simulation):
+    def __init__(self, seed=0, latency=0.0, quantity=0.001):
+        super().__init__(seed, latency=latency)
+        self.quantity = quantity
+        self.counts = {'ticks': 0, 'orders': 0, 'errors': 0}
+
+    async def tick(self):
+        self.move()
+        self.counts['ticks'] += 1
+        binance, kucoin = self.venues
+        try:
+            quotes = await asyncio.gather(binance.fetch_quote(SYMBOL), kucoin.fetch_quote(SYMBOL))
+            await asyncio.gather(binance.fetch_order_book(SYMBOL), kucoin.fetch_order_book(SYMBOL))
+            trade = executable_prices(*quotes)
+            if trade is None:
+                return
+            buyer, seller = (binance, kucoin) if trade[0] == 'Binance' else (kucoin, binance)
+            await asyncio.gather(buyer.create_order(SYMBOL, 'buy', self.quantity),
+                                 seller.create_order(SYMBOL, 'sell', self.quantity))
+            self.counts['orders'] += 2
+        except ExchangeError:
+            self.counts['errors'] += 1
+
+    async def _run(self, ticks):
+        started = time.perf_counter()
+        for _ in range(ticks):
+            await self.tick()
+        return time.perf_counter() - started
+
+    # Returns the seconds the ticks took
+    def run(self, ticks):
+        return asyncio.run(self._run(ticks))
+
+
+class BinanceAPIException(ExchangeError):
+    def __init__(self, code, message):
+        super().__init__(f'APIError(code={code}): {message}')
+        self.code = code
+
+
+class OrderNotFound(ExchangeError):
+    pass
+
+
+# Stand-ins for the python-binance and ccxt clients over a SimulatedExchange.
+# Every call goes through the exchange's latency and failure simulation;
+# lost_rate additionally loses the response of an order that did execute,
+# which the order code has to settle by looking the order up by client id.
+class SimulatedClient:
+    def __init__(self, exchange, lost_rate=0.0, seed=None):
+        self.exchange = exchange
+        self.lost_rate = lost_rate
+        self.rng = random.Random(seed)
+        self.orders = {}  # client order id and exchange order id -> order
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _book(self, limit):
+        book = settle(self.exchange.fetch_order_book(SYMBOL, limit))
+        return {'bids': [list(level) for level in book.bids()], 'asks': [list(level) for level in book.asks()]}
+
+    def _balances(self):
+        return settle(self.exchange.fetch_balances())
+
+    def _order(self, side, quantity, client_id):
+        fill = settle(self.exchange.create_order(SYMBOL, side, quantity))
+        order_id = next(self._ids)
+        order = self.acknowledge(order_id, client_id, fill)
+        with self._lock:
+            self.orders[order_id] = self.orders[client_id] = order
+        if self.lost_rate and self.rng.random() < self.lost_rate:
+            raise NetworkError(f'{self.exchange.venue} order response lost')
+        return order
+
+    def _lookup(self, key):
+        if self.exchange.error_rate and self.rng.random() < self.exchange.error_rate:
+            raise NetworkError(f'{self.exchange.venue} simulated network failure')
+        with self._lock:
+            return self.orders.get(key)
+
+
+class SimulatedBinanceClient(SimulatedClient):
+    def get_ticker(self, symbol):
+        quote = settle(self.exchange.fetch_quote(SYMBOL))
+        return {'symbol': symbol, 'bidPrice': str(quote.bid), 'askPrice': str(quote.ask),
+                'closeTime': int(quote.exchange_ts * 1000)}
+
+    def get_order_book(self, symbol, limit=20):
+        return self._book(limit)
+
+    def get_account(self):
+        return {'balances': [{'asset': asset, 'free': str(free), 'locked': str(locked)}
+                             for asset, (free, locked) in self._balances().items()]}
+
+    def create_order(self, symbol, side, type, quantity, newClientOrderId=None, **params):
+        return self._order(side.lower(), quantity, newClientOrderId)
+
+    def get_order(self, symbol, origClientOrderId):
+        order = self._lookup(origClientOrderId)
+        if order is None:
+            raise BinanceAPIException(BINANCE_UNKNOWN_ORDER, 'Order does not exist.')
+        return order
+
+    @staticmethod
+    def acknowledge(order_id, client_id, fill):
+        return {'symbol': 'BTCUSDT', 'orderId': order_id, 'clientOrderId': client_id,
+                'status': 'FILLED' if fill.status == 'filled' else 'PARTIALLY_FILLED',
+                'executedQty': repr(fill.quantity), 'cummulativeQuoteQty': repr(fill.quantity * fill.price)}
+
+
+class SimulatedKucoinClient(SimulatedClient):
+    def fetch_ticker(self, symbol):
+        quote = settle(self.exchange.fetch_quote(symbol))
+        return {'symbol': symbol, 'bid': quote.bid, 'ask': quote.ask, 'timestamp': int(quote.exchange_ts * 1000)}
+
+    def fetch_order_book(self, symbol, limit=20):
+        return self._book(limit)
+
+    def fetch_balance(self):
+        balances = self._balances()
+        return {'free': {asset: free for asset, (free, _) in balances.items()},
+                'used': {asset: locked for asset, (_, locked) in balances.items()},
+                'total': {asset: free + locked for asset, (free, locked) in balances.items()}}
+
+    # Like ccxt, the acknowledgement carries the order id only
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        order = self._order(side, amount, (params or {}).get('clientOid'))
+        return {'id': order['id'], 'clientOrderId': order['clientOrderId'], 'filled': None, 'average': None}
+
+    def fetch_order(self, id, symbol=None, params=None):
+        order = self._lookup(id if id is not None else (params or {}).get('clientOid'))
+        if order is None:
+            raise OrderNotFound(f'kucoin order {id or params} not found')
+        return order
+
+    @staticmethod
+    def acknowledge(order_id, client_id, fill):
+        return {'id': str(order_id), 'clientOrderId': client_id, 'symbol': SYMBOL, 'status': 'closed',
+                'filled': fill.quantity, 'average': fill.price, 'fee': {'cost': fill.fee, 'currency': QUOTE}}
+
+
+# Engine stand-in for the bot pipeline: what the strategy posts runs at once
+# on the calling thread, so every tick finishes its trade before the next
+# one. Reporting is counted rather than written to the trade logs.
+class InlineEngine:
+    def __init__(self, run):
+        self.run = run
+
+    def post(self, lane, fn, *args, **kwargs):
+        if lane == 'reporting':
+            self.run.counts['opportunities'] += 1
+            return
+        result = fn(*args, **kwargs)
+        if fn is orders.execute_trade and result is not None:
+            self.run.on_report(result)
+
+
+# The bot's own strategy and order code over the simulated venues
+class BotRun(Simulation):
+    def __init__(self, seed=0, fuzz=False, latency=0.0, reconcile_every=50):
+        super().__init__(seed, fuzz, latency, sleep=blocking_sleep)
+        self.reconcile_every = reconcile_every
+        lost_rate = self.rng.choice([0.0, 0.01, 0.05]) if fuzz else 0.0
+        binance, kucoin = self.venues
+        self.clients = {'Binance': SimulatedBinanceClient(binance, lost_rate, seed),
+                        'KuCoin': SimulatedKucoinClient(kucoin, lost_rate, seed + 1)}
+        self.inventory = market_data.inventory
+        self.counts = {'ticks': 0, 'opportunities': 0, 'trades': 0, 'legs': 0, 'unwinds': 0, 'unknown': 0,
+                       'exposed': 0}
+
+    # Point the shared clients at the simulated venues, without rate limits or backoff
+    def install(self):
+        registry = ExchangeSessionRegistry()
+        for venue, client in self.clients.items():
+            registry.register(venue, lambda http, client=client: client)
+            clients.use_scheduler(venue, RequestScheduler(venue, {name: (1e9, 1) for name in clients.VENUE_LIMITS[venue]},
+                                                          base_delay=0.0, max_delay=0.0))
+        clients.use_sessions(registry)
+        settings.trading_enabled = True
+        settings.headless = True
+        strategy.engine = InlineEngine(self)
+        market_data.get_price_fetcher()  # built after the settings above
+        self.inventory.drift_tolerance = 1e-6
+
+    def uninstall(self):
+        market_data._price_fetcher.close()
+        market_data._price_fetcher = None
+        clients.close()
+
+    def on_report(self, report):
+        self.counts['trades'] += 1
+        self.counts['legs'] += report.buy.ok + report.sell.ok
+        self.counts['unwinds'] += report.unwind is not None
+        self.counts['unknown'] += report.buy.unknown + report.sell.unknown
+        if report.exposed:
+            # A leg may have filled unseen: the bot would reconcile, and so do we
+            self.counts['exposed'] += 1
+            self.resync()
+
+    def resync(self):
+        for venue in self.venues:
+            while True:
+                try:
+                    self.inventory.reconcile(venue.venue, settle(venue.fetch_balances()))
+                    break
+                except ExchangeError:
+                    continue
+
+    def check_balances(self):
+        for venue in self.venues:
+            for asset, (free, locked) in venue._balances.items():
+                if free < -1e-9 or locked < -1e-9:
+                    self.violations.append(f'tick {self.counts["ticks"]}: {venue.venue} {asset} went negative: {free}')
+
+    # Invariants checked in --fuzz mode
+    def check(self):
+        self.check_balances()
+        if self.counts['ticks'] % self.reconcile_every:
+            return
+        for venue in self.venues:
+            try:
+                balances = settle(venue.fetch_balances())
+            except ExchangeError:
+                continue
+            drift = self.inventory.reconcile(venue.venue, balances)
+            if drift:
+                self.violations.append(f'tick {self.counts["ticks"]}: {venue.venue} inventory drifted {drift}')
+
+    def run(self, ticks):
+        self.install()
+        try:
+            self.resync()
+            started = time.perf_counter()
+            for _ in range(ticks):
+                self.move()
+                self.counts['ticks'] += 1
+                strategy.execute_arbitrage()
+                if self.fuzz:
+                    self.check()
+            elapsed = time.perf_counter() - started
+            self.counts['dropped'] = sum(market_data.get_price_fetcher().guard.dropped.values())
+            return elapsed
+        finally:
+            self.uninstall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test or fuzz the bot against simulated exchanges')
+    parser.add_argument('--ticks', type=int, default=None, help='ticks per run (default 20000, 2000 with --fuzz)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds each simulated request takes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fuzz', action='store_true', help='randomise the venues and check invariants')
+    parser.add_argument('--runs', type=int, default=5, help='independent seeds to fuzz')
+    parser.add_argument('--adapters', action='store_true', help='time the adapters alone, without the bot')
+    args = parser.parse_args(argv)
+    ticks = args.ticks or (2000 if args.fuzz else 20000)
+    # The bot logs every opportunity and injected failure; only the summary matters here
+    logging.basicConfig(level=logging.CRITICAL)
+
+    failures = 0
+    for seed in range(args.seed, args.seed + (args.runs if args.fuzz else 1)):
+        if args.adapters:
+            run = AdapterRun(seed=seed, latency=args.latency)
+        else:
+            run = BotRun(seed=seed, fuzz=args.fuzz, latency=args.latency)
+        elapsed = run.run(ticks)
+        counts = ' '.join(f'{name}={count}' for name, count in run.counts.items())
+        print(f'seed {seed}: {run.counts["ticks"] / elapsed:,.0f} ticks/s ({counts})')
+        for violation in run.violations[:10]:
+            print(f'  {violation}')
+        failures += bool(run.violations)
+    if args.fuzz:
+        print('invariants held' if not failures else f'{failures} run(s) violated invariants')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
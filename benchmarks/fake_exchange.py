@@ -0,0 +1,112 @@
+# Local fake Binance/KuCoin REST server and matching clients for benchmarks.
+# Prices follow a random walk; KuCoin sometimes drifts far enough from Binance
+# for the strategy to see an opportunity.
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from crypto_arbitrage_bot import clients  # noqa: E402
+from crypto_arbitrage_bot.rate_limiter import RequestScheduler  # noqa: E402
+from crypto_arbitrage_bot.sessions import ExchangeSessionRegistry  # noqa: E402
+
+
+class Market:
+    def __init__(self, price=50000.0, seed=0):
+        self.price = price
+        self.kucoin_offset = 0.0
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def prices(self):
+        with self.lock:
+            self.price += self.rng.gauss(0, 2)
+            self.kucoin_offset = 0.9 * self.kucoin_offset + self.rng.gauss(0, 4)
+            return round(self.price, 2), round(self.price + self.kucoin_offset, 2)
+
+    def book(self, mid, depth):
+        bids = [[f'{mid - 0.5 - i:.2f}', f'{0.01 * (i + 1):.5f}'] for i in range(depth)]
+        asks = [[f'{mid + 0.5 + i:.2f}', f'{0.01 * (i + 1):.5f}'] for i in range(depth)]
+        return {'bids': bids, 'asks': asks}
+
+
+class FakeExchangeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real APIs
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    market = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        binance_price, kucoin_price = self.market.prices()
+        depth = int(query.get('limit', ['20'])[0])
+        routes = {
+            '/binance/ticker': lambda: {'symbol': 'BTCUSDT', 'lastPrice': str(binance_price), 'bidPrice': f'{binance_price - 0.5:.2f}',
+                                        'askPrice': f'{binance_price + 0.5:.2f}', 'closeTime': int(time.time() * 1000)},
+            '/binance/depth': lambda: self.market.book(binance_price, depth),
+            '/kucoin/ticker': lambda: {'symbol': 'BTC/USDT', 'last': kucoin_price, 'bid': round(kucoin_price - 0.5, 2),
+                                       'ask': round(kucoin_price + 0.5, 2), 'timestamp': int(time.time() * 1000)},
+            '/kucoin/depth': lambda: self.market.book(kucoin_price, depth),
+        }
+        if url.path not in routes:
+            self.send_error(404)
+            return
+        body = json.dumps(routes[url.path]()).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(seed=0):
+    handler = type('Handler', (FakeExchangeHandler,), {'market': Market(seed=seed)})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+# Minimal stand-ins for the python-binance and ccxt clients the bot calls
+class FakeBinanceClient:
+    def __init__(self, http, url):
+        self.http = http
+        self.url = url
+
+    def get_ticker(self, symbol):
+        return self.http.get(f'{self.url}/binance/ticker', params={'symbol': symbol}).json()
+
+    def get_order_book(self, symbol, limit=20):
+        return self.http.get(f'{self.url}/binance/depth', params={'symbol': symbol, 'limit': limit}).json()
+
+
+class FakeKucoinClient:
+    def __init__(self, http, url):
+        self.http = http
+        self.url = url
+
+    def fetch_ticker(self, symbol):
+        return self.http.get(f'{self.url}/kucoin/ticker', params={'symbol': symbol}).json()
+
+    def fetch_order_book(self, symbol, limit=20):
+        return self.http.get(f'{self.url}/kucoin/depth', params={'symbol': symbol, 'limit': limit}).json()
+
+
+# Point the bot's shared clients at the fake server. Rate limits are lifted so
+# the benchmark measures the pipeline rather than the token buckets.
+def install(url):
+    registry = ExchangeSessionRegistry()
+    registry.register('Binance', lambda http: FakeBinanceClient(http, url))
+    registry.register('KuCoin', lambda http: FakeKucoinClient(http, url))
+    clients.use_sessions(registry)
+    for venue in ('Binance', 'KuCoin'):
+        clients.use_scheduler(venue, RequestScheduler(venue, {name: (1e9, 1) for name in clients.VENUE_LIMITS[venue]}))
+    return registry
@@ -0,0 +1,2 @@
+# Supporting subsystems for the crypto arbitrage bot (see bot.py)
+__version__ = '0.1.0'
@@ -0,0 +1,3 @@
+from crypto_arbitrage_bot.main import main
+
+main()
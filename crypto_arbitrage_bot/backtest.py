@@ -0,0 +1,299 @@
+import argparse
+import csv
+import itertools
+import logging
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from crypto_arbitrage_bot.pricing import FEE_RATE, calculate_position_size, evaluate_opportunity
+from crypto_arbitrage_bot.trade_totals import TIME_FORMAT, PeriodTotals, daily_key
+
+# Binary tick files: an 8-byte magic followed by little-endian float64 triples
+# (unix timestamp, Binance price, KuCoin price), 24 bytes per tick
+TICK_MAGIC = b'CABTICK1'
+TICK_FIELDS = 3
+TICK_SIZE = TICK_FIELDS * 8
+CHUNK_TICKS = 65536
+
+
+# Function to read ticks from a CSV file. Accepts recorded tick CSVs
+# (timestamp, binance_price, kucoin_price) with unix or TIME_FORMAT timestamps,
+# and the bot's own trade logs/journal ("Time", "$58788.25", ...)
+def read_csv_ticks(path):
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        for row in reader:
+            if not row:
+                continue
+            try:
+                binance_price = float(row[1].lstrip('$'))
+                kucoin_price = float(row[2].lstrip('$'))
+            except (IndexError, ValueError):
+                continue  # header or malformed row
+            try:
+                timestamp = float(row[0])
+            except ValueError:
+                timestamp = time.mktime(datetime.strptime(row[0], TIME_FORMAT).timetuple())
+            yield timestamp, binance_price, kucoin_price
+
+
+# Function to read ticks from a binary tick file in large chunks. A tick the
+# recorder was still writing when it stopped is dropped.
+def read_binary_ticks(path, chunk_ticks=CHUNK_TICKS):
+    with open(path, 'rb') as file:
+        if file.read(len(TICK_MAGIC)) != TICK_MAGIC:
+            raise ValueError(f"{path} is not a tick file")
+        while True:
+            data = file.read(chunk_ticks * TICK_SIZE)
+            values = array('d')
+            values.frombytes(data[:len(data) - len(data) % TICK_SIZE])
+            if not values:
+                return
+            if sys.byteorder == 'big':
+                values.byteswap()
+            it = iter(values)
+            yield from zip(it, it, it)
+
+
+# Function to read ticks from either format, chosen by the file's magic bytes
+def read_ticks(path):
+    with open(path, 'rb') as file:
+        is_binary = file.read(len(TICK_MAGIC)) == TICK_MAGIC
+    return read_binary_ticks(path) if is_binary else read_csv_ticks(path)
+
+
+# Appends (timestamp, Binance price, KuCoin price) ticks to a binary tick file,
+# buffering in memory and writing in blocks
+class TickRecorder:
+    def __init__(self, path, buffer_ticks=1024):
+        self.path = path
+        self.buffer_ticks = buffer_ticks
+        self.ticks_written = 0
+        self._buffer = array('d')
+        self._file = open(path, 'ab')
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(TICK_MAGIC)
+        elif (size - len(TICK_MAGIC)) % TICK_SIZE:
+            # Cut off a torn last tick so new ticks stay aligned
+            self._file.truncate(size - (size - len(TICK_MAGIC)) % TICK_SIZE)
+
+    def record(self, timestamp, binance_price, kucoin_price):
+        self._buffer.extend((timestamp, binance_price, kucoin_price))
+        if len(self._buffer) >= self.buffer_ticks * TICK_FIELDS:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if sys.byteorder == 'big':
+            self._buffer.byteswap()
+        self._file.write(self._buffer.tobytes())
+        self._file.flush()
+        self.ticks_written += len(self._buffer) // TICK_FIELDS
+        self._buffer = array('d')
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+# Function to convert a CSV tick file (or trade log) to the binary format
+def convert_csv_to_binary(csv_path, binary_path):
+    if os.path.exists(binary_path):
+        os.remove(binary_path)
+    recorder = TickRecorder(binary_path, buffer_ticks=CHUNK_TICKS)
+    for tick in read_csv_ticks(csv_path):
+        recorder.record(*tick)
+    recorder.close()
+    return recorder.ticks_written
+
+
+# Clock driven by the replayed ticks instead of wall time; callable like
+# time.monotonic so it can be passed as `clock=` to the bot's components
+class SimulatedClock:
+    __slots__ = ('now',)
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance_to(self, timestamp):
+        if timestamp > self.now:
+            self.now = timestamp
+
+
+# Strategy parameters, defaulting to the values evaluate_arbitrage uses live
+class BacktestParams:
+    __slots__ = ('threshold', 'fee_rate', 'slippage_rate', 'capital', 'allocation_percentage', 'tick_interval')
+
+    def __init__(self, threshold=10, fee_rate=FEE_RATE, slippage_rate=0.0, capital=50,
+                 allocation_percentage=50, tick_interval=0.0):
+        self.threshold = threshold
+        self.fee_rate = fee_rate
+        self.slippage_rate = slippage_rate
+        self.capital = capital
+        self.allocation_percentage = allocation_percentage
+        self.tick_interval = tick_interval  # minimum simulated seconds between evaluations
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return 'BacktestParams(' + ', '.join(f'{k}={v}' for k, v in self.to_dict().items()) + ')'
+
+
+class BacktestResult:
+    __slots__ = ('params', 'ticks', 'evaluated', 'opportunities', 'stop_losses', 'totals', 'daily', 'start', 'end',
+                 'elapsed')
+
+    def __init__(self, params):
+        self.params = params
+        self.ticks = 0
+        self.evaluated = 0
+        self.opportunities = 0
+        self.stop_losses = 0
+        self.totals = PeriodTotals('all')
+        self.daily = {}
+        self.start = None
+        self.end = None
+        self.elapsed = 0.0  # wall-clock seconds spent replaying
+
+    @property
+    def total_profit(self):
+        return self.totals.total_profit
+
+    @property
+    def ticks_per_second(self):
+        return self.ticks / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (f'BacktestResult(ticks={self.ticks}, opportunities={self.opportunities}, '
+                f'successful={self.totals.successful_trades}, profit={self.total_profit:.4f})')
+
+
+# Replays ticks through the live decision (pricing.evaluate_opportunity, the
+# same call evaluate_arbitrage makes) on a simulated clock, buying on the
+# cheaper venue. Only the quoted-price sizing is replayed: recorded ticks
+# carry no depth, and there is no inventory to check.
+class Backtest:
+    def __init__(self, params=None, clock=None):
+        self.params = params or BacktestParams()
+        self.clock = clock or SimulatedClock()
+
+    def run(self, ticks):
+        params = self.params
+        result = BacktestResult(params)
+        clock = self.clock
+        threshold = params.threshold
+        fee_rate = params.fee_rate
+        slippage_rate = params.slippage_rate
+        tick_interval = params.tick_interval
+        position_value = calculate_position_size(params.capital, params.allocation_percentage)
+        totals = result.totals
+        daily = result.daily
+        next_evaluation = float('-inf')
+        count = 0
+        started = time.perf_counter()
+        for timestamp, binance_price, kucoin_price in ticks:
+            count += 1
+            clock.advance_to(timestamp)
+            if timestamp < next_evaluation:
+                continue
+            next_evaluation = timestamp + tick_interval
+            result.evaluated += 1
+            if result.start is None:
+                result.start = timestamp
+            if binance_price <= kucoin_price:
+                opportunity = evaluate_opportunity('Binance', binance_price, 'KuCoin', kucoin_price, threshold,
+                                                   position_value, fee_rate, slippage_rate)
+            else:
+                opportunity = evaluate_opportunity('KuCoin', kucoin_price, 'Binance', binance_price, threshold,
+                                                   position_value, fee_rate, slippage_rate)
+            if opportunity is None:
+                continue
+            result.opportunities += 1
+            if opportunity.stop_loss:
+                result.stop_losses += 1
+                continue
+            profit = opportunity.profit
+            totals.add(profit)
+            day = daily_key(datetime.fromtimestamp(clock.now))
+            period = daily.get(day)
+            if period is None:
+                period = daily[day] = PeriodTotals(day)
+            period.add(profit)
+        result.ticks = count
+        result.end = clock.now if count else None
+        result.elapsed = time.perf_counter() - started
+        return result
+
+
+# Function to backtest one parameter set against a tick file (run in pool workers)
+def run_backtest(path, params):
+    return Backtest(params).run(read_ticks(path))
+
+
+# Function to expand {'threshold': [5, 10], 'fee_rate': [0.001]} into BacktestParams
+def parameter_grid(grid):
+    names = list(grid)
+    return [BacktestParams(**dict(zip(names, values))) for values in itertools.product(*(grid[n] for n in names))]
+
+
+# Function to run every parameter combination of `grid` against the tick file
+# across a process pool; each worker streams the file itself. Results are
+# returned in grid order.
+def sweep(path, grid, processes=None):
+    param_sets = parameter_grid(grid)
+    if processes == 1 or len(param_sets) == 1:
+        return [run_backtest(path, params) for params in param_sets]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(run_backtest, itertools.repeat(path), param_sets))
+
+
+def format_results(results):
+    lines = [f"{'threshold':>9} {'fee':>8} {'slippage':>8} {'interval':>8} {'opps':>8} {'wins':>8} {'profit':>12} {'ticks/s':>12}"]
+    for result in results:
+        p = result.params
+        lines.append(f'{p.threshold:>9} {p.fee_rate:>8} {p.slippage_rate:>8} {p.tick_interval:>8} '
+                     f'{result.opportunities:>8} {result.totals.successful_trades:>8} '
+                     f'{result.total_profit:>12.4f} {result.ticks_per_second:>12.0f}')
+    return '\n'.join(lines)
+
+
+# Command line: python -m crypto_arbitrage_bot.backtest ticks.bin --threshold 5 10 20
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay recorded ticks through the arbitrage strategy')
+    parser.add_argument('path', help='tick file (binary, CSV, or a trade log CSV)')
+    parser.add_argument('--threshold', type=float, nargs='+', default=[10])
+    parser.add_argument('--fee-rate', type=float, nargs='+', default=[FEE_RATE])
+    parser.add_argument('--slippage-rate', type=float, nargs='+', default=[0.0])
+    parser.add_argument('--tick-interval', type=float, nargs='+', default=[0.0])
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--convert', metavar='OUT', help='convert the CSV file to the binary format and exit')
+    args = parser.parse_args(argv)
+
+    if args.convert:
+        count = convert_csv_to_binary(args.path, args.convert)
+        print(f'Wrote {count} ticks to {args.convert}')
+        return
+    grid = {
+        'threshold': args.threshold,
+        'fee_rate': args.fee_rate,
+        'slippage_rate': args.slippage_rate,
+        'tick_interval': args.tick_interval,
+    }
+    logging.disable(logging.INFO)  # opportunity logging would dominate the replay
+    results = sweep(args.path, grid, args.processes)
+    results.sort(key=lambda result: result.total_profit, reverse=True)
+    print(format_results(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+
+STATE_DIR = 'state'
+SNAPSHOT_FILE = 'snapshot.json'
+WAL_FILE = 'wal.jsonl'
+
+_FLUSH = object()
+_COMPACT = object()
+_CLOSE = object()
+
+
+def empty_state():
+    return {'counters': {}, 'orders': {}, 'inventory': {}, 'totals': {}}
+
+
+# Function to apply one WAL record to a state dict. Kinds:
+#   counters      {name: delta}
+#   order_open    {'id': ..., ...}           an order (or trade) that may be live on an exchange
+#   order_update  {'id': ..., field: value}
+#   order_closed  {'id': ...}
+#   balances      {'venue': ..., 'balances': {asset: [free, locked]}, 'replace': bool}
+#   totals        {period: {'key': ..., 'total_profit': ..., ...}}   running period totals
+def apply_record(state, kind, data):
+    if kind == 'counters':
+        counters = state['counters']
+        for name, delta in data.items():
+            counters[name] = counters.get(name, 0) + delta
+    elif kind == 'order_open':
+        state['orders'][data['id']] = dict(data)
+    elif kind == 'order_update':
+        state['orders'].setdefault(data['id'], {}).update(data)
+    elif kind == 'order_closed':
+        state['orders'].pop(data['id'], None)
+    elif kind == 'balances':
+        if data.get('replace'):
+            state['inventory'][data['venue']] = {}
+        state['inventory'].setdefault(data['venue'], {}).update(data['balances'])
+    elif kind == 'totals':
+        state.setdefault('totals', {}).update(data)
+    else:
+        raise ValueError(f"Unknown state record kind {kind!r}")
+
+
+def _fsync_directory(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # not supported on this platform
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Crash-safe bot state: a compact JSON snapshot plus an append-only write-ahead
+# log of the changes since. record() applies a change in memory and queues one
+# JSON line; a background writer appends the lines in batches (fsynced, off
+# the trading threads) and every `compact_every` records folds the log into a
+# new snapshot, written to a temporary file and renamed into place. Each record
+# carries a sequence number, so records already in the snapshot are skipped on
+# replay even if the bot stopped between the rename and the log truncation.
+class StateStore:
+    def __init__(self, directory=STATE_DIR, compact_every=10000, max_batch=500, flush_interval=0.2, fsync=True):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.wal_path = os.path.join(directory, WAL_FILE)
+        self.compact_every = compact_every
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.state = empty_state()
+        self.seq = 0
+        self.snapshot_seq = 0
+        self.wal_records = 0      # records in the log file
+        self.compactions = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    # Load the snapshot and replay the log records after it; returns the state.
+    # A torn last line (the bot stopped mid-write) ends the replay and is cut
+    # off so later appends start on a clean line.
+    def restore(self):
+        state, seq = empty_state(), 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path) as file:
+                snapshot = json.load(file)
+            # Sections added since the snapshot was written start empty
+            state, seq = dict(empty_state(), **snapshot['state']), snapshot['seq']
+        snapshot_seq = seq
+        records = 0
+        if os.path.exists(self.wal_path):
+            with open(self.wal_path, 'rb+') as file:
+                good = 0
+                for line in file:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError('incomplete line')
+                        record = json.loads(line)
+                    except ValueError:
+                        logging.warning(f"Truncating torn state log record at byte {good} of {self.wal_path}")
+                        file.truncate(good)
+                        break
+                    good += len(line)
+                    records += 1
+                    if record['seq'] <= seq:
+                        continue
+                    apply_record(state, record['kind'], record['data'])
+                    seq = record['seq']
+        with self._lock:
+            self.state, self.seq, self.snapshot_seq, self.wal_records = state, seq, snapshot_seq, records
+        return state
+
+    def start(self):
+        if self._thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name='state-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    # Apply a change and queue it for the log; returns immediately
+    def record(self, kind, data):
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            apply_record(self.state, kind, data)
+            self.seq += 1
+            # Serialized now, under the lock, so the log order matches the state and later mutation of data cannot leak in
+            self._queue.put(json.dumps({'seq': self.seq, 'kind': kind, 'data': data}, separators=(',', ':')) + '\n')
+
+    # Copy of a state section, e.g. snapshot('counters')
+    def snapshot(self, section):
+        with self._lock:
+            return json.loads(json.dumps(self.state[section]))
+
+    def _control(self, item):
+        if self._thread is not None:
+            done = threading.Event()
+            self._queue.put((item, done))
+            done.wait()
+
+    # Block until every record queued so far is on disk
+    def flush(self):
+        self._control(_FLUSH)
+
+    # Fold the log into a new snapshot now
+    def compact(self):
+        self._control(_COMPACT)
+
+    # Flush, compact (so the next start reads one small file) and stop the writer
+    def close(self):
+        if self._thread is not None:
+            self._control(_CLOSE)
+            self._thread.join()
+            self._thread = None
+
+    def _write_snapshot(self):
+        with self._lock:
+            data = json.dumps({'seq': self.seq, 'state': self.state}, separators=(',', ':'))
+            seq = self.seq
+        tmp_path = f'{self.snapshot_path}.tmp'
+        with open(tmp_path, 'w') as file:
+            file.write(data)
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        if self.fsync:
+            _fsync_directory(self.directory)
+        return seq
+
+    def _run(self):
+        file = open(self.wal_path, 'ab')
+        try:
+            batch = []
+            deadline = None
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                control = item[0] if isinstance(item, tuple) else None
+                if isinstance(item, str):
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    if len(batch) < self.max_batch:
+                        continue
+                if batch:
+                    try:
+                        file.write(''.join(batch).encode())
+                        file.flush()
+                        if self.fsync:
+                            os.fsync(file.fileno())
+                        self.wal_records += len(batch)
+                    except OSError as e:
+                        logging.error(f"Error writing state log {self.wal_path}: {e}")
+                    batch = []
+                    deadline = None
+                if control in (_COMPACT, _CLOSE) or self.wal_records >= self.compact_every:
+                    try:
+                        self.snapshot_seq = self._write_snapshot()
+                        # Everything up to snapshot_seq is in the snapshot; records queued
+                        # after it go to the fresh log and are skipped on replay if older
+                        file.close()
+                        file = open(self.wal_path, 'wb')
+                        self.wal_records = 0
+                        self.compactions += 1
+                    except OSError as e:
+                        logging.error(f"Error compacting state into {self.snapshot_path}: {e}")
+                if control is not None:
+                    item[1].set()
+                    if control is _CLOSE:
+                        return
+        finally:
+            file.close()
+
+
+# Opened by open_state(); record() does nothing until then
+state_store = None
+
+
+# Function to restore the state from `directory` and start recording; returns the restored state
+def open_state(directory=STATE_DIR, **kwargs):
+    global state_store
+    close_state()
+    started = time.perf_counter()
+    store = StateStore(directory, **kwargs)
+    state = store.restore()
+    store.start()
+    state_store = store
+    logging.info(f"Restored state from {directory} in {(time.perf_counter() - started) * 1000:.1f} ms "
+                 f"({len(state['orders'])} open orders, {len(state['inventory'])} venues)")
+    return state
+
+
+def close_state():
+    global state_store
+    if state_store is not None:
+        state_store.close()
+        state_store = None
+
+
+def record(kind, data):
+    if state_store is not None:
+        state_store.record(kind, data)
+
+
+# Inventory on_change hook: persist a venue's changed balances
+def record_balances(venue, balances, replace=False):
+    record('balances', {'venue': venue, 'balances': {asset: list(value) for asset, value in balances.items()},
+                        'replace': replace})
+
+
+# RunningTotals on_change hook: persist the period totals
+def record_totals(totals):
+    record('totals', totals)
+
+
+# Copy of a section of the open store's state ({} when none is open)
+def snapshot(section):
+    return state_store.snapshot(section) if state_store is not None else {}
+
+
+# Function to delete the snapshot and log (part of the opt-in startup wipe)
+def clear_state(directory=STATE_DIR):
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+        logging.info(f"Cleared state directory: {directory}")
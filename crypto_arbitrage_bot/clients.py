@@ -0,0 +1,123 @@
+import os
+import threading
+
+from crypto_arbitrage_bot.config import get_env_var, settings
+from crypto_arbitrage_bot.rate_limiter import BALANCES, RequestScheduler
+
+# Published rate limits per venue as {bucket: (limit, period seconds)}; the
+# schedulers run at RATE_LIMIT_HEADROOM of these
+VENUE_LIMITS = {
+    'Binance': {'weight': (6000, 60), 'orders': (50, 10)},  # REQUEST_WEIGHT per minute, ORDERS per 10s
+    'KuCoin': {'public': (2000, 30), 'private': (4000, 30)},  # public and spot (VIP0) resource pools
+}
+
+# What each endpoint costs in the venue's buckets
+ENDPOINT_COSTS = {
+    'Binance': {
+        'ticker': {'weight': 2},
+        'depth': {'weight': 5},
+        'account': {'weight': 20},
+        'exchange_info': {'weight': 20},
+        'order': {'weight': 1, 'orders': 1},
+        'order_status': {'weight': 4},
+    },
+    'KuCoin': {
+        'ticker': {'public': 2},
+        'tickers': {'public': 15},
+        'depth': {'public': 2},
+        'bullet': {'public': 10},
+        'markets': {'public': 6},
+        'balance': {'private': 5},
+        'order': {'private': 2},
+        'order_status': {'private': 2},
+    },
+}
+
+_sessions = None
+_schedulers = {}
+_lock = threading.Lock()
+_scheduler_lock = threading.Lock()
+
+
+# Function to build the Binance client (python-binance pings the API on construction)
+def build_binance_client(http):
+    from binance.client import Client as BinanceClient
+    return BinanceClient(api_key=get_env_var('BINANCE_API_KEY'), api_secret=get_env_var('BINANCE_API_SECRET'))
+
+
+# Function to build the KuCoin client on the registry's pooled session
+def build_kucoin_client(http):
+    import ccxt
+    return ccxt.kucoin({
+        'apiKey': os.getenv('KUCOIN_API_KEY'),
+        'secret': os.getenv('KUCOIN_API_SECRET'),
+        'password': os.getenv('KUCOIN_API_PASSPHRASE'),
+        'session': http,
+        'enableRateLimit': False,  # requests are paced by the KuCoin RequestScheduler
+    })
+
+
+# One pooled, keep-alive client per exchange, shared by price fetching, balances
+# and orders. Nothing is imported, constructed or contacted until first use.
+def get_sessions():
+    global _sessions
+    if _sessions is None:
+        with _lock:
+            if _sessions is None:
+                from crypto_arbitrage_bot.sessions import ExchangeSessionRegistry
+                sessions = ExchangeSessionRegistry(pool_size=settings.http_pool_size)
+                sessions.register('Binance', build_binance_client,
+                                  markets_loader=lambda client: request('Binance', BALANCES, 'exchange_info', client.get_exchange_info),
+                                  on_response=get_scheduler('Binance').on_response)
+                sessions.register('KuCoin', build_kucoin_client,
+                                  markets_loader=lambda client: request('KuCoin', BALANCES, 'markets', client.load_markets),
+                                  on_response=get_scheduler('KuCoin').on_response)
+                _sessions = sessions
+    return _sessions
+
+
+# Replace the registry, e.g. with one whose factories build fake exchange clients
+def use_sessions(sessions):
+    global _sessions
+    with _lock:
+        _sessions = sessions
+
+
+# One request scheduler per venue, shared by every thread that calls the exchange
+def get_scheduler(venue):
+    scheduler = _schedulers.get(venue)
+    if scheduler is None:
+        with _scheduler_lock:
+            scheduler = _schedulers.get(venue)
+            if scheduler is None:
+                scheduler = RequestScheduler(venue, VENUE_LIMITS[venue], headroom=settings.rate_limit_headroom)
+                _schedulers[venue] = scheduler
+    return scheduler
+
+
+# Replace a venue's scheduler, e.g. with looser limits for a local fake exchange
+def use_scheduler(venue, scheduler):
+    with _scheduler_lock:
+        _schedulers[venue] = scheduler
+
+
+# Function to call an exchange endpoint through the venue's scheduler, e.g.
+# request('Binance', QUOTES, 'ticker', binance().get_ticker, symbol='BTCUSDT')
+def request(venue, lane, endpoint, fn, *args, **kwargs):
+    return get_scheduler(venue).call(lane, ENDPOINT_COSTS[venue][endpoint], fn, *args, **kwargs)
+
+
+def binance():
+    return get_sessions().get('Binance')
+
+
+def kucoin():
+    return get_sessions().get('KuCoin')
+
+
+def close():
+    global _sessions
+    with _lock:
+        if _sessions is not None:
+            _sessions.close()
+            _sessions = None
@@ -0,0 +1,135 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+LOG_FILE = 'crypto_arbitrage_bot.log'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+# Function to fetch environment variables
+def get_env_var(var_name):
+    value = os.getenv(var_name)
+    if value is None:
+        logging.error(f"Environment variable {var_name} not set")
+        raise ValueError(f"Please set the {var_name} environment variable")
+    return value
+
+
+# Runtime settings. Defaults are usable as-is (e.g. in tests); main() calls
+# load_env() after reading .env so every module sees the configured values.
+class Settings:
+    def __init__(self):
+        self.tick_interval = 5.0
+        self.report_interval = 3600.0
+        self.max_quote_skew = 0.5
+        self.max_quote_age = 2.0
+        self.slippage_rate = 0.0002
+        self.http_pool_size = 10
+        self.market_data_mode = 'poll'
+        self.trading_enabled = False
+        self.tick_record_file = ''
+        self.rate_limit_headroom = 0.8
+        self.inventory_reconcile_interval = 60.0
+        self.metrics_port = 9108
+        self.log_level = 'INFO'
+        self.log_format = 'text'
+        self.headless = False
+        self.triangular_interval = 0.0
+        self.triangular_min_profit = 0.001
+        self.state_dir = 'state'
+        self.clear_on_start = False
+
+    def load_env(self):
+        self.tick_interval = float(os.getenv('TICK_INTERVAL', self.tick_interval))
+        self.report_interval = float(os.getenv('REPORT_INTERVAL', self.report_interval))
+        self.max_quote_skew = float(os.getenv('MAX_QUOTE_SKEW', self.max_quote_skew))
+        self.max_quote_age = float(os.getenv('MAX_QUOTE_AGE', self.max_quote_age))
+        self.slippage_rate = float(os.getenv('SLIPPAGE_RATE', self.slippage_rate))
+        self.http_pool_size = int(os.getenv('HTTP_POOL_SIZE', self.http_pool_size))
+        self.market_data_mode = os.getenv('MARKET_DATA_MODE', self.market_data_mode)
+        self.trading_enabled = os.getenv('TRADING_ENABLED', str(self.trading_enabled)).lower() == 'true'
+        self.tick_record_file = os.getenv('TICK_RECORD_FILE', self.tick_record_file)
+        self.rate_limit_headroom = float(os.getenv('RATE_LIMIT_HEADROOM', self.rate_limit_headroom))
+        self.inventory_reconcile_interval = float(os.getenv('INVENTORY_RECONCILE_INTERVAL', self.inventory_reconcile_interval))
+        self.metrics_port = int(os.getenv('METRICS_PORT', self.metrics_port))
+        self.log_level = os.getenv('LOG_LEVEL', self.log_level).upper()
+        self.log_format = os.getenv('LOG_FORMAT', self.log_format).lower()
+        self.headless = os.getenv('HEADLESS', str(self.headless)).lower() == 'true'
+        self.triangular_interval = float(os.getenv('TRIANGULAR_INTERVAL', self.triangular_interval))
+        self.triangular_min_profit = float(os.getenv('TRIANGULAR_MIN_PROFIT', self.triangular_min_profit))
+        self.state_dir = os.getenv('STATE_DIR', self.state_dir)
+        self.clear_on_start = os.getenv('CLEAR_ON_START', str(self.clear_on_start)).lower() == 'true'
+        return self
+
+
+settings = Settings()
+
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+# One JSON object per line: time, level, logger, message, the raw %-arguments
+# and any `extra=` fields (e.g. extra={'event': 'opportunity'})
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if isinstance(record.args, tuple) and record.args:
+            entry['args'] = [arg if isinstance(arg, (int, float, str, bool)) or arg is None else repr(arg) for arg in record.args]
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=repr)
+
+
+# Queue handler that hands the record over untouched. The stock QueueHandler
+# formats the message in the calling thread; here the %-formatting (and any
+# traceback rendering) happens on the listener thread instead.
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        return record
+
+
+_log_listener = None
+
+
+# Configure logging: callers only put records on a queue; a listener thread
+# formats them and writes the log file. Calls below LOG_LEVEL return before
+# any formatting, so hot-path log calls pass their values as %-arguments.
+def configure_logging(filename=LOG_FILE):
+    global _log_listener
+    stop_logging()
+    file_handler = logging.FileHandler(filename)
+    file_handler.setFormatter(JsonFormatter() if settings.log_format == 'json' else logging.Formatter(LOG_FORMAT))
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(records))
+    root.setLevel(settings.log_level)
+    _log_listener = logging.handlers.QueueListener(records, file_handler, respect_handler_level=True)
+    _log_listener.start()
+    return _log_listener
+
+
+# Function to drain the log queue and close the log file
+def stop_logging():
+    global _log_listener
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            root.removeHandler(handler)
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from crypto_arbitrage_bot import metrics
+
+
+# Run statistics for a periodic task
+class TaskStats:
+    __slots__ = ('runs', 'overruns', 'deadline_misses', 'errors', 'last_lag', 'max_lag', 'last_duration')
+
+    def __init__(self):
+        self.runs = 0
+        self.overruns = 0
+        self.deadline_misses = 0
+        self.errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.last_duration = 0.0
+
+
+# A serial work lane. Jobs run one at a time, in submission order, on the lane's
+# own thread, so blocking I/O on one lane never delays jobs on another lane or
+# the event loop itself.
+class Lane:
+    def __init__(self, name, max_pending=1000):
+        self.name = name
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'lane-{name}')
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    def start(self, loop):
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._work(loop))
+
+    # Queue fn(*args); returns a future resolved with its result, or None if the lane is full
+    def submit(self, fn, *args, deadline=None):
+        if self._queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            logging.warning('Lane %s is full, dropping %s', self.name, getattr(fn, '__name__', fn))
+            return None
+        future = self._loop.create_future()
+        self._queue.put_nowait((fn, args, deadline, future))
+        return future
+
+    async def _work(self, loop):
+        while True:
+            fn, args, deadline, future = await self._queue.get()
+            call = loop.run_in_executor(self._executor, fn, *args)
+            try:
+                if deadline is not None:
+                    result = await asyncio.wait_for(asyncio.shield(call), deadline)
+                else:
+                    result = await call
+            except asyncio.TimeoutError as e:
+                logging.warning('%s missed its %ss deadline on lane %s', getattr(fn, '__name__', fn), deadline, self.name)
+                if not future.done():
+                    future.set_exception(e)
+                # The thread cannot be interrupted; wait for it so the lane stays serial
+                await asyncio.wait([call])
+            except Exception as e:
+                logging.error(f"Error in {getattr(fn, '__name__', fn)} on lane {self.name}: {e}")
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+        self._executor.shutdown(wait=False)
+
+
+# Asyncio engine loop. Periodic tasks are scheduled against absolute deadlines on
+# the loop clock, so intervals do not drift and can be sub-second. A tick that is
+# still running when the next one is due is reported as an overrun and the due
+# tick is skipped instead of piling up behind it.
+class Engine:
+    def __init__(self, lanes=('strategy', 'orders', 'reporting')):
+        self.lanes = {name: Lane(name) for name in lanes}
+        self.stats = {}
+        self._periodic = []
+        self._tasks = []
+        self._loop = None
+        self._stopped = None
+
+    def lane(self, name):
+        if name not in self.lanes:
+            self.lanes[name] = Lane(name)
+            if self._loop is not None:
+                self.lanes[name].start(self._loop)
+        return self.lanes[name]
+
+    # Run fn every `interval` seconds on `lane`, giving each run `deadline` seconds
+    def every(self, interval, fn, lane='strategy', deadline=None, name=None):
+        name = name or getattr(fn, '__name__', repr(fn))
+        self.lane(lane)
+        self.stats[name] = TaskStats()
+        self._periodic.append((name, interval, fn, lane, deadline))
+        return self.stats[name]
+
+    # Queue a one-off job on a lane; safe to call from any thread once the engine runs
+    def post(self, lane, fn, *args):
+        if self._loop is None:
+            fn(*args)  # Not running (e.g. called from a script or test): run inline
+            return
+        self._loop.call_soon_threadsafe(self._post, lane, fn, args)
+
+    def _post(self, lane, fn, args):
+        self.lane(lane).submit(fn, *args)
+
+    async def _run_periodic(self, name, interval, fn, lane, deadline):
+        loop = self._loop
+        stats = self.stats[name]
+        in_flight = None
+        lag_histogram = metrics.scheduler_lag.labels(name)
+        duration_histogram = metrics.task_duration.labels(name)
+        next_run = loop.time() + interval
+        while True:
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+            now = loop.time()
+            stats.last_lag = now - next_run
+            stats.max_lag = max(stats.max_lag, stats.last_lag)
+            lag_histogram.observe(stats.last_lag)
+            if in_flight is not None and not in_flight.done():
+                stats.overruns += 1
+                logging.warning('Task %s overran its %ss interval, skipping this tick', name, interval)
+            else:
+                in_flight = self.lanes[lane].submit(self._timed, stats, duration_histogram, fn, deadline=deadline)
+                if in_flight is not None:
+                    in_flight.add_done_callback(lambda future, stats=stats: self._record(stats, future))
+            # Skip ticks we are already late for rather than firing them back to back
+            next_run += interval
+            if next_run <= now:
+                next_run += ((now - next_run) // interval + 1) * interval
+
+    @staticmethod
+    def _timed(stats, histogram, fn):
+        started = time.monotonic()
+        try:
+            return fn()
+        finally:
+            stats.last_duration = time.monotonic() - started
+            histogram.observe(stats.last_duration)
+
+    @staticmethod
+    def _record(stats, future):
+        stats.runs += 1
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, asyncio.TimeoutError):
+            stats.deadline_misses += 1
+        elif error is not None:
+            stats.errors += 1
+            metrics.errors.labels('task').inc()
+
+    # Run the periodic tasks (and any extra coroutines, e.g. a market stream) until stop()
+    async def run(self, *coroutines):
+        self._loop = asyncio.get_event_loop()
+        self._stopped = asyncio.Event()
+        for lane in self.lanes.values():
+            lane.start(self._loop)
+        self._tasks = [self._loop.create_task(self._run_periodic(*task)) for task in self._periodic]
+        self._tasks += [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            await self._stopped.wait()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            for lane in self.lanes.values():
+                lane.stop()
+            self._loop = None
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
@@ -0,0 +1,8 @@
+# Uniform async exchange adapters: Binance and KuCoin over their SDK clients,
+# and an in-process simulated exchange for offline load tests and fuzzing
+from crypto_arbitrage_bot.exchanges.base import (
+    BlockingExchangeAdapter, ExchangeAdapter, ExchangeError, Fill, InsufficientFunds, NetworkError, OrderRejected,
+)
+from crypto_arbitrage_bot.exchanges.binance import BinanceAdapter
+from crypto_arbitrage_bot.exchanges.kucoin import KucoinAdapter
+from crypto_arbitrage_bot.exchanges.simulated import SimulatedExchange
@@ -0,0 +1,168 @@
+import abc
+import asyncio
+
+DEFAULT_FEE_RATE = 0.001  # 0.1% taker fee, as in calculate_fees
+# Final order states in which nothing more will fill
+CLOSED_UNFILLED_STATUSES = ('canceled', 'cancelled', 'rejected', 'expired', 'expired_in_match')
+
+
+class ExchangeError(Exception):
+    pass
+
+
+class InsufficientFunds(ExchangeError):
+    pass
+
+
+class OrderRejected(ExchangeError):
+    pass
+
+
+# Transport failure; the class name matches rate_limiter.NETWORK_ERRORS so it is retried like ccxt's
+class NetworkError(ExchangeError):
+    pass
+
+
+# An executed order, normalised across venues. quantity and price are the
+# filled base amount and its average price; fee is in the quote asset.
+class Fill:
+    __slots__ = ('venue', 'symbol', 'side', 'quantity', 'price', 'fee', 'order_id', 'status', 'raw')
+
+    def __init__(self, venue, symbol, side, quantity, price, fee=0.0, order_id=None, status='filled', raw=None):
+        self.venue = venue
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.fee = fee
+        self.order_id = order_id
+        self.status = status  # 'filled', 'partial', or 'unknown' (see BlockingExchangeAdapter)
+        self.raw = raw        # the venue's own acknowledgement, if any
+
+    @property
+    def notional(self):
+        return self.quantity * self.price
+
+    def __repr__(self):
+        return f'Fill({self.venue!r}, {self.symbol!r}, {self.side} {self.quantity} @ {self.price}, {self.status})'
+
+
+# Functions to read the filled quantity and average price from an order
+# acknowledgement or lookup (python-binance "fills"/"executedQty"/
+# "cummulativeQuoteQty", ccxt "filled"/"average"), falling back to the
+# requested quantity and quoted price
+def fill_quantity(order, default):
+    filled = order.get('executedQty', order.get('filled')) if isinstance(order, dict) else None
+    return float(filled) if filled else default
+
+
+def fill_price(order, default):
+    if not isinstance(order, dict):
+        return default
+    fills = order.get('fills')
+    if fills:
+        quantity = sum(float(fill['qty']) for fill in fills)
+        if quantity:
+            return sum(float(fill['price']) * float(fill['qty']) for fill in fills) / quantity
+    if order.get('average'):
+        return float(order['average'])
+    quantity = float(order.get('executedQty') or 0)
+    if quantity and order.get('cummulativeQuoteQty'):
+        return float(order['cummulativeQuoteQty']) / quantity
+    return default
+
+
+# Function to tell whether an order a venue holds was accepted: anything but a
+# closed order that filled nothing
+def accepted(order):
+    status = str(order.get('status') or '').lower()
+    return status not in CLOSED_UNFILLED_STATUSES or fill_quantity(order, 0.0) > 0
+
+
+# Function to split a unified symbol ('BTC/USDT') into (base, quote)
+def split_symbol(symbol):
+    base, quote = symbol.split('/')
+    return base, quote
+
+
+# Asynchronous interface every venue implements, so one event loop can drive
+# any number of venues. Symbols are unified ('BTC/USDT') on every adapter.
+#   fetch_quote(symbol)               -> quotes.Quote
+#   fetch_order_book(symbol, depth)   -> sizing.OrderBook
+#   fetch_balances()                  -> {asset: (free, locked)}
+#   create_order(symbol, side, quantity, price=None, client_id=None) -> Fill;
+#   a price makes it an immediate-or-cancel limit order, otherwise it is a
+#   market order, sent under client_id when one is given
+#   fetch_order(symbol, client_id)    -> Fill of the order sent under
+#   client_id, or None if the venue never accepted it
+class ExchangeAdapter(abc.ABC):
+    venue = None
+    fee_rate = DEFAULT_FEE_RATE
+
+    @abc.abstractmethod
+    async def fetch_quote(self, symbol):
+        pass
+
+    @abc.abstractmethod
+    async def fetch_order_book(self, symbol, depth=20):
+        pass
+
+    @abc.abstractmethod
+    async def fetch_balances(self):
+        pass
+
+    @abc.abstractmethod
+    async def create_order(self, symbol, side, quantity, price=None, client_id=None):
+        pass
+
+    @abc.abstractmethod
+    async def fetch_order(self, symbol, client_id):
+        pass
+
+    async def close(self):
+        pass
+
+
+# Adapter over a blocking SDK client. The venue calls are plain methods
+# (quote, order_book, balances, order, find_order) that the polling bot and
+# the order executor call directly; the async interface runs them on a worker
+# thread. order() raises OrderRejected when the venue filled nothing and lets
+# the SDK's own errors through, so a timeout stays recognisable as one whose
+# order may have been accepted. An order that was accepted but whose fill
+# cannot be read back is returned with status 'unknown', the quantity ordered
+# and no price.
+class BlockingExchangeAdapter(ExchangeAdapter):
+    @abc.abstractmethod
+    def quote(self, symbol, max_wait=None):
+        pass
+
+    @abc.abstractmethod
+    def order_book(self, symbol, depth=20, max_wait=None):
+        pass
+
+    @abc.abstractmethod
+    def balances(self):
+        pass
+
+    @abc.abstractmethod
+    def order(self, symbol, side, quantity, price=None, client_id=None):
+        pass
+
+    @abc.abstractmethod
+    def find_order(self, symbol, client_id):
+        pass
+
+    async def fetch_quote(self, symbol):
+        return await asyncio.to_thread(self.quote, symbol)
+
+    async def fetch_order_book(self, symbol, depth=20):
+        return await asyncio.to_thread(self.order_book, symbol, depth)
+
+    async def fetch_balances(self):
+        return await asyncio.to_thread(self.balances)
+
+    async def create_order(self, symbol, side, quantity, price=None, client_id=None):
+        return await asyncio.to_thread(self.order, symbol, side, quantity, price, client_id)
+
+    async def fetch_order(self, symbol, client_id):
+        return await asyncio.to_thread(self.find_order, symbol, client_id)
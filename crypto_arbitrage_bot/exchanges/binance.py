@@ -0,0 +1,82 @@
+import time
+
+from crypto_arbitrage_bot import clients
+from crypto_arbitrage_bot.exchanges.base import (
+    DEFAULT_FEE_RATE, BlockingExchangeAdapter, Fill, OrderRejected, accepted, fill_price, fill_quantity,
+)
+from crypto_arbitrage_bot.quotes import Quote
+from crypto_arbitrage_bot.rate_limiter import BALANCES, ORDERS, QUOTES
+from crypto_arbitrage_bot.sizing import OrderBook
+
+# Binance error code for an order id it does not know
+BINANCE_UNKNOWN_ORDER = -2013
+
+
+# Binance spot through python-binance. Every call goes through the Binance
+# request scheduler; the client defaults to the shared pooled one.
+class BinanceAdapter(BlockingExchangeAdapter):
+    venue = 'Binance'
+
+    def __init__(self, client=None, fee_rate=DEFAULT_FEE_RATE):
+        self._client = client
+        self.fee_rate = fee_rate
+
+    @property
+    def client(self):
+        return self._client if self._client is not None else clients.binance()
+
+    # 'BTC/USDT' -> 'BTCUSDT'
+    @staticmethod
+    def market_id(symbol):
+        return symbol.replace('/', '')
+
+    def _request(self, lane, endpoint, fn, *args, **kwargs):
+        return clients.request(self.venue, lane, endpoint, fn, *args, **kwargs)
+
+    # Best bid/ask from the 24h ticker; closeTime is the exchange timestamp
+    def quote(self, symbol, max_wait=None):
+        ticker = self._request(QUOTES, 'ticker', self.client.get_ticker, symbol=self.market_id(symbol), max_wait=max_wait)
+        received_at = time.time()
+        return Quote(self.venue, symbol, float(ticker['bidPrice']), float(ticker['askPrice']),
+                     ticker['closeTime'] / 1000, received_at)
+
+    def order_book(self, symbol, depth=20, max_wait=None):
+        book = self._request(QUOTES, 'depth', self.client.get_order_book, symbol=self.market_id(symbol), limit=depth,
+                             max_wait=max_wait)
+        return OrderBook(book['bids'], book['asks'])
+
+    def balances(self):
+        account = self._request(BALANCES, 'account', self.client.get_account)
+        return {item['asset']: (float(item['free']), float(item['locked'])) for item in account['balances']}
+
+    def _fill(self, symbol, side, order, price=None):
+        filled = fill_quantity(order, 0.0)
+        average = fill_price(order, price)
+        fee = filled * average * self.fee_rate if average is not None else 0.0
+        return Fill(self.venue, symbol, side, filled, average, fee, order.get('orderId'),
+                    'filled' if order.get('status') == 'FILLED' else 'partial', order)
+
+    def order(self, symbol, side, quantity, price=None, client_id=None):
+        params = {'symbol': self.market_id(symbol), 'side': side.upper(), 'quantity': quantity}
+        if price is None:
+            params['type'] = 'MARKET'
+        else:
+            params.update(type='LIMIT', timeInForce='IOC', price=f'{price:f}')
+        if client_id is not None:
+            params['newClientOrderId'] = client_id
+        ack = self._request(ORDERS, 'order', self.client.create_order, **params)
+        if fill_quantity(ack, 0.0) <= 0:
+            raise OrderRejected(f"Binance {side} {quantity} {symbol} not filled (status {ack.get('status')})")
+        return self._fill(symbol, side, ack, price)
+
+    def find_order(self, symbol, client_id):
+        try:
+            order = self._request(ORDERS, 'order_status', self.client.get_order, symbol=self.market_id(symbol),
+                                  origClientOrderId=client_id)
+        except Exception as e:
+            if getattr(e, 'code', None) == BINANCE_UNKNOWN_ORDER:
+                return None
+            raise
+        if not accepted(order):
+            return None
+        return self._fill(symbol, str(order.get('side', '')).lower(), order)
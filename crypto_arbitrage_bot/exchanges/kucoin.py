@@ -0,0 +1,102 @@
+import logging
+import time
+
+from crypto_arbitrage_bot import clients
+from crypto_arbitrage_bot.exchanges.base import (
+    DEFAULT_FEE_RATE, BlockingExchangeAdapter, Fill, OrderRejected, accepted, fill_price, fill_quantity, split_symbol,
+)
+from crypto_arbitrage_bot.quotes import Quote
+from crypto_arbitrage_bot.rate_limiter import BALANCES, ORDERS, QUOTES
+from crypto_arbitrage_bot.sizing import OrderBook
+
+
+# KuCoin spot through ccxt, which already uses unified symbols. Every call
+# goes through the KuCoin request scheduler; the client defaults to the shared pooled one.
+class KucoinAdapter(BlockingExchangeAdapter):
+    venue = 'KuCoin'
+
+    def __init__(self, client=None, fee_rate=DEFAULT_FEE_RATE, settle_attempts=3, settle_delay=0.05):
+        self._client = client
+        self.fee_rate = fee_rate
+        self.settle_attempts = settle_attempts
+        self.settle_delay = settle_delay
+
+    @property
+    def client(self):
+        return self._client if self._client is not None else clients.kucoin()
+
+    def _request(self, lane, endpoint, fn, *args, **kwargs):
+        return clients.request(self.venue, lane, endpoint, fn, *args, **kwargs)
+
+    def quote(self, symbol, max_wait=None):
+        ticker = self._request(QUOTES, 'ticker', self.client.fetch_ticker, symbol, max_wait=max_wait)
+        received_at = time.time()
+        exchange_ts = ticker['timestamp'] / 1000 if ticker.get('timestamp') else None
+        return Quote(self.venue, symbol, float(ticker['bid']), float(ticker['ask']), exchange_ts, received_at)
+
+    def order_book(self, symbol, depth=20, max_wait=None):
+        book = self._request(QUOTES, 'depth', self.client.fetch_order_book, symbol, depth, max_wait=max_wait)
+        return OrderBook(book['bids'], book['asks'])
+
+    def balances(self):
+        balance = self._request(BALANCES, 'balance', self.client.fetch_balance)
+        return {asset: (float(balance['free'].get(asset) or 0.0), float(balance['used'].get(asset) or 0.0))
+                for asset in balance['total']}
+
+    # Read an order back by exchange id, asking again while it is still open.
+    # ccxt's KuCoin create_order returns only the id, so this is how the fill is known.
+    def _settle(self, order_id, symbol):
+        order = None
+        for attempt in range(self.settle_attempts):
+            if attempt:
+                time.sleep(self.settle_delay)
+            order = self._request(ORDERS, 'order_status', self.client.fetch_order, order_id, symbol)
+            if order.get('status') != 'open':
+                break
+        return order
+
+    def _fill(self, symbol, side, order, quantity=None, price=None):
+        filled = fill_quantity(order, 0.0)
+        average = fill_price(order, price)
+        fee = order.get('fee') or {}
+        cost = fee.get('cost')
+        if cost is not None and average is not None and fee.get('currency') == split_symbol(symbol)[0]:
+            cost *= average  # charged in the base asset; Fill fees are in the quote asset
+        if cost is None and average is not None:
+            cost = filled * average * self.fee_rate
+        if quantity is None:
+            status = 'filled' if order.get('status') == 'closed' else 'partial'
+        else:
+            status = 'partial' if filled < quantity else 'filled'
+        return Fill(self.venue, symbol, side, filled, average, cost or 0.0, order.get('id'), status, order)
+
+    # ccxt signature: create_order(symbol, type, side, amount, price, params)
+    def order(self, symbol, side, quantity, price=None, client_id=None):
+        params = {}
+        if client_id is not None:
+            params['clientOid'] = client_id
+        if price is None:
+            ack = self._request(ORDERS, 'order', self.client.create_order, symbol, 'market', side, quantity, None, params)
+        else:
+            params['timeInForce'] = 'IOC'
+            ack = self._request(ORDERS, 'order', self.client.create_order, symbol, 'limit', side, quantity, price, params)
+        order_id = ack.get('id')
+        try:
+            order = self._settle(order_id, symbol)
+        except Exception as e:
+            logging.warning(f"KuCoin {side} order {order_id} was placed but cannot be read back: {e}")
+            return Fill(self.venue, symbol, side, quantity, price, 0.0, order_id, 'unknown', ack)
+        if fill_quantity(order, 0.0) <= 0:
+            raise OrderRejected(f"KuCoin {side} {quantity} {symbol} not filled (status {order.get('status')})")
+        return self._fill(symbol, side, order, quantity, price)
+
+    def find_order(self, symbol, client_id):
+        try:
+            order = self._request(ORDERS, 'order_status', self.client.fetch_order, None, symbol, {'clientOid': client_id})
+        except Exception as e:
+            if 'OrderNotFound' in {cls.__name__ for cls in type(e).__mro__}:
+                return None
+            raise
+        if not accepted(order):
+            return None
+        return self._fill(symbol, order.get('side'), order)
@@ -0,0 +1,136 @@
+import asyncio
+import itertools
+import random
+import time
+
+from crypto_arbitrage_bot.exchanges.base import (
+    DEFAULT_FEE_RATE, ExchangeAdapter, ExchangeError, Fill, InsufficientFunds, NetworkError, OrderRejected, split_symbol,
+)
+from crypto_arbitrage_bot.quotes import Quote
+from crypto_arbitrage_bot.sizing import OrderBook
+
+
+# In-process exchange for load tests, benchmarks and fuzzing. Each symbol has
+# an order book the test drives (set_book, set_mid); orders match against it
+# level by level, consume the liquidity they take, charge fee_rate in the
+# quote asset and move the balances. Every call waits latency + up to jitter
+# seconds, fails with NetworkError at error_rate, and quotes carry exchange
+# timestamps shifted by clock_offset, so the guard and retry paths can be
+# exercised offline.
+class SimulatedExchange(ExchangeAdapter):
+    def __init__(self, venue='Simulated', fee_rate=DEFAULT_FEE_RATE, latency=0.0, jitter=0.0, error_rate=0.0,
+                 clock_offset=0.0, balances=None, seed=None, clock=time.time, sleep=asyncio.sleep):
+        self.venue = venue
+        self.fee_rate = fee_rate
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.clock_offset = clock_offset
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = random.Random(seed)
+        self.books = {}
+        self._balances = {asset: [float(free), 0.0] for asset, free in (balances or {}).items()}
+        self._order_ids = itertools.count(1)
+        self.orders = {}  # client order id -> Fill
+        self.requests = 0
+        self.orders_filled = 0
+        self.orders_rejected = 0
+
+    def set_book(self, symbol, bids, asks):
+        self.books[symbol] = OrderBook(bids, asks)
+
+    # Replace the book with `levels` evenly spaced levels of `size` each side of mid
+    def set_mid(self, symbol, mid, spread=1.0, levels=10, size=0.1, tick=0.5):
+        half = spread / 2
+        self.set_book(symbol,
+                      [(mid - half - i * tick, size) for i in range(levels)],
+                      [(mid + half + i * tick, size) for i in range(levels)])
+
+    def deposit(self, asset, amount):
+        self._balances.setdefault(asset, [0.0, 0.0])[0] += amount
+
+    def free(self, asset):
+        return self._balances.get(asset, [0.0, 0.0])[0]
+
+    async def _respond(self):
+        self.requests += 1
+        delay = self.latency + (self.rng.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            await self.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise NetworkError(f"{self.venue} simulated network failure")
+
+    def _book(self, symbol):
+        book = self.books.get(symbol)
+        if book is None:
+            raise ExchangeError(f"{self.venue} has no market {symbol}")
+        return book
+
+    async def fetch_quote(self, symbol):
+        await self._respond()
+        book = self._book(symbol)
+        now = self.clock()
+        return Quote(self.venue, symbol, book.best_bid, book.best_ask, now + self.clock_offset, now)
+
+    async def fetch_order_book(self, symbol, depth=20):
+        await self._respond()
+        book = self._book(symbol)
+        return OrderBook(list(itertools.islice(book.bids(), depth)), list(itertools.islice(book.asks(), depth)))
+
+    async def fetch_balances(self):
+        await self._respond()
+        return {asset: (free, locked) for asset, (free, locked) in self._balances.items()}
+
+    # Match after the request latency, so the book may have moved since it was quoted
+    async def create_order(self, symbol, side, quantity, price=None, client_id=None):
+        await self._respond()
+        fill = self.match(symbol, side, quantity, price)
+        if client_id is not None:
+            self.orders[client_id] = fill
+        return fill
+
+    async def fetch_order(self, symbol, client_id):
+        await self._respond()
+        return self.orders.get(client_id)
+
+    # Fill up to `quantity` against the book (no worse than `price`, if given)
+    # and settle balances; the unfilled remainder is cancelled
+    def match(self, symbol, side, quantity, price=None):
+        book = self._book(symbol)
+        base, quote = split_symbol(symbol)
+        levels = book.asks() if side == 'buy' else book.bids()
+        taken = []
+        remaining = quantity
+        for level_price, level_quantity in levels:
+            if remaining <= 1e-12:
+                break
+            if price is not None and (level_price > price if side == 'buy' else level_price < price):
+                break
+            take = min(remaining, level_quantity)
+            taken.append((level_price, level_quantity, take))
+            remaining -= take
+        filled = quantity - remaining
+        if filled <= 1e-12:
+            self.orders_rejected += 1
+            raise OrderRejected(f"{self.venue} {side} {quantity} {symbol}: no liquidity at the limit")
+        notional = sum(level_price * take for level_price, _, take in taken)
+        fee = notional * self.fee_rate
+        if side == 'buy' and self.free(quote) < notional + fee:
+            self.orders_rejected += 1
+            raise InsufficientFunds(f"{self.venue} needs {notional + fee:.8f} {quote}, has {self.free(quote):.8f}")
+        if side == 'sell' and self.free(base) < filled:
+            self.orders_rejected += 1
+            raise InsufficientFunds(f"{self.venue} needs {filled:.8f} {base}, has {self.free(base):.8f}")
+        book_side = 'ask' if side == 'buy' else 'bid'
+        for level_price, level_quantity, take in taken:
+            book.update(book_side, level_price, level_quantity - take)
+        if side == 'buy':
+            self.deposit(base, filled)
+            self.deposit(quote, -(notional + fee))
+        else:
+            self.deposit(base, -filled)
+            self.deposit(quote, notional - fee)
+        self.orders_filled += 1
+        return Fill(self.venue, symbol, side, filled, notional / filled, fee, f'{self.venue}-{next(self._order_ids)}',
+                    'filled' if remaining <= 1e-12 else 'partial')
@@ -0,0 +1,198 @@
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from crypto_arbitrage_bot import metrics
+from crypto_arbitrage_bot.rate_limiter import is_ambiguous
+
+
+# Function to make a client order id: unique per submission, accepted by both
+# Binance (newClientOrderId) and KuCoin (clientOid)
+def new_client_id():
+    return uuid.uuid4().hex
+
+
+# One side of an arbitrage trade. `place(symbol, quantity, client_id)` submits
+# the order under that client order id and returns the exchange's
+# acknowledgement (None or an exception means it failed); `unwind(symbol,
+# quantity, client_id)` submits the opposite order on the same venue to
+# flatten a leg that filled when its partner did not. `lookup(symbol,
+# client_id)` returns the order the exchange holds under that id, or None if
+# it never accepted it; it settles failures that leave the order's fate
+# unknown (timeouts, dropped connections).
+class Leg:
+    __slots__ = ('venue', 'side', 'symbol', 'quantity', 'place', 'unwind', 'lookup')
+
+    def __init__(self, venue, side, symbol, quantity, place, unwind=None, lookup=None):
+        self.venue = venue
+        self.side = side
+        self.symbol = symbol
+        self.quantity = quantity
+        self.place = place
+        self.unwind = unwind
+        self.lookup = lookup
+
+
+class LegResult:
+    __slots__ = ('leg', 'order', 'error', 'latency', 'attempts', 'client_id', 'unknown')
+
+    def __init__(self, leg, order=None, error=None, latency=0.0, attempts=1, client_id=None, unknown=False):
+        self.leg = leg
+        self.order = order
+        self.error = error
+        self.latency = latency  # seconds from submission to acknowledgement
+        self.attempts = attempts
+        self.client_id = client_id
+        self.unknown = unknown  # failed ambiguously and the lookup could not tell whether it was accepted
+
+    @property
+    def ok(self):
+        return self.order is not None and self.error is None
+
+    def __repr__(self):
+        status = 'ok' if self.ok else 'unknown' if self.unknown else f'failed: {self.error}'
+        return f'LegResult({self.leg.venue} {self.leg.side} {self.leg.quantity}, {status}, {self.latency * 1000:.1f} ms)'
+
+
+class ExecutionReport:
+    __slots__ = ('buy', 'sell', 'unwind', 'latency')
+
+    def __init__(self, buy, sell, unwind=None, latency=0.0):
+        self.buy = buy
+        self.sell = sell
+        self.unwind = unwind  # LegResult of the unwind order, if one was needed
+        self.latency = latency
+
+    @property
+    def ok(self):
+        return self.buy.ok and self.sell.ok
+
+    # True when one leg filled and could not be flattened again, or a leg's
+    # state is unknown
+    @property
+    def exposed(self):
+        if self.ok:
+            return False
+        if self.buy.unknown or self.sell.unknown:
+            return True
+        if not self.buy.ok and not self.sell.ok:
+            return False
+        return self.unwind is None or not self.unwind.ok
+
+
+# Acknowledgement latency statistics for one venue
+class VenueLatency:
+    __slots__ = ('count', 'failures', 'total', 'max', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, latency, ok):
+        self.count += 1
+        if not ok:
+            self.failures += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+        self.last = latency
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+# Submits the buy and sell legs at the same time so neither waits on the other's
+# round trip. If one leg fails it is retried up to `retries` times to complete
+# the hedge; if it still fails the leg that did fill is unwound on its venue.
+# Only definite rejections are retried: after a timeout or dropped connection
+# the order is looked up by its client id first, and a leg whose fate cannot
+# be established is neither resent nor unwound.
+class DualLegExecutor:
+    def __init__(self, retries=1, clock=time.monotonic):
+        self.retries = retries
+        self.clock = clock
+        self.latency = {}
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='order-leg')
+
+    def _submit(self, leg, place, quantity, on_submit=None, role=None):
+        client_id = new_client_id()
+        if on_submit is not None:
+            on_submit(role or leg.side, leg, client_id)
+        unknown = False
+        started = self.clock()
+        try:
+            order = place(leg.symbol, quantity, client_id)
+            error = None if order is not None else 'order rejected'
+        except Exception as e:
+            order, error = None, e
+        latency = self.clock() - started
+        self.latency.setdefault(leg.venue, VenueLatency()).record(latency, error is None)
+        metrics.order_latency.labels(leg.venue).observe(latency)
+        if error is not None:
+            metrics.errors.labels('order').inc()
+            if is_ambiguous(error):
+                order, error, unknown = self._resolve(leg, client_id, error)
+        return LegResult(leg, order, error, latency, client_id=client_id, unknown=unknown)
+
+    # Look up an order whose submission failed ambiguously: it may have been
+    # accepted before the response was lost. Returns (order, error, unknown).
+    def _resolve(self, leg, client_id, error):
+        if leg.lookup is None:
+            logging.error(f"{leg.venue} {leg.side} order {client_id} failed ({error}) and cannot be looked up")
+            return None, error, True
+        try:
+            order = leg.lookup(leg.symbol, client_id)
+        except Exception as e:
+            logging.error(f"{leg.venue} {leg.side} order {client_id} failed ({error}) and its lookup failed too: {e}")
+            return None, error, True
+        if order is None:
+            return None, error, False  # never accepted: safe to send again
+        logging.warning(f"{leg.venue} {leg.side} order {client_id} was accepted despite {error}")
+        return order, None, False
+
+    # `on_submit(role, leg, client_id)`, if given, is called before each order
+    # is sent ('buy', 'sell' or 'unwind'), so the caller can persist the client
+    # order id first and find the order again after a crash.
+    def execute(self, buy_leg, sell_leg, on_submit=None):
+        started = self.clock()
+        buy_future = self._executor.submit(self._submit, buy_leg, buy_leg.place, buy_leg.quantity, on_submit)
+        sell_future = self._executor.submit(self._submit, sell_leg, sell_leg.place, sell_leg.quantity, on_submit)
+        buy, sell = buy_future.result(), sell_future.result()
+        report = ExecutionReport(buy, sell)
+
+        if buy.ok != sell.ok:
+            filled, failed = (buy, sell) if buy.ok else (sell, buy)
+            logging.error(f"{failed.leg.venue} {failed.leg.side} leg failed ({failed.error}) while {filled.leg.venue} {filled.leg.side} filled")
+            # Try to complete the hedge first
+            attempts = failed.attempts
+            while not failed.ok and not failed.unknown and attempts <= self.retries:
+                failed = self._submit(failed.leg, failed.leg.place, failed.leg.quantity, on_submit)
+                attempts += 1
+                failed.attempts = attempts
+            if failed.leg is buy_leg:
+                report.buy = failed
+            else:
+                report.sell = failed
+            # Still one-sided: flatten the filled leg, unless the failed one may have filled after all
+            if failed.unknown:
+                logging.error(f"{failed.leg.venue} {failed.leg.side} order {failed.client_id} may have filled; "
+                              f"not resending or unwinding {filled.leg.venue} {filled.leg.side} leg")
+            elif not failed.ok:
+                if filled.leg.unwind is None:
+                    logging.error(f"No unwind available for {filled.leg.venue} {filled.leg.side} leg; position left open")
+                else:
+                    report.unwind = self._submit(filled.leg, filled.leg.unwind, filled.leg.quantity, on_submit, 'unwind')
+                    if report.unwind.ok:
+                        logging.info(f"Unwound {filled.leg.venue} {filled.leg.side} leg of {filled.leg.quantity}")
+                    else:
+                        logging.error(f"Failed to unwind {filled.leg.venue} {filled.leg.side} leg: {report.unwind.error}")
+
+        report.latency = self.clock() - started
+        return report
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+
+
+class Balance:
+    __slots__ = ('free', 'locked')
+
+    def __init__(self, free=0.0, locked=0.0):
+        self.free = free
+        self.locked = locked
+
+    @property
+    def total(self):
+        return self.free + self.locked
+
+    def __repr__(self):
+        return f'Balance(free={self.free}, locked={self.locked})'
+
+
+# Per-venue, per-asset balances held in memory. Fills are applied locally the
+# moment they are acknowledged, so a pre-trade funds check is a couple of dict
+# lookups; the exchange's own figures are folded in by reconcile() on a slow
+# cadence or from balance pushes. on_change(venue, {asset: (free, locked)},
+# replace), if set, is called with every change while the lock is held, so
+# its calls arrive in the order the changes were made (e.g. to persist them).
+class Inventory:
+    def __init__(self, drift_tolerance=1e-8, clock=time.monotonic, on_change=None):
+        self.drift_tolerance = drift_tolerance
+        self.clock = clock
+        self.on_change = on_change
+        self._balances = {}        # venue -> {asset: Balance}
+        self._local_updates = {}   # venue -> clock time of the last locally applied fill
+        self._reconciled_at = {}   # venue -> clock time of the last reconcile
+        self._lock = threading.Lock()
+
+    def free(self, venue, asset):
+        balance = self._balances.get(venue, {}).get(asset)
+        return balance.free if balance is not None else 0.0
+
+    def balance(self, venue, asset):
+        return self._balances.get(venue, {}).get(asset)
+
+    def balances(self, venue):
+        return dict(self._balances.get(venue, {}))
+
+    # True once the venue's balances have been loaded from the exchange
+    def ready(self, venue):
+        return venue in self._reconciled_at
+
+    def set_balance(self, venue, asset, free, locked=0.0):
+        with self._lock:
+            self._balances.setdefault(venue, {})[asset] = Balance(float(free), float(locked))
+            if self.on_change is not None:
+                self.on_change(venue, {asset: (float(free), float(locked))}, False)
+
+    # Load balances saved by a previous run as {venue: {asset: (free, locked)}}.
+    # The venues are not marked ready: only a reconcile with the exchange does that.
+    def load(self, balances):
+        with self._lock:
+            for venue, assets in balances.items():
+                self._balances[venue] = {asset: Balance(float(free), float(locked)) for asset, (free, locked) in assets.items()}
+
+    # Funds missing for buying `quantity` of base with quote on buy_venue and
+    # selling it on sell_venue, as (venue, asset, amount short), or None. A
+    # venue whose balances have not been loaded from the exchange yet is not
+    # judged: it would look empty.
+    def shortfall(self, buy_venue, sell_venue, base, quote, quantity, price, fee_rate=0.0):
+        cost = quantity * price * (1 + fee_rate)
+        available = self.free(buy_venue, quote)
+        if self.ready(buy_venue) and available < cost:
+            return buy_venue, quote, cost - available
+        available = self.free(sell_venue, base)
+        if self.ready(sell_venue) and available < quantity:
+            return sell_venue, base, quantity - available
+        return None
+
+    def can_afford(self, buy_venue, sell_venue, base, quote, quantity, price, fee_rate=0.0):
+        return self.shortfall(buy_venue, sell_venue, base, quote, quantity, price, fee_rate) is None
+
+    # Apply an acknowledged fill: a buy adds base and spends quote plus the fee,
+    # a sell removes base and receives quote less the fee
+    def apply_fill(self, venue, base, quote, side, quantity, price, fee_rate=0.0):
+        notional = quantity * price
+        with self._lock:
+            assets = self._balances.setdefault(venue, {})
+            base_balance = assets.setdefault(base, Balance())
+            quote_balance = assets.setdefault(quote, Balance())
+            if side == 'buy':
+                base_balance.free += quantity
+                quote_balance.free -= notional * (1 + fee_rate)
+            else:
+                base_balance.free -= quantity
+                quote_balance.free += notional * (1 - fee_rate)
+            self._local_updates[venue] = self.clock()
+            if self.on_change is not None:
+                self.on_change(venue, {base: (base_balance.free, base_balance.locked),
+                                       quote: (quote_balance.free, quote_balance.locked)}, False)
+
+    # Replace a venue's balances with the exchange's {asset: (free, locked)}.
+    # fetched_at is the clock time the snapshot was requested; a snapshot older
+    # than a locally applied fill would undo that fill, so it is ignored.
+    # Returns {asset: exchange free - local free} for assets that drifted, or
+    # None if the snapshot was ignored.
+    def reconcile(self, venue, balances, fetched_at=None):
+        with self._lock:
+            if fetched_at is not None and self._local_updates.get(venue, float('-inf')) > fetched_at:
+                logging.info(f"Skipping {venue} balance reconcile: a fill was applied while it was in flight")
+                return None
+            current = self._balances.get(venue, {})
+            drift = {}
+            for asset in set(current) | set(balances):
+                free, locked = balances.get(asset, (0.0, 0.0))
+                local = current.get(asset)
+                difference = float(free) - (local.free if local is not None else 0.0)
+                if venue in self._reconciled_at and abs(difference) > self.drift_tolerance:
+                    drift[asset] = difference
+            self._balances[venue] = {asset: Balance(float(free), float(locked)) for asset, (free, locked) in balances.items()}
+            self._reconciled_at[venue] = self.clock()
+            if self.on_change is not None:
+                self.on_change(venue, {asset: (balance.free, balance.locked) for asset, balance in self._balances[venue].items()}, True)
+        for asset, difference in drift.items():
+            logging.warning(f"{venue} {asset} balance drifted by {difference:+.8f} from the local inventory")
+        return drift
+
+    # Seconds since the venue was last reconciled, or None if it never was
+    def age(self, venue):
+        reconciled_at = self._reconciled_at.get(venue)
+        return None if reconciled_at is None else self.clock() - reconciled_at
@@ -0,0 +1,88 @@
+import asyncio
+
+from crypto_arbitrage_bot import checkpoint, clients, market_data, metrics, orders, reporting, strategy
+from crypto_arbitrage_bot.backtest import TickRecorder
+from crypto_arbitrage_bot.config import configure_logging, get_env_var, settings, stop_logging
+from crypto_arbitrage_bot.strategy import engine, execute_arbitrage, on_top_of_book_change
+
+
+# Function to schedule the engine's periodic tasks
+def schedule_tasks():
+    # Poll both exchanges every TICK_INTERVAL seconds; a tick may take at most one interval
+    if settings.market_data_mode != 'stream':
+        engine.every(settings.tick_interval, execute_arbitrage, lane='strategy', deadline=settings.tick_interval)
+    # Log totals after each tick without holding up detection
+    engine.every(settings.tick_interval, reporting.log_totals, lane='reporting')
+    # Longer-range reports come from the trade store at a slower cadence
+    engine.every(settings.report_interval, reporting.log_period_report, lane='reporting')
+    engine.every(settings.report_interval, reporting.log_session_stats, lane='reporting')
+    # Fills update the inventory locally; the exchanges' figures are folded in slowly
+    engine.every(settings.inventory_reconcile_interval, market_data.reconcile_inventory, lane='reporting')
+    # Single-venue triangular detection across every KuCoin market (logged, not traded)
+    if settings.triangular_interval > 0:
+        engine.every(settings.triangular_interval, market_data.scan_triangular, lane='strategy',
+                     deadline=settings.triangular_interval)
+
+
+# Entry point: load configuration, connect to the exchanges and run the engine
+def main():
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
+    settings.load_env()
+    configure_logging()
+
+    # Fail fast on missing API keys
+    get_env_var('BINANCE_API_KEY')
+    get_env_var('BINANCE_API_SECRET')
+
+    # Logs, trade CSVs and saved state are kept across restarts; CLEAR_ON_START=true wipes them
+    if settings.clear_on_start:
+        reporting.clear_all_logs_and_csv_files()
+
+    # Restore counters, open trades and balances from the snapshot and write-ahead log, then persist every change
+    state = checkpoint.open_state(settings.state_dir)
+    reporting.restore_counters(state['counters'])
+    market_data.inventory.load(state['inventory'])
+    market_data.inventory.on_change = checkpoint.record_balances
+    orders.report_open_orders(state['orders'])
+
+    # Open connections and cache market metadata before the first tick
+    clients.get_sessions().warm_up()
+
+    # Check balances at startup; this also reconciles the restored inventory with the exchanges
+    btc_balance = market_data.check_balance_kucoin()
+    print(f"BTC Balance: {btc_balance}")
+    market_data.check_balance_binance()
+
+    reporting.open_trade_logs()
+
+    # Record every compared price pair for later backtesting
+    if settings.tick_record_file:
+        strategy.tick_recorder = TickRecorder(settings.tick_record_file)
+
+    schedule_tasks()
+
+    # Latency histograms and counters for Prometheus at http://127.0.0.1:METRICS_PORT/metrics
+    metrics_server = metrics.start_metrics_server(settings.metrics_port) if settings.metrics_port else None
+
+    # Main loop: run the engine, reacting to push feeds as well when MARKET_DATA_MODE=stream
+    try:
+        if settings.market_data_mode == 'stream':
+            asyncio.run(engine.run(market_data.build_market_stream(on_top_of_book_change).run()))
+        else:
+            asyncio.run(engine.run())
+    finally:
+        reporting.close_trade_logs()
+        if strategy.tick_recorder is not None:
+            strategy.tick_recorder.close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        clients.close()
+        checkpoint.close_state()
+        stop_logging()
+
+
+if __name__ == '__main__':
+    main()
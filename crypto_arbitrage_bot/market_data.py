@@ -0,0 +1,202 @@
+import logging
+import time
+
+from crypto_arbitrage_bot import clients, metrics
+from crypto_arbitrage_bot.config import settings
+from crypto_arbitrage_bot.exchanges import BinanceAdapter, KucoinAdapter
+from crypto_arbitrage_bot.inventory import Inventory
+from crypto_arbitrage_bot.market_stream import (
+    BINANCE_BOOK_TICKER_URL, KUCOIN_TICKER_TOPIC, MarketStream, VenueFeed, WebSocketTransport,
+    parse_binance_book_ticker, parse_kucoin_ticker,
+)
+from crypto_arbitrage_bot.price_fetcher import ConcurrentPriceFetcher
+from crypto_arbitrage_bot.quotes import QuoteGuard
+from crypto_arbitrage_bot.rate_limiter import QUOTES
+from crypto_arbitrage_bot.triangular import TriangularArbitrage
+
+_price_fetcher = None
+_stream_guard = None
+_triangular = None
+
+
+# Function to handle a network failure that outlived the scheduler's retries:
+# quote and balance requests to the venue back off for a jittered, growing
+# delay (orders are never held back)
+def handle_network_failure(exchange):
+    metrics.errors.labels('network').inc()
+    if exchange not in clients.VENUE_LIMITS:
+        logging.error(f"Network failure detected on {exchange}.")
+        return
+    scheduler = clients.get_scheduler(exchange)
+    delay = scheduler.cool_down()
+    logging.error(f"Network failure detected on {exchange} ({scheduler.consecutive_failures} consecutive). "
+                  f"Pausing market data requests for {delay:.2f}s")
+
+
+# Per-venue balances updated from fills and reconciled with the exchanges
+inventory = Inventory()
+
+# Venue adapters over the shared pooled clients
+binance = BinanceAdapter()
+kucoin = KucoinAdapter()
+
+
+# Functions to load every balance on a venue into the inventory as {asset: (free, locked)}
+def fetch_binance_balances():
+    fetched_at = inventory.clock()
+    balances = binance.balances()
+    inventory.reconcile('Binance', balances, fetched_at)
+    return balances
+
+
+def fetch_kucoin_balances():
+    fetched_at = inventory.clock()
+    balances = kucoin.balances()
+    inventory.reconcile('KuCoin', balances, fetched_at)
+    return balances
+
+
+# Function to reconcile the inventory with both exchanges (slow cadence)
+def reconcile_inventory():
+    for venue, fetch in (('Binance', fetch_binance_balances), ('KuCoin', fetch_kucoin_balances)):
+        try:
+            fetch()
+        except Exception as e:
+            logging.error(f"Error reconciling {venue} balances: {e}")
+
+
+# Function to check Binance balance
+def check_balance_binance():
+    try:
+        btc_balance = fetch_binance_balances().get('BTC')
+        if btc_balance:
+            print(f"Binance BTC Balance: {btc_balance[0]}")
+            logging.info(f"Binance BTC Balance: {btc_balance[0]}")
+        else:
+            print("No BTC balance found on Binance.")
+            logging.info("No BTC balance found on Binance.")
+    except Exception as e:
+        print(f"Error fetching Binance balance: {e}")
+        logging.error(f"Error fetching Binance balance: {e}")
+
+
+# Function to check KuCoin balance
+def check_balance_kucoin():
+    try:
+        free, locked = fetch_kucoin_balances().get('BTC', (0.0, 0.0))
+        btc_balance = free + locked
+        logging.info(f"KuCoin BTC Balance: {btc_balance}")
+        return btc_balance
+    except Exception as e:
+        logging.error(f"Error fetching KuCoin balance: {e}")
+        return 0.0
+
+
+# Function to fetch the Binance BTC/USDT best bid/ask with the exchange's timestamp
+def get_binance_btc_quote():
+    try:
+        return binance.quote('BTC/USDT', max_wait=settings.tick_interval)
+    except Exception:
+        handle_network_failure('Binance')  # Ensure 'Binance' is passed as the argument
+        return None
+
+
+# Function to fetch the KuCoin BTC/USDT best bid/ask with the exchange's timestamp
+def get_kucoin_btc_quote():
+    try:
+        return kucoin.quote('BTC/USDT', max_wait=settings.tick_interval)
+    except Exception as e:
+        logging.error(f"Error fetching KuCoin BTC price: {e}")
+        return None
+
+
+# Functions kept for callers that only need a price: the mid of the venue's current quote
+def get_binance_btc_price():
+    quote = get_binance_btc_quote()
+    return quote.mid if quote is not None else None
+
+
+def get_kucoin_btc_price():
+    quote = get_kucoin_btc_quote()
+    return quote.mid if quote is not None else None
+
+
+# Functions to fetch the top of each order book as an OrderBook
+def get_binance_order_book(depth=20):
+    return binance.order_book('BTC/USDT', depth, max_wait=settings.tick_interval)
+
+
+def get_kucoin_order_book(depth=20):
+    return kucoin.order_book('BTC/USDT', depth, max_wait=settings.tick_interval)
+
+
+# Fetch both tickers at the same time; pairs received or produced further
+# apart than MAX_QUOTE_SKEW seconds, or older than MAX_QUOTE_AGE by the
+# exchange's clock, are discarded instead of compared
+def get_price_fetcher():
+    global _price_fetcher
+    if _price_fetcher is None:
+        _price_fetcher = ConcurrentPriceFetcher(
+            {'Binance': get_binance_btc_quote, 'KuCoin': get_kucoin_btc_quote},
+            max_skew=settings.max_quote_skew,
+            guard=QuoteGuard(max_age=settings.max_quote_age, max_skew=settings.max_quote_skew),
+        )
+    return _price_fetcher
+
+
+# Stream mode's guard against stale books. The feeds push only when a book
+# changes, so the two books of a pair may be as far apart as either may be old
+# (MAX_QUOTE_AGE since the venue last sent it, on the monotonic clock)
+def get_stream_guard():
+    global _stream_guard
+    if _stream_guard is None:
+        _stream_guard = QuoteGuard(max_age=settings.max_quote_age, max_skew=settings.max_quote_age, clock=time.monotonic)
+    return _stream_guard
+
+
+# Function to build the Binance and KuCoin push feeds
+def build_market_stream(on_change):
+    def kucoin_ws_url():
+        # KuCoin hands out a short-lived token and endpoint for its public feed
+        bullet = clients.request('KuCoin', QUOTES, 'bullet', clients.kucoin().public_post_bullet_public)['data']
+        return f"{bullet['instanceServers'][0]['endpoint']}?token={bullet['token']}"
+
+    feeds = [
+        VenueFeed('Binance', WebSocketTransport(BINANCE_BOOK_TICKER_URL.format(symbol='btcusdt')),
+                  parse_binance_book_ticker),
+        VenueFeed('KuCoin', WebSocketTransport(
+            kucoin_ws_url,
+            subscribe_message={'id': 1, 'type': 'subscribe', 'topic': KUCOIN_TICKER_TOPIC.format(symbol='BTC-USDT'), 'response': True},
+            ping_message={'id': 'ping', 'type': 'ping'},
+            ping_interval=15,
+        ), parse_kucoin_ticker),
+    ]
+    return MarketStream(feeds, on_change)
+
+
+# Rate graph over every KuCoin spot market, built from the registry's cached load_markets()
+def get_triangular_engine():
+    global _triangular
+    if _triangular is None:
+        _triangular = TriangularArbitrage.from_ccxt_markets(clients.get_sessions().markets('KuCoin'),
+                                                            min_profit=settings.triangular_min_profit)
+        logging.info('Triangular graph: %d markets, %d currencies, %d triangles',
+                     len(_triangular.market_edges), len(_triangular.currencies), len(_triangular.cycles))
+    return _triangular
+
+
+# Function to pull every KuCoin ticker in one request and log the profitable
+# triangles; only triangles through markets whose bid or ask moved are re-checked
+def scan_triangular():
+    graph = get_triangular_engine()
+    try:
+        tickers = clients.request('KuCoin', QUOTES, 'tickers', clients.kucoin().fetch_tickers,
+                                  max_wait=settings.triangular_interval)
+    except Exception as e:
+        logging.error(f"Error fetching KuCoin tickers: {e}")
+        return []
+    cycles = graph.update_many(tickers)
+    for cycle in cycles:
+        logging.info('Triangular opportunity on KuCoin: %s', cycle, extra={'event': 'triangular'})
+    return cycles
+
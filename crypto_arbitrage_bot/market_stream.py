@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+import time
+
+BINANCE_BOOK_TICKER_URL = 'wss://stream.binance.com:9443/ws/{symbol}@bookTicker'
+KUCOIN_TICKER_TOPIC = '/market/ticker:{symbol}'
+
+
+# Raised by a transport when its stream has ended
+class StreamClosed(Exception):
+    pass
+
+
+# Best bid/ask of one venue, stamped with the local monotonic time it was last
+# received. The feeds carry no exchange timestamp (exchange_ts is None), so a
+# QuoteGuard judges the book by that receive time.
+class TopOfBook:
+    __slots__ = ('venue', 'bid', 'ask', 'bid_size', 'ask_size', 'received_at', 'exchange_ts')
+
+    def __init__(self, venue, bid, ask, bid_size=None, ask_size=None, received_at=None):
+        self.venue = venue
+        self.bid = bid
+        self.ask = ask
+        self.bid_size = bid_size
+        self.ask_size = ask_size
+        self.received_at = time.monotonic() if received_at is None else received_at
+        self.exchange_ts = None
+
+    @property
+    def mid(self):
+        return (self.bid + self.ask) / 2
+
+    def __repr__(self):
+        return f'TopOfBook({self.venue!r}, bid={self.bid}, ask={self.ask})'
+
+
+# Transport interface: connect(), recv() -> str and close(). A transport that
+# cannot be reopened once exhausted sets reconnect = False.
+class Transport:
+    reconnect = True
+
+    async def connect(self):
+        raise NotImplementedError
+
+    async def recv(self):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+# Live push feed over a WebSocket (requires the `websockets` package)
+class WebSocketTransport(Transport):
+    def __init__(self, url, subscribe_message=None, ping_message=None, ping_interval=None):
+        self.url = url
+        self.subscribe_message = subscribe_message
+        self.ping_message = ping_message
+        self.ping_interval = ping_interval
+        self._socket = None
+        self._ping_task = None
+
+    async def connect(self):
+        import websockets
+        url = self.url() if callable(self.url) else self.url
+        self._socket = await websockets.connect(url)
+        if self.subscribe_message is not None:
+            await self._socket.send(json.dumps(self.subscribe_message))
+        if self.ping_message is not None and self.ping_interval:
+            self._ping_task = asyncio.ensure_future(self._keepalive())
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await self._socket.send(json.dumps(self.ping_message))
+
+    async def recv(self):
+        try:
+            return await self._socket.recv()
+        except Exception as e:
+            raise StreamClosed(str(e))
+
+    async def close(self):
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            self._ping_task = None
+        if self._socket is not None:
+            await self._socket.close()
+            self._socket = None
+
+
+# Replays recorded raw messages (an iterable of strings, or a file with one
+# message per line) so the stream can be exercised offline
+class ReplayTransport(Transport):
+    reconnect = False
+
+    def __init__(self, messages, delay=0):
+        self.messages = messages
+        self.delay = delay
+        self._iterator = None
+        self._file = None
+
+    async def connect(self):
+        if isinstance(self.messages, str):
+            self._file = open(self.messages)
+            self._iterator = (line.rstrip('\n') for line in self._file if line.strip())
+        else:
+            self._iterator = iter(self.messages)
+
+    async def recv(self):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StreamClosed('replay finished')
+
+    async def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# Serve recorded messages to every client of a local WebSocket server so that
+# WebSocketTransport can be tested end to end (requires `websockets`)
+async def serve_replay(messages, host='127.0.0.1', port=8765, delay=0):
+    import websockets
+
+    async def handler(websocket, *args):
+        for message in messages:
+            if delay:
+                await asyncio.sleep(delay)
+            await websocket.send(message)
+
+    return await websockets.serve(handler, host, port)
+
+
+# Parse a Binance <symbol>@bookTicker message into (bid, ask, bid_size, ask_size)
+def parse_binance_book_ticker(message):
+    data = json.loads(message)
+    if 'b' not in data or 'a' not in data:
+        return None
+    return float(data['b']), float(data['a']), float(data['B']), float(data['A'])
+
+
+# Parse a KuCoin /market/ticker message into (bid, ask, bid_size, ask_size)
+def parse_kucoin_ticker(message):
+    data = json.loads(message)
+    if data.get('type') != 'message':
+        return None  # welcome, ack and pong frames
+    ticker = data['data']
+    return (float(ticker['bestBid']), float(ticker['bestAsk']),
+            float(ticker['bestBidSize']), float(ticker['bestAskSize']))
+
+
+# Return the trade two venues' quotes allow as (buy_venue, buy_ask, sell_venue,
+# sell_bid): buy at the ask on one venue and sell at the bid on the other. Only
+# a bid on one venue above the ask on the other can be traded; otherwise None
+def executable_prices(first, second):
+    if first.bid > second.ask:
+        return second.venue, second.ask, first.venue, first.bid
+    if second.bid > first.ask:
+        return first.venue, first.ask, second.venue, second.bid
+    return None
+
+
+# A venue's push feed: the transport that carries it and the parser for its messages
+class VenueFeed:
+    def __init__(self, venue, transport, parser):
+        self.venue = venue
+        self.transport = transport
+        self.parser = parser
+
+
+# Keeps a live best bid/ask per venue from push feeds and calls
+# on_change(venue, books) whenever a venue's best bid or ask moves. A venue
+# whose feed drops leaves `books` until it has reconnected and sent a new
+# quote, so the other venue is never compared against a frozen one.
+class MarketStream:
+    def __init__(self, feeds, on_change, reconnect_delay=1, max_reconnect_delay=30):
+        self.feeds = list(feeds)
+        self.on_change = on_change
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.books = {}
+        self._running = False
+        self._tasks = []
+
+    def _apply(self, venue, parsed):
+        bid, ask, bid_size, ask_size = parsed
+        book = self.books.get(venue)
+        if book is not None and book.bid == bid and book.ask == ask:
+            # Same prices, but the venue has just confirmed them
+            book.bid_size = bid_size
+            book.ask_size = ask_size
+            book.received_at = time.monotonic()
+            return False
+        self.books[venue] = TopOfBook(venue, bid, ask, bid_size, ask_size)
+        return True
+
+    async def _consume(self, feed):
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                await feed.transport.connect()
+                delay = self.reconnect_delay
+                while self._running:
+                    message = await feed.transport.recv()
+                    parsed = feed.parser(message)
+                    if parsed is not None and self._apply(feed.venue, parsed):
+                        result = self.on_change(feed.venue, self.books)
+                        if asyncio.iscoroutine(result):
+                            await result
+            except StreamClosed as e:
+                logging.warning(f"{feed.venue} market stream closed: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"{feed.venue} market stream error: {e}")
+            finally:
+                self.books.pop(feed.venue, None)
+                await feed.transport.close()
+            if not feed.transport.reconnect:
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    # Run until every feed has ended (live feeds reconnect, so this runs until stop())
+    async def run(self):
+        self._running = True
+        self._tasks = [asyncio.ensure_future(self._consume(feed)) for feed in self.feeds]
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            if self._running:
+                raise
+        finally:
+            self._running = False
+            self._tasks = []
+
+    def stop(self):
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
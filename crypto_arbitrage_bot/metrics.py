@@ -0,0 +1,234 @@
+import logging
+import math
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) for latency histograms: 1 ms to 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, value):
+        self.value = value
+
+    def dec(self, amount=1.0):
+        self.inc(-amount)
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+# Base metric: one child per label value tuple, created on first use. Hot
+# paths should keep the child from labels() and call inc()/observe() on it.
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(f'{name}{labels} {_format_value(value)}' for name, labels, value in self._samples())
+        return lines
+
+    def _items(self):
+        for values, child in list(self._children.items()):
+            yield tuple(str(value) for value in values), child
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self._default.inc(amount)
+
+    def _samples(self):
+        for values, child in self._items():
+            yield f'{self.name}_total', _format_labels(self.labelnames, values), child.value
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default.set(value)
+
+    def inc(self, amount=1.0):
+        self._default.inc(amount)
+
+    def _samples(self):
+        for values, child in self._items():
+            yield self.name, _format_labels(self.labelnames, values), child.value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def _samples(self):
+        for values, child in self._items():
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket', _format_labels(self.labelnames, values, [('le', _format_value(float(bound)))]), cumulative
+            yield f'{self.name}_sum', _format_labels(self.labelnames, values), total
+            yield f'{self.name}_count', _format_labels(self.labelnames, values), count
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    # Prometheus text exposition format
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# Hot-path metrics shared by the bot's modules
+fetch_latency = registry.histogram('arbitrage_fetch_latency_seconds', 'Ticker request round trip per venue', ('venue',))
+quote_skew = registry.histogram('arbitrage_quote_skew_seconds', 'Receive time difference between the quotes of a compared pair')
+detection_to_order = registry.histogram('arbitrage_detection_to_order_seconds', 'Time from opportunity detection to order submission')
+order_latency = registry.histogram('arbitrage_order_ack_latency_seconds', 'Order submission to acknowledgement per venue', ('venue',))
+task_duration = registry.histogram('arbitrage_task_duration_seconds', 'Run time of each engine task (execute_arbitrage is the tick)', ('task',))
+scheduler_lag = registry.histogram('arbitrage_scheduler_lag_seconds', 'How late each engine task started relative to its schedule', ('task',))
+opportunities = registry.counter('arbitrage_opportunities', 'Price differences above the threshold')
+fills = registry.counter('arbitrage_fills', 'Acknowledged order legs', ('venue', 'side'))
+errors = registry.counter('arbitrage_errors', 'Errors by kind', ('kind',))
+quotes_dropped = registry.counter('arbitrage_quotes_dropped', 'Quote pairs dropped by the staleness and skew guard', ('reason',))
+clock_offset = registry.gauge('arbitrage_clock_offset_seconds', 'Estimated exchange clock minus local clock per venue', ('venue',))
+last_tick = registry.gauge('arbitrage_last_tick_timestamp_seconds', 'Unix time of the last tick with prices from both venues')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = registry
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# Serve the registry at http://host:port/metrics from a daemon thread.
+# Rendering happens only when scraped, so the hot path never pays for it.
+def start_metrics_server(port, host='127.0.0.1', metrics_registry=registry):
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': metrics_registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    logging.info(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+    return server
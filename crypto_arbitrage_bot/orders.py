@@ -0,0 +1,245 @@
+import functools
+import logging
+import math
+import time
+import uuid
+
+from crypto_arbitrage_bot import checkpoint, clients, market_data, metrics
+from crypto_arbitrage_bot.exchanges import BinanceAdapter, KucoinAdapter
+from crypto_arbitrage_bot.executor import DualLegExecutor, Leg
+from crypto_arbitrage_bot.market_data import inventory
+from crypto_arbitrage_bot.pricing import FEE_RATE
+from crypto_arbitrage_bot.rate_limiter import ORDERS, is_ambiguous
+
+# Both legs are sent at the same time; a one-sided fill is retried, then unwound
+order_executor = DualLegExecutor(retries=1)
+
+
+# Function to handle insufficient funds
+def handle_insufficient_funds(exchange):
+    logging.error(f"Insufficient funds on {exchange}. Cannot proceed with the trade.")
+    # Implement alert mechanism as needed
+
+
+# Function to place limit sell order on Binance
+def place_binance_limit_sell_order(symbol, quantity, price):
+    try:
+        # Replace these with actual Binance API calls based on their documentation
+        # Example:
+        order = clients.request(
+            'Binance', ORDERS, 'order', clients.binance().create_order,
+            symbol=symbol,
+            side='SELL',
+            type='LIMIT',
+            quantity=quantity,
+            price=price,
+            timeInForce='GTC'  # Good till cancelled
+        )
+        logging.info('Sell order placed on Binance: %s', order, extra={'event': 'order', 'venue': 'Binance'})
+        return order
+    except Exception as e:
+        logging.error(f"Error placing sell order on Binance: {e}")
+        return None
+
+
+# Function to place stop order on KuCoin
+def place_kucoin_stop_order(symbol, stop_price, quantity, side):
+    try:
+        # Replace these with actual KuCoin API calls based on their documentation
+        params = {
+            'symbol': symbol,
+            'stop': stop_price,
+            'type': 'stop',
+            'size': quantity,
+            'side': side,
+            # Add any additional parameters as required by the KuCoin API
+        }
+        order = clients.request('KuCoin', ORDERS, 'order', clients.kucoin().private_post_orders, params=params)
+        logging.info('Stop order placed on KuCoin: %s', order, extra={'event': 'order', 'venue': 'KuCoin'})
+        return order
+    except Exception as e:
+        logging.error(f"Error placing stop order on KuCoin: {e}")
+        return None
+
+
+# Function to place a market order through a venue adapter under client_id.
+# Returns the Fill, or None if the exchange rejected the order. A failure that
+# leaves it unknown whether the order was accepted (timeout, dropped
+# connection) is raised instead, so the caller can look the order up by
+# client_id before sending it again.
+def place_order(adapter, side, symbol, quantity, client_id=None):
+    try:
+        fill = adapter.order(symbol, side, quantity, client_id=client_id)
+        logging.info('%s order placed on %s: %s', side.capitalize(), adapter.venue, fill,
+                     extra={'event': 'order', 'venue': adapter.venue})
+        return fill
+    except Exception as e:
+        logging.error(f"Error placing {side} order on {adapter.venue}: {e}")
+        if is_ambiguous(e):
+            raise
+        return None
+
+
+# Functions to place market orders with a given SDK client, as the bot did before the adapters
+def place_binance_sell_order(binance_client, symbol, quantity, client_id=None):
+    return place_order(BinanceAdapter(binance_client), 'sell', symbol, quantity, client_id)
+
+
+def place_binance_buy_order(binance_client, symbol, quantity, client_id=None):
+    return place_order(BinanceAdapter(binance_client), 'buy', symbol, quantity, client_id)
+
+
+def place_kucoin_sell_order(kucoin_client, symbol, quantity, client_id=None):
+    return place_order(KucoinAdapter(kucoin_client), 'sell', symbol, quantity, client_id)
+
+
+def place_kucoin_buy_order(kucoin_client, symbol, quantity, client_id=None):
+    return place_order(KucoinAdapter(kucoin_client), 'buy', symbol, quantity, client_id)
+
+
+# Function to look an order up on either venue by its client order id: the
+# Fill if the exchange accepted it, None if it never did; raises if the
+# exchange cannot be asked
+def find_order(venue, symbol, client_id):
+    return venue_adapter(venue).find_order(symbol, client_id)
+
+
+def venue_adapter(venue):
+    return market_data.kucoin if venue == 'KuCoin' else market_data.binance
+
+
+# Function to build a venue's order leg on the shared adapter; unwinding a leg
+# is the opposite market order
+def venue_leg(venue, side, quantity):
+    adapter = venue_adapter(venue)
+    buy = functools.partial(place_order, adapter, 'buy')
+    sell = functools.partial(place_order, adapter, 'sell')
+    return Leg(venue, side, 'BTC/USDT', quantity, buy if side == 'buy' else sell, sell if side == 'buy' else buy,
+               adapter.find_order)
+
+
+def binance_leg(side, quantity):
+    return venue_leg('Binance', side, quantity)
+
+
+def kucoin_leg(side, quantity):
+    return venue_leg('KuCoin', side, quantity)
+
+
+# Function to apply an acknowledged leg to the inventory; an unwind reverses
+# the leg's side. `price` is the quoted price, used when the fill has none.
+def record_fill(result, price, reverse=False):
+    fill = result.order
+    if fill.price is not None:
+        price = fill.price
+    if price is None:
+        logging.warning(f"No fill price for {result.leg.venue} {result.leg.side} leg; inventory left to the next reconcile")
+        return
+    side = result.leg.side
+    if reverse:
+        side = 'sell' if side == 'buy' else 'buy'
+    metrics.fills.labels(result.leg.venue, side).inc()
+    inventory.apply_fill(result.leg.venue, 'BTC', 'USDT', side, fill.quantity, price, FEE_RATE)
+
+
+# Function to describe an order for the state store: where it was sent and
+# under which client order id, plus the venue's Fill once there is one
+def order_state(venue, symbol, side, client_id, fill=None):
+    state = {'venue': venue, 'symbol': symbol, 'side': side, 'client_id': client_id}
+    if fill is not None:
+        state.update(order_id=fill.order_id, status=fill.status, filled=fill.quantity)
+    return state
+
+
+# An unwind is the opposite order on the leg's venue
+def leg_state(role, leg, client_id, order=None):
+    side = leg.side
+    if role == 'unwind':
+        side = 'sell' if side == 'buy' else 'buy'
+    return order_state(leg.venue, leg.symbol, side, client_id, order)
+
+
+# Function to place both legs of an arbitrage trade (runs on the orders lane).
+# buy_price and sell_price are the quoted prices, used for the inventory when
+# an acknowledgement carries no fill price; detected_at is the monotonic time
+# the opportunity was detected.
+def execute_trade(buy_venue, quantity, buy_price=None, sell_price=None, detected_at=None):
+    quantity = math.floor(quantity * 1e5) / 1e5  # BTC lot size: 0.00001
+    if quantity <= 0:
+        return None
+    if detected_at is not None:
+        metrics.detection_to_order.observe(time.monotonic() - detected_at)
+    # Persisted before any leg is sent: if the bot dies mid-trade the next start reconciles it
+    trade_id = uuid.uuid4().hex[:16]
+    checkpoint.record('order_open', {'id': trade_id, 'buy_venue': buy_venue, 'quantity': quantity,
+                                     'buy_price': buy_price, 'sell_price': sell_price, 'opened_at': time.time()})
+
+    # Each order's client id is persisted before it is sent, so a restart can look it up
+    def on_submit(role, leg, client_id):
+        checkpoint.record('order_update', {'id': trade_id, role: leg_state(role, leg, client_id)})
+
+    if buy_venue == 'KuCoin':
+        report = order_executor.execute(kucoin_leg('buy', quantity), binance_leg('sell', quantity), on_submit)
+    else:
+        report = order_executor.execute(binance_leg('buy', quantity), kucoin_leg('sell', quantity), on_submit)
+    if report.buy.ok:
+        record_fill(report.buy, buy_price)
+    if report.sell.ok:
+        record_fill(report.sell, sell_price)
+    if report.unwind is not None and report.unwind.ok:
+        record_fill(report.unwind, buy_price if report.buy.ok else sell_price, reverse=True)
+    logging.info('Executed %s BTC (buy on %s): ok=%s, exposed=%s, latency %.1f ms', quantity, buy_venue, report.ok,
+                 report.exposed, report.latency * 1000, extra={'event': 'execution'})
+    # The acknowledgements are persisted with the outcome; a balanced trade is then closed
+    update = {'id': trade_id, 'status': 'exposed' if report.exposed else 'done'}
+    for role, result in (('buy', report.buy), ('sell', report.sell), ('unwind', report.unwind)):
+        if result is not None:
+            update[role] = leg_state(role, result.leg, result.client_id, result.order)
+    checkpoint.record('order_update', update)
+    if report.exposed:
+        logging.error("Arbitrage legs are unbalanced and could not be unwound; manual intervention required")
+    else:
+        checkpoint.record('order_closed', {'id': trade_id})
+    return report
+
+
+# Function to reconcile trades that were in flight or left exposed when the
+# bot last stopped: every order they sent is looked up on its exchange by
+# client order id and the net BTC position of the trade is logged. A trade
+# whose orders could all be looked up is closed in the state store; one whose
+# lookup failed stays open and is checked again on the next start. The
+# inventory itself is corrected by the startup balance reconcile.
+def report_open_orders(open_orders):
+    for trade_id, trade in open_orders.items():
+        status = trade.get('status', 'in flight')
+        sent = [(role, trade[role]) for role in ('buy', 'sell', 'unwind') if isinstance(trade.get(role), dict)]
+        if not sent:
+            logging.error(f"Trade {trade_id} ({trade.get('quantity')} BTC, buy on {trade.get('buy_venue')}) was {status} "
+                          f"when the bot stopped and has no order ids; check both exchanges for an open position")
+            checkpoint.record('order_closed', {'id': trade_id})
+            continue
+        position = 0.0
+        update = {'id': trade_id}
+        unresolved = False
+        for role, order in sent:
+            try:
+                found = find_order(order['venue'], order['symbol'], order['client_id'])
+            except Exception as e:
+                logging.error(f"Trade {trade_id}: cannot look up {order['venue']} {order['side']} order "
+                              f"{order['client_id']}: {e}")
+                unresolved = True
+                continue
+            update[role] = order_state(order['venue'], order['symbol'], order['side'], order['client_id'], found)
+            filled = update[role].get('filled', 0.0)
+            position += filled if order['side'] == 'buy' else -filled
+        if unresolved:
+            logging.error(f"Trade {trade_id} was {status} when the bot stopped and could not be reconciled; "
+                          f"it will be checked again on the next start")
+            checkpoint.record('order_update', update)
+            continue
+        if abs(position) > 1e-9:
+            logging.error(f"Trade {trade_id} was {status} when the bot stopped and left {position:+.8f} BTC open on "
+                          f"the exchanges; manual intervention required")
+        else:
+            logging.info(f"Trade {trade_id} was {status} when the bot stopped; its orders are balanced on the exchanges")
+        checkpoint.record('order_closed', {'id': trade_id})
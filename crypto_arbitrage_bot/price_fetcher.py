@@ -0,0 +1,89 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from crypto_arbitrage_bot import metrics
+
+# Maximum time (seconds) allowed between the receive times of the quotes in a pair
+DEFAULT_MAX_SKEW = 0.5
+
+
+# A single observation stamped with the local monotonic receive time. `price`
+# is whatever the fetcher returned: a price or a Quote with bid/ask and timestamps.
+class TimedPrice:
+    __slots__ = ('exchange', 'price', 'received_at', 'latency')
+
+    def __init__(self, exchange, price, received_at, latency):
+        self.exchange = exchange
+        self.price = price
+        self.received_at = received_at
+        self.latency = latency
+
+    def __repr__(self):
+        return f'TimedPrice({self.exchange!r}, {self.price!r}, received_at={self.received_at:.6f}, latency={self.latency:.6f})'
+
+
+# Fetches the ticker of every exchange at the same time on a thread pool.
+# The exchange clients are blocking HTTP clients, so threads let the requests
+# overlap and a tick takes as long as the slowest venue instead of the sum.
+class ConcurrentPriceFetcher:
+    def __init__(self, fetchers, max_skew=DEFAULT_MAX_SKEW, timeout=10, clock=time.monotonic, guard=None):
+        # fetchers maps an exchange name to a callable returning a price or Quote (or None);
+        # guard is a QuoteGuard applied to pairs of Quotes
+        self.fetchers = dict(fetchers)
+        self.max_skew = max_skew
+        self.guard = guard
+        self.timeout = timeout
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.fetchers)),
+                                            thread_name_prefix='price-fetch')
+
+    def _fetch_one(self, exchange, fetcher):
+        started = self.clock()
+        price = fetcher()
+        received_at = self.clock()
+        metrics.fetch_latency.labels(exchange).observe(received_at - started)
+        if price is None:
+            metrics.errors.labels('fetch').inc()
+            return None
+        return TimedPrice(exchange, price, received_at, received_at - started)
+
+    # Request every venue at once and return {exchange: TimedPrice or None}
+    def fetch_all(self):
+        futures = {exchange: self._executor.submit(self._fetch_one, exchange, fetcher)
+                   for exchange, fetcher in self.fetchers.items()}
+        results = {}
+        for exchange, future in futures.items():
+            try:
+                results[exchange] = future.result(timeout=self.timeout)
+            except Exception as e:
+                logging.error(f"Error fetching {exchange} price: {e}")
+                metrics.errors.labels('fetch').inc()
+                results[exchange] = None
+        return results
+
+    # Fetch two venues concurrently and return their prices (None for a venue
+    # that failed), or None if the quotes were received too far apart or the
+    # guard rejects them
+    def fetch_pair(self, first, second):
+        quotes = self.fetch_all()
+        first_quote = quotes.get(first)
+        second_quote = quotes.get(second)
+        if first_quote is None or second_quote is None:
+            return (first_quote.price if first_quote else None,
+                    second_quote.price if second_quote else None)
+        skew = abs(first_quote.received_at - second_quote.received_at)
+        metrics.quote_skew.observe(skew)
+        if skew > self.max_skew:
+            logging.warning('Discarding %s/%s quotes: receive skew %.3fs exceeds %ss', first, second, skew, self.max_skew)
+            return None
+        if self.guard is not None and self.guard.check(first_quote.price, second_quote.price) is not None:
+            return None
+        return first_quote.price, second_quote.price
+
+    # Run any other venue call (e.g. an order book fetch) on the same pool
+    def submit(self, fn, *args):
+        return self._executor.submit(fn, *args)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
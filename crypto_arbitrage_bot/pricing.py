@@ -0,0 +1,113 @@
+import logging
+
+from crypto_arbitrage_bot.config import settings
+from crypto_arbitrage_bot.sizing import net_profit, optimal_size
+
+FEE_RATE = 0.001  # 0.1% fee for each trade
+
+
+# Function to calculate trading fees for Binance and KuCoin (0.1% each)
+def calculate_fees(price, exchange):
+    fee = price * FEE_RATE
+    logging.debug('%s trading fee: $%.2f', exchange, fee)
+    return fee
+
+
+# Function to calculate profit after fees: buy on the cheaper exchange, sell on the dearer one.
+# Fees are a rate on each leg (not a dollar amount) and quantity is in BTC.
+def calculate_profit(binance_price, kucoin_price, quantity):
+    buy_price, sell_price = min(binance_price, kucoin_price), max(binance_price, kucoin_price)
+    return net_profit(buy_price, sell_price, quantity, FEE_RATE, FEE_RATE)
+
+
+# Function to size a trade against both order books: walks the depth to find the
+# BTC quantity with the highest net profit after fees and slippage, within budget.
+# The books decide the direction, returned on the result as buy_venue/sell_venue
+# with the top-of-book prices the trade starts at.
+def calculate_depth_sizing(binance_book, kucoin_book, budget):
+    if binance_book.best_bid is None or kucoin_book.best_bid is None:
+        return None
+    if binance_book.best_bid > kucoin_book.best_ask:
+        buy_venue, buy_book, sell_venue, sell_book = 'KuCoin', kucoin_book, 'Binance', binance_book
+    else:
+        buy_venue, buy_book, sell_venue, sell_book = 'Binance', binance_book, 'KuCoin', kucoin_book
+    result = optimal_size(buy_book, sell_book, FEE_RATE, FEE_RATE, max_cost=budget, slippage_rate=settings.slippage_rate)
+    result.buy_venue, result.sell_venue = buy_venue, sell_venue
+    result.buy_price, result.sell_price = buy_book.best_ask, sell_book.best_bid
+    return result
+
+
+# Function to calculate position size based on capital and percentage allocation
+def calculate_position_size(capital, allocation_percentage):
+    if allocation_percentage < 0 or allocation_percentage > 100:
+        raise ValueError("Allocation percentage should be between 0 and 100.")
+    return capital * (allocation_percentage / 100)
+
+
+# Function to implement stop-loss mechanism
+def stop_loss_check(current_profit_loss):
+    stop_loss_threshold = -5  # $5 loss threshold
+    if current_profit_loss <= stop_loss_threshold:
+        return True
+    return False
+
+
+# A trade decided by evaluate_opportunity: buy quantity BTC at buy_price on
+# buy_venue, sell it at sell_price on sell_venue, for an expected net profit
+class Opportunity:
+    __slots__ = ('buy_venue', 'buy_price', 'sell_venue', 'sell_price', 'quantity', 'profit', 'stop_loss')
+
+    def __init__(self, buy_venue, buy_price, sell_venue, sell_price, quantity, profit):
+        self.buy_venue = buy_venue
+        self.buy_price = buy_price
+        self.sell_venue = sell_venue
+        self.sell_price = sell_price
+        self.quantity = quantity
+        self.profit = profit
+        self.stop_loss = stop_loss_check(profit)
+
+    def price(self, venue):
+        return self.buy_price if venue == self.buy_venue else self.sell_price
+
+    def __repr__(self):
+        return (f'Opportunity(buy {self.quantity:.8f} on {self.buy_venue} at {self.buy_price}, '
+                f'sell on {self.sell_venue} at {self.sell_price}, profit={self.profit:.4f})')
+
+
+# Function to decide a trade that buys at buy_price on buy_venue and sells at
+# sell_price on sell_venue. The live strategy and the backtest both call it so
+# they make the same decisions. Returns None unless the spread reaches
+# `threshold`. The trade is sized by `size()` when given (a depth-sized
+# SizingResult, whose direction wins, or None if depth is unavailable) and
+# otherwise by spending position_value at the quoted prices widened by
+# slippage_rate. Books that leave no profitable quantity are not a trade.
+def evaluate_opportunity(buy_venue, buy_price, sell_venue, sell_price, threshold, position_value,
+                         fee_rate=FEE_RATE, slippage_rate=0.0, size=None):
+    if sell_price <= buy_price:
+        return None  # Nothing to gain in this direction
+    prices = {buy_venue: buy_price, sell_venue: sell_price}
+    if not is_arbitrage_opportunity(prices['Binance'], prices['KuCoin'], threshold):
+        return None
+    sizing = size() if size is not None else None
+    if sizing is not None:
+        if sizing.quantity <= 0:
+            return None  # The books are fresher than the quotes and hold no trade
+        # Trade the way the books were sized, even if they have moved against the quotes
+        if sizing.buy_venue != buy_venue:
+            logging.info('Order books reverse the quoted direction: buying on %s instead', sizing.buy_venue,
+                         extra={'event': 'direction_changed'})
+        return Opportunity(sizing.buy_venue, sizing.buy_price, sizing.sell_venue, sizing.sell_price,
+                           sizing.quantity, sizing.net_profit)
+    quantity = position_value / buy_price  # BTC
+    profit = net_profit(buy_price * (1 + slippage_rate), sell_price * (1 - slippage_rate), quantity, fee_rate, fee_rate)
+    return Opportunity(buy_venue, buy_price, sell_venue, sell_price, quantity, profit)
+
+
+# Threshold function to determine arbitrage opportunity between Binance and KuCoin
+def is_arbitrage_opportunity(binance_price, kucoin_price, threshold=20):
+    difference = abs(binance_price - kucoin_price)
+    if difference >= threshold:
+        logging.info('Arbitrage opportunity detected! Binance: $%s, KuCoin: $%s, Difference: $%.2f',
+                     binance_price, kucoin_price, difference, extra={'event': 'opportunity'})
+        return True
+    return False
@@ -0,0 +1,92 @@
+import logging
+import time
+from collections import deque
+
+from crypto_arbitrage_bot import metrics
+
+DEFAULT_MAX_AGE = 2.0    # seconds a quote may trail the venue's freshest
+DEFAULT_MAX_SKEW = 0.5   # seconds allowed between the two quotes of a pair
+OFFSET_WINDOW = 64       # samples kept per venue for the clock offset estimate
+
+DROP_REASONS = ('invalid', 'stale', 'skew')
+
+
+# Best bid/ask of one symbol on one venue. exchange_ts is the exchange's own
+# timestamp (unix seconds, None if the venue sends none); received_at is the
+# local wall-clock time the response arrived.
+class Quote:
+    __slots__ = ('venue', 'symbol', 'bid', 'ask', 'exchange_ts', 'received_at')
+
+    def __init__(self, venue, symbol, bid, ask, exchange_ts=None, received_at=None):
+        self.venue = venue
+        self.symbol = symbol
+        self.bid = bid
+        self.ask = ask
+        self.exchange_ts = exchange_ts
+        self.received_at = time.time() if received_at is None else received_at
+
+    @property
+    def mid(self):
+        return (self.bid + self.ask) / 2
+
+    def __repr__(self):
+        return f'Quote({self.venue!r}, {self.symbol!r}, bid={self.bid}, ask={self.ask}, exchange_ts={self.exchange_ts})'
+
+
+# Decides whether two venues' quotes may be compared. Each venue's clock
+# offset (exchange time minus local time) is estimated as the largest
+# exchange_ts - received_at over its recent quotes, i.e. the sample with the
+# least network delay. Mapping a quote's exchange_ts through that offset gives
+# the local time the venue produced it, so a quote the exchange served from a
+# stale cache, or one that sat in a slow response, shows up as old even though
+# it was just received.
+class QuoteGuard:
+    def __init__(self, max_age=DEFAULT_MAX_AGE, max_skew=DEFAULT_MAX_SKEW, window=OFFSET_WINDOW, clock=time.time):
+        self.max_age = max_age
+        self.max_skew = max_skew
+        self.window = window
+        self.clock = clock
+        self.offsets = {}    # venue -> estimated exchange clock minus local clock
+        self.dropped = {reason: 0 for reason in DROP_REASONS}
+        self._samples = {}   # venue -> recent exchange_ts - received_at
+
+    def observe(self, quote):
+        if quote.exchange_ts is None:
+            return
+        samples = self._samples.get(quote.venue)
+        if samples is None:
+            samples = self._samples[quote.venue] = deque(maxlen=self.window)
+        samples.append(quote.exchange_ts - quote.received_at)
+        offset = max(samples)
+        if offset != self.offsets.get(quote.venue):
+            self.offsets[quote.venue] = offset
+            metrics.clock_offset.labels(quote.venue).set(offset)
+
+    # Local time at which the venue produced the quote (the receive time if it has no timestamp)
+    def produced_at(self, quote):
+        offset = self.offsets.get(quote.venue)
+        if quote.exchange_ts is None or offset is None:
+            return quote.received_at
+        return quote.exchange_ts - offset
+
+    def _reason(self, first, second, now):
+        for quote in (first, second):
+            if quote.bid is None or quote.ask is None or quote.bid <= 0 or quote.ask < quote.bid:
+                return 'invalid'
+            if now - self.produced_at(quote) > self.max_age:
+                return 'stale'
+        if abs(self.produced_at(first) - self.produced_at(second)) > self.max_skew:
+            return 'skew'
+        return None
+
+    # Update the offsets from both quotes and return why the pair must be
+    # dropped ('invalid', 'stale' or 'skew'), or None if it can be compared
+    def check(self, first, second, now=None):
+        self.observe(first)
+        self.observe(second)
+        reason = self._reason(first, second, self.clock() if now is None else now)
+        if reason is not None:
+            self.dropped[reason] += 1
+            metrics.quotes_dropped.labels(reason).inc()
+            logging.warning('Dropping %s/%s quotes: %s', first.venue, second.venue, reason, extra={'event': 'quote_dropped'})
+        return reason
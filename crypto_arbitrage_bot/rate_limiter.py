@@ -0,0 +1,277 @@
+import bisect
+import itertools
+import logging
+import random
+import threading
+import time
+
+# Priority lanes, lowest value first: orders never queue behind market data,
+# and market data never queues behind balance checks
+ORDERS = 0
+QUOTES = 1
+BALANCES = 2
+LANE_NAMES = {ORDERS: 'orders', QUOTES: 'quotes', BALANCES: 'balances'}
+
+# Fraction of every bucket a lane may not dip into, so a burst of quotes or
+# balance checks always leaves room for an order
+LANE_RESERVE = {ORDERS: 0.0, QUOTES: 0.1, BALANCES: 0.3}
+
+# Attempts after the first. Orders are only retried when the exchange rejected
+# them for rate limiting (the order was never accepted); any other failure is
+# left to the executor so a timed-out order is never sent twice.
+LANE_RETRIES = {ORDERS: 2, QUOTES: 1, BALANCES: 3}
+
+RATE_LIMIT_STATUS = (418, 429)  # 418: Binance IP ban after ignoring 429s
+RATE_LIMIT_ERRORS = ('RateLimitExceeded', 'DDoSProtection')
+NETWORK_ERRORS = ('NetworkError', 'RequestTimeout', 'ExchangeNotAvailable', 'ConnectionError', 'Timeout',
+                  'TimeoutError', 'ChunkedEncodingError')
+
+
+class RateLimitTimeout(Exception):
+    pass
+
+
+def _error_names(error):
+    return {cls.__name__ for cls in type(error).__mro__}
+
+
+def status_code(error):
+    code = getattr(error, 'status_code', None)
+    if code is None:
+        code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return code if isinstance(code, int) else None
+
+
+def is_rate_limited(error):
+    return status_code(error) in RATE_LIMIT_STATUS or bool(_error_names(error) & set(RATE_LIMIT_ERRORS))
+
+
+# Rate limits, 5xx responses and transport errors are worth retrying;
+# rejected orders, bad symbols and missing funds are not
+def is_retryable(error):
+    code = status_code(error)
+    if code is not None and code >= 500:
+        return True
+    return is_rate_limited(error) or bool(_error_names(error) & set(NETWORK_ERRORS))
+
+
+# A transport failure or 5xx response to an order leaves it unknown whether the
+# exchange accepted it; rate limits and other rejections are definite
+def is_ambiguous(error):
+    return is_retryable(error) and not is_rate_limited(error)
+
+
+# Seconds from a Retry-After header on the error's HTTP response, if any
+def retry_after(error):
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+# Token bucket refilled continuously at capacity/period tokens per second.
+# `limit` is the exchange's published limit; `headroom` keeps capacity below it.
+class TokenBucket:
+    __slots__ = ('name', 'limit', 'capacity', 'rate', 'tokens', 'updated')
+
+    def __init__(self, name, limit, period, now, headroom=1.0):
+        self.name = name
+        self.limit = float(limit)
+        self.capacity = self.limit * headroom
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = now
+
+    def refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    # Seconds until `amount` can be taken without leaving less than `reserve` tokens
+    def wait_time(self, amount, reserve):
+        missing = amount + reserve - self.tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    # Never hold more tokens than the exchange says are left in its window
+    def sync(self, remaining):
+        self.tokens = min(self.tokens, self.capacity * remaining / self.limit)
+
+
+class LaneStats:
+    __slots__ = ('requests', 'retries', 'failures', 'throttled', 'wait_time')
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.throttled = 0      # requests that had to wait for tokens
+        self.wait_time = 0.0    # seconds spent waiting for tokens
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Central request scheduler for one venue. Every call names its lane and what
+# it costs in each bucket, e.g. call(QUOTES, {'weight': 2}, client.get_ticker, symbol='BTCUSDT').
+# Waiting calls are served in lane order; a lower lane only goes ahead of a
+# waiting higher lane when it needs none of the buckets that lane is short of.
+# Failed calls are retried with jittered exponential backoff, and a rate-limit
+# response pauses every lane for the exchange's Retry-After.
+class RequestScheduler:
+    def __init__(self, venue, limits, headroom=1.0, retries=None, base_delay=0.25, max_delay=30.0,
+                 clock=time.monotonic, sleep=time.sleep, rng=random.random):
+        now = clock()
+        self.venue = venue
+        self.buckets = {name: TokenBucket(name, limit, period, now, headroom) for name, (limit, period) in limits.items()}
+        self.retries = dict(LANE_RETRIES, **(retries or {}))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+        self.banned_until = 0.0    # every lane waits (rate-limit response)
+        self.cooldown_until = 0.0  # quotes and balances wait (repeated network failures)
+        self.consecutive_failures = 0
+        self.stats = {lane: LaneStats() for lane in LANE_NAMES}
+        self._cond = threading.Condition()
+        self._waiting = []  # sorted (lane, sequence, cost)
+        self._sequence = itertools.count()
+
+    # Jittered exponential backoff: half the capped exponential delay plus up to the same again
+    def backoff(self, attempt):
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay / 2 + self.rng() * delay / 2
+
+    def pause(self, seconds, all_lanes=True):
+        with self._cond:
+            until = self.clock() + seconds
+            if all_lanes:
+                self.banned_until = max(self.banned_until, until)
+            else:
+                self.cooldown_until = max(self.cooldown_until, until)
+            self._cond.notify_all()
+
+    # Back off market data and balance requests after a failure that survived
+    # its retries; returns the pause in seconds
+    def cool_down(self):
+        delay = self.backoff(self.consecutive_failures)
+        self.pause(delay, all_lanes=False)
+        return delay
+
+    # Response hook: keep the buckets in line with the exchange's own counters
+    # and honour Retry-After on 429/418 responses
+    def on_response(self, response):
+        headers = response.headers
+        with self._cond:
+            now = self.clock()
+            used = headers.get('X-MBX-USED-WEIGHT-1M')
+            if used is not None and 'weight' in self.buckets:
+                bucket = self.buckets['weight']
+                bucket.refill(now)
+                bucket.sync(max(0.0, bucket.limit - float(used)))
+            # KuCoin reports the pool the request counted against; match it by its limit
+            remaining, limit = headers.get('gw-ratelimit-remaining'), headers.get('gw-ratelimit-limit')
+            if remaining is not None and limit is not None:
+                for bucket in self.buckets.values():
+                    if bucket.limit == float(limit):
+                        bucket.refill(now)
+                        bucket.sync(float(remaining))
+        if response.status_code in RATE_LIMIT_STATUS:
+            try:
+                seconds = float(headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                seconds = self.backoff(self.consecutive_failures)
+            logging.error(f"{self.venue} rate limit hit (HTTP {response.status_code}); pausing all requests for {seconds:.1f}s")
+            self.pause(seconds)
+
+    # Seconds this waiter must still wait, or None if it has to wait for a
+    # higher lane to be served first
+    def _wait_time(self, ticket, now):
+        lane, _, cost = ticket
+        paused_until = self.banned_until if lane == ORDERS else max(self.banned_until, self.cooldown_until)
+        if now < paused_until:
+            return paused_until - now
+        blocked = set()
+        for other in self._waiting:
+            if other is ticket:
+                break
+            blocked.update(other[2])
+        if blocked.intersection(cost):
+            return None
+        wait = 0.0
+        for name, amount in cost.items():
+            bucket = self.buckets[name]
+            bucket.refill(now)
+            wait = max(wait, bucket.wait_time(amount, bucket.capacity * LANE_RESERVE[lane]))
+        return wait
+
+    def _acquire(self, lane, cost, max_wait):
+        stats = self.stats[lane]
+        started = self.clock()
+        throttled = False
+        ticket = (lane, next(self._sequence), cost)
+        with self._cond:
+            bisect.insort(self._waiting, ticket)  # sequence numbers are unique, costs never compared
+            try:
+                while True:
+                    now = self.clock()
+                    wait = self._wait_time(ticket, now)
+                    if wait == 0.0:
+                        for name, amount in cost.items():
+                            self.buckets[name].tokens -= amount
+                        break
+                    if max_wait is not None:
+                        if now + (wait or 0.0) - started > max_wait:
+                            raise RateLimitTimeout(f"{self.venue} {LANE_NAMES[lane]} request would wait over {max_wait}s for rate limits")
+                        if wait is None:
+                            wait = max_wait - (now - started)
+                    throttled = True
+                    self._cond.wait(wait)
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+        if throttled:
+            stats.throttled += 1
+            stats.wait_time += self.clock() - started
+
+    # Run fn(*args, **kwargs) once the lane's turn comes and the buckets allow
+    # it, retrying per the lane's policy. max_wait bounds the time spent
+    # waiting for tokens on each attempt (a quote that old is useless).
+    def call(self, lane, cost, fn, *args, max_wait=None, **kwargs):
+        stats = self.stats[lane]
+        attempt = 0
+        while True:
+            self._acquire(lane, cost, max_wait)
+            stats.requests += 1
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self.consecutive_failures += 1
+                rate_limited = is_rate_limited(e)
+                delay = self.backoff(attempt)
+                if rate_limited:
+                    delay = max(delay, retry_after(e) or 0.0)
+                    self.pause(delay)
+                retryable = rate_limited if lane == ORDERS else is_retryable(e)
+                if not retryable or attempt >= self.retries[lane]:
+                    stats.failures += 1
+                    raise
+                logging.warning('%s %s request failed (%s); retry %d in %.2fs', self.venue, LANE_NAMES[lane], e, attempt + 1, delay)
+                stats.retries += 1
+                attempt += 1
+                self.sleep(delay)
+                continue
+            self.consecutive_failures = 0
+            return result
+
+    def snapshot(self):
+        with self._cond:
+            now = self.clock()
+            for bucket in self.buckets.values():
+                bucket.refill(now)
+            return {
+                'buckets': {name: bucket.tokens / bucket.capacity for name, bucket in self.buckets.items()},
+                'lanes': {LANE_NAMES[lane]: stats.to_dict() for lane, stats in self.stats.items()},
+                'paused_for': max(0.0, self.banned_until - now),
+            }
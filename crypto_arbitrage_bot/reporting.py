@@ -0,0 +1,240 @@
+import csv
+import logging
+import os
+from datetime import datetime
+
+from crypto_arbitrage_bot import checkpoint, clients, market_data
+from crypto_arbitrage_bot.config import LOG_FILE, settings
+
+# Typed SQLite trade store used for period reports (day to year) by range query
+TRADE_STORE = 'trades.db'
+# Single append-only trade journal; period CSVs are views derived from it
+TRADE_JOURNAL = 'trades_journal.csv'
+
+# Initialize trade summaries and totals
+successful_trades = 0
+failed_trades = 0
+total_profit = 0
+amount_used = 0
+total_losses = 0
+
+# Counters above that are persisted in the state store and restored on start
+COUNTERS = ('successful_trades', 'failed_trades', 'total_profit', 'amount_used', 'total_losses')
+
+# Opened by open_trade_logs()
+trade_store = None
+trade_journal = None
+running_totals = None
+
+
+# Function to open the trade store, journal and running totals. The journal
+# loads every written batch into the store, and a new (empty) store is first
+# backfilled from the journal's history; the totals come from the state
+# store, or are rebuilt once from the journal if it has none.
+def open_trade_logs():
+    global trade_store, trade_journal, running_totals
+    if trade_journal is not None:
+        return
+    from crypto_arbitrage_bot.trade_journal import TradeJournal
+    from crypto_arbitrage_bot.trade_store import TradeStore
+    from crypto_arbitrage_bot.trade_totals import RunningTotals
+
+    trade_store = TradeStore(TRADE_STORE)
+    if trade_store.count() == 0 and os.path.exists(TRADE_JOURNAL):
+        imported = trade_store.import_csv(TRADE_JOURNAL)
+        logging.info(f"Backfilled {imported} trades from {TRADE_JOURNAL} into {TRADE_STORE}")
+    trade_journal = TradeJournal(TRADE_JOURNAL, on_batch=trade_store.insert_csv_rows)
+    running_totals = RunningTotals(on_change=checkpoint.record_totals)
+    running_totals.restore(checkpoint.snapshot('totals'), {period: TRADE_JOURNAL for period in period_log_files()})
+    trade_journal.start()
+
+
+# Function to set the counters from a restored state ({name: value}); missing ones start at zero
+def restore_counters(counters):
+    globals().update({name: counters.get(name, 0) for name in COUNTERS})
+
+
+# Function to flush and close the trade store and journal
+def close_trade_logs():
+    global trade_store, trade_journal, running_totals
+    if trade_journal is None:
+        return
+    export_period_logs()
+    trade_journal.close()
+    trade_store.close()
+    trade_store = trade_journal = running_totals = None
+
+
+# Function to log and print results in table format
+# An opportunity that was not traded (`reason`, e.g. insufficient funds) is
+# recorded as failed with no profit.
+def log_and_print_results(binance_price, kucoin_price, profit, reason=None):
+    global successful_trades, failed_trades, total_profit, amount_used, total_losses
+    open_trade_logs()
+
+    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    difference = abs(binance_price - kucoin_price)
+    if reason is not None:
+        profit = 0.0
+    if profit >= 0.01:
+        result = "Successful"
+        successful_trades += 1
+        total_profit += profit
+        changes = {'successful_trades': 1, 'total_profit': profit}
+    else:
+        result = "Failed" if reason is None else f"Failed ({reason})"
+        failed_trades += 1
+        changes = {'failed_trades': 1}
+        if profit < 0:
+            total_losses += abs(profit)
+            changes['total_losses'] = abs(profit)
+    running_totals.record(profit)
+
+    # Determine recommendation
+    if binance_price > kucoin_price:
+        recommendation = 'Buy on Kucoin and sell on Binance'
+    else:
+        recommendation = 'Buy on Binance and sell on Kucoin'
+
+    logging.info('%s - Binance: $%s, Kucoin: $%s, Difference: $%.2f, Profit: $%.2f, Result: %s, Recommendation: %s',
+                 current_time, binance_price, kucoin_price, difference, profit, result, recommendation,
+                 extra={'event': 'trade'})
+
+    # Update amount used (example); an opportunity that was not traded used none
+    if reason is None:
+        amount_used += 50  # Adjust based on your trading logic
+        changes['amount_used'] = 50
+    checkpoint.record('counters', changes)
+
+    # Save results to the journal
+    save_to_journal(current_time, binance_price, kucoin_price, difference, profit, result, recommendation)
+
+    # HEADLESS=true skips the console table and summaries entirely
+    if settings.headless:
+        return
+
+    # Print results in table format
+    from tabulate import tabulate
+    table_data = [
+        ["Time", "Binance BTC/USDT Price", "Kucoin BTC/USDT Price", "Difference", "Profit", "Result", "Recommendation"],
+        [current_time, f'${binance_price}', f'${kucoin_price}', f'${difference:.2f}', f'${profit:.2f}', result, recommendation]
+    ]
+    print(tabulate(table_data, headers="firstrow", tablefmt="grid"))
+
+    # Print trade summaries and totals
+    print("\nTrade Summaries:")
+    print(f"Successful Trades: {successful_trades}")
+    print(f"Failed Trades: {failed_trades}")
+    print(f"Total Profit: ${total_profit:.2f}")
+    print(f"Total Losses: ${total_losses:.2f}")
+    print(f"Amount Used for Trading: ${amount_used}")
+    print(f"Total Profit after Fees and Costs: ${total_profit - amount_used:.2f}")
+
+
+# Function to save results to the trade journal (one row per trade, written in batches)
+def save_to_journal(current_time, binance_price, kucoin_price, difference, profit, result, recommendation):
+    trade_journal.append([current_time, f'${binance_price}', f'${kucoin_price}', f'${difference:.2f}', f'${profit:.2f}', result, recommendation])
+
+
+# Period CSV file names, derived from the journal on demand
+def period_log_files(now=None):
+    now = now or datetime.now()
+    return {
+        'daily': 'daily_trades.csv',
+        'weekly': f'weekly_trades_week_{now.isocalendar()[1]}.csv',
+        'monthly': f'monthly_trades_{now.strftime("%Y-%m")}.csv',
+    }
+
+
+# Function to write the daily, weekly and monthly CSV views from the journal
+def export_period_logs():
+    trade_journal.flush()
+    for period, log_file in period_log_files().items():
+        trade_journal.export_period(period, log_file)
+
+
+# Function to calculate total profit for a given log file
+def calculate_totals(log_file):
+    total_profit = 0
+    if os.path.exists(log_file):
+        with open(log_file, mode='r', newline='') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                total_profit += float(row['Profit'].replace('$', ''))
+    return total_profit
+
+
+# Function to calculate trade summaries from log files
+def calculate_trade_summaries(log_file):
+    total_profit = 0
+    successful_trades = 0
+    failed_trades = 0
+    total_losses = 0
+
+    if os.path.exists(log_file):
+        with open(log_file, mode='r', newline='') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                profit = float(row['Profit'].replace('$', ''))
+                total_profit += profit
+                if profit >= 0.01:
+                    successful_trades += 1
+                else:
+                    failed_trades += 1
+                    if profit < 0:
+                        total_losses += abs(profit)
+    return total_profit, successful_trades, failed_trades, total_losses
+
+
+# Function to log totals for daily, weekly, and monthly periods
+def log_totals():
+    for period in ('daily', 'weekly', 'monthly'):
+        total, successful, failed, losses = running_totals.summary(period)
+        logging.info('%s Total Profit: $%.2f, Successful Trades: %s, Failed Trades: %s, Total Losses: $%.2f',
+                     period.capitalize(), total, successful, failed, losses, extra={'event': 'totals'})
+
+
+# Function to log day, week, month, quarter, half-year and year summaries from the trade store
+def log_period_report():
+    from crypto_arbitrage_bot.trade_store import PERIOD_NAMES
+    for period in PERIOD_NAMES:
+        total, successful, failed, losses = trade_store.summarize_period(period)
+        logging.info(f"{period.capitalize()} Report - Total Profit: ${total:.2f}, Successful Trades: {successful}, Failed Trades: {failed}, Total Losses: ${losses:.2f}")
+
+
+# Function to log connection reuse and request counts per exchange session
+def log_session_stats():
+    for venue, stats in clients.get_sessions().stats().items():
+        logging.info(f"{venue} session - Requests: {stats['requests']}, Errors: {stats['errors']}, Connections Opened: {stats['connections_opened']}, Mean Request Time: {stats['mean_request_time'] * 1000:.1f} ms")
+    for venue in clients.VENUE_LIMITS:
+        snapshot = clients.get_scheduler(venue).snapshot()
+        buckets = ', '.join(f"{name}: {left:.0%}" for name, left in snapshot['buckets'].items())
+        lanes = ', '.join(f"{lane}: {stats['requests']} req/{stats['retries']} retries/{stats['throttled']} throttled"
+                          for lane, stats in snapshot['lanes'].items())
+        logging.info(f"{venue} rate limits - Tokens left: {buckets}; {lanes}")
+    guard = market_data.get_price_fetcher().guard
+    if guard is not None:
+        offsets = ', '.join(f"{venue}: {offset * 1000:+.1f} ms" for venue, offset in guard.offsets.items())
+        dropped = ', '.join(f"{reason}: {count}" for reason, count in guard.dropped.items())
+        logging.info(f"Quote guard - Clock offsets: {offsets or 'n/a'}; Dropped pairs: {dropped}")
+
+
+def clear_all_logs_and_csv_files():
+    # List of log and CSV files to clear
+    log_files = [LOG_FILE]
+    csv_files = [TRADE_JOURNAL] + list(period_log_files().values())
+
+    # Clear log files
+    for log_file in log_files:
+        if os.path.exists(log_file):
+            open(log_file, 'w').close()  # Truncate file
+            logging.info(f"Cleared log file: {log_file}")
+
+    # Clear CSV files
+    for csv_file in csv_files:
+        if os.path.exists(csv_file):
+            open(csv_file, 'w').close()  # Truncate file
+            logging.info(f"Cleared CSV file: {csv_file}")
+
+    # Counters, period totals, open orders and balances start from zero as well
+    checkpoint.clear_state(settings.state_dir)
@@ -0,0 +1,86 @@
+import numpy as np
+
+DEFAULT_FEE_RATE = 0.001  # 0.1% taker fee, as in calculate_fees
+
+
+# A directed cross-exchange opportunity: buy `symbol` at the ask on
+# `buy_exchange` and sell it at the bid on `sell_exchange`
+class Opportunity:
+    __slots__ = ('symbol', 'buy_exchange', 'sell_exchange', 'buy_price', 'sell_price', 'net_spread', 'net_spread_pct')
+
+    def __init__(self, symbol, buy_exchange, sell_exchange, buy_price, sell_price, net_spread, net_spread_pct):
+        self.symbol = symbol
+        self.buy_exchange = buy_exchange
+        self.sell_exchange = sell_exchange
+        self.buy_price = buy_price
+        self.sell_price = sell_price
+        self.net_spread = net_spread
+        self.net_spread_pct = net_spread_pct
+
+    def __repr__(self):
+        return (f'Opportunity({self.symbol!r}, buy={self.buy_exchange!r}@{self.buy_price}, '
+                f'sell={self.sell_exchange!r}@{self.sell_price}, net={self.net_spread_pct:.4%})')
+
+
+# Keeps best bid/ask matrices (symbol x exchange) and computes the fee-adjusted
+# spread of every directed exchange pair for every symbol in one vectorized pass.
+class OpportunityScanner:
+    def __init__(self, symbols, exchanges, fee_rates=DEFAULT_FEE_RATE):
+        self.symbols = list(symbols)
+        self.exchanges = list(exchanges)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.exchange_index = {exchange: j for j, exchange in enumerate(self.exchanges)}
+        shape = (len(self.symbols), len(self.exchanges))
+        self.bids = np.full(shape, np.nan)
+        self.asks = np.full(shape, np.nan)
+        if isinstance(fee_rates, dict):
+            fees = [fee_rates.get(exchange, DEFAULT_FEE_RATE) for exchange in self.exchanges]
+        else:
+            fees = [fee_rates] * len(self.exchanges)
+        self.fee_rates = np.asarray(fees, dtype=float)
+        # Buying and selling on the same exchange is not an arbitrage
+        self._same_exchange = np.eye(len(self.exchanges), dtype=bool)[np.newaxis, :, :]
+
+    def update(self, symbol, exchange, bid, ask):
+        i = self.symbol_index[symbol]
+        j = self.exchange_index[exchange]
+        self.bids[i, j] = bid
+        self.asks[i, j] = ask
+
+    # Bulk update from index arrays, e.g. a batch of book-ticker pushes
+    def update_many(self, symbol_indices, exchange_indices, bids, asks):
+        self.bids[symbol_indices, exchange_indices] = bids
+        self.asks[symbol_indices, exchange_indices] = asks
+
+    # Net spread matrices of shape (symbol, buy exchange, sell exchange): the
+    # per-unit profit after both fees, and that profit relative to the buy cost.
+    # `rows` restricts the pass to those symbol indices (e.g. the ones that changed).
+    def spreads(self, rows=None):
+        bids, asks = (self.bids, self.asks) if rows is None else (self.bids[rows], self.asks[rows])
+        buy_cost = asks * (1 + self.fee_rates)
+        sell_proceeds = bids * (1 - self.fee_rates)
+        net = sell_proceeds[:, np.newaxis, :] - buy_cost[:, :, np.newaxis]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            net_pct = net / buy_cost[:, :, np.newaxis]
+        net_pct = np.where(self._same_exchange | np.isnan(net_pct), -np.inf, net_pct)
+        return net, net_pct
+
+    # Return opportunities whose net spread exceeds min_spread_pct (a fraction,
+    # e.g. 0.0005 for 5 bps), best first, optionally only the top `limit`,
+    # optionally only among the symbol indices in `rows`
+    def scan(self, min_spread_pct=0.0, limit=None, rows=None):
+        net, net_pct = self.spreads(rows)
+        flat = net_pct.ravel()
+        candidates = np.flatnonzero(flat > min_spread_pct)
+        if limit is not None and candidates.size > limit:
+            top = np.argpartition(flat[candidates], -limit)[-limit:]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(flat[candidates])[::-1]]
+        local, buys, sells = np.unravel_index(candidates, net_pct.shape)
+        symbols = local if rows is None else np.asarray(rows)[local]
+        return [
+            Opportunity(self.symbols[s], self.exchanges[b], self.exchanges[k],
+                        float(self.asks[s, b]), float(self.bids[s, k]),
+                        float(net[i, b, k]), float(net_pct[i, b, k]))
+            for i, s, b, k in zip(local.tolist(), symbols.tolist(), buys.tolist(), sells.tolist())
+        ]
@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MARKETS_TTL = 3600  # seconds
+
+
+# Mount a keep-alive connection pool on an HTTP session. Connections are kept
+# open between requests, so only the first request to a host pays for the TCP
+# and TLS handshakes. Retries are left to the caller.
+def tune_session(session, pool_size=DEFAULT_POOL_SIZE):
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def build_http_session(pool_size=DEFAULT_POOL_SIZE):
+    return tune_session(requests.Session(), pool_size)
+
+
+# One venue's shared client, HTTP session, cached market metadata and counters
+class ExchangeSession:
+    def __init__(self, venue, client, http, on_response=None):
+        self.venue = venue
+        self.client = client
+        self.http = http
+        self.markets = None
+        self.markets_loaded_at = None
+        self.requests = 0
+        self.errors = 0
+        self.request_time = 0.0
+        self.on_response = on_response
+        http.hooks['response'].append(self._on_response)
+
+    def _on_response(self, response, *args, **kwargs):
+        self.requests += 1
+        self.request_time += response.elapsed.total_seconds()
+        if response.status_code >= 400:
+            self.errors += 1
+        if self.on_response is not None:
+            try:
+                self.on_response(response)
+            except Exception as e:
+                logging.error(f"Error in {self.venue} response hook: {e}")
+
+    # Connection reuse from the urllib3 pools: connections opened vs requests sent
+    def pool_stats(self):
+        pools = connections = pooled_requests = 0
+        for adapter in set(self.http.adapters.values()):
+            manager = getattr(adapter, 'poolmanager', None)
+            if manager is None:
+                continue
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                pools += 1
+                connections += pool.num_connections
+                pooled_requests += pool.num_requests
+        return {'pools': pools, 'connections_opened': connections, 'pooled_requests': pooled_requests}
+
+
+# Registry holding a single pooled, keep-alive client per venue. Clients are
+# built lazily on first use by the registered factory, which receives the
+# venue's tuned requests.Session; market metadata is loaded once and cached.
+class ExchangeSessionRegistry:
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, markets_ttl=DEFAULT_MARKETS_TTL, clock=time.monotonic):
+        self.pool_size = pool_size
+        self.markets_ttl = markets_ttl
+        self.clock = clock
+        self._factories = {}
+        self._sessions = {}
+        self._lock = threading.RLock()
+
+    # factory(http_session) -> client; markets_loader(client) -> market metadata;
+    # on_response(response) sees every HTTP response on the venue's session
+    def register(self, venue, factory, markets_loader=None, on_response=None):
+        with self._lock:
+            self._factories[venue] = (factory, markets_loader, on_response)
+
+    def session(self, venue):
+        session = self._sessions.get(venue)
+        if session is not None:
+            return session
+        with self._lock:
+            if venue not in self._sessions:
+                factory, _, on_response = self._factories[venue]
+                http = build_http_session(self.pool_size)
+                client = factory(http)
+                # Clients that build their own session (e.g. python-binance) get it tuned instead
+                client_http = getattr(client, 'session', None)
+                if isinstance(client_http, requests.Session) and client_http is not http:
+                    http = tune_session(client_http, self.pool_size)
+                self._sessions[venue] = ExchangeSession(venue, client, http, on_response)
+            return self._sessions[venue]
+
+    def get(self, venue):
+        return self.session(venue).client
+
+    # Cached market metadata, reloaded after markets_ttl seconds or on request
+    def markets(self, venue, reload=False):
+        session = self.session(venue)
+        _, loader, _ = self._factories[venue]
+        if loader is None:
+            return None
+        stale = session.markets_loaded_at is None or self.clock() - session.markets_loaded_at > self.markets_ttl
+        if reload or stale:
+            with self._lock:
+                session.markets = loader(session.client)
+                session.markets_loaded_at = self.clock()
+        return session.markets
+
+    # Build every client and load its markets so handshakes and the first
+    # metadata download happen at startup instead of on the trading path
+    def warm_up(self, venues=None):
+        for venue in venues or list(self._factories):
+            try:
+                self.markets(venue)
+            except Exception as e:
+                logging.error(f"Error warming up {venue} session: {e}")
+
+    def stats(self):
+        stats = {}
+        for venue, session in list(self._sessions.items()):
+            venue_stats = session.pool_stats()
+            venue_stats.update({
+                'requests': session.requests,
+                'errors': session.errors,
+                'mean_request_time': session.request_time / session.requests if session.requests else 0.0,
+                'markets_cached': session.markets is not None,
+                'markets_age': None if session.markets_loaded_at is None else self.clock() - session.markets_loaded_at,
+            })
+            stats[venue] = venue_stats
+        return stats
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.http.close()
+            self._sessions.clear()
@@ -0,0 +1,250 @@
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from crypto_arbitrage_bot.config import configure_logging
+from crypto_arbitrage_bot.scanner import DEFAULT_FEE_RATE, OpportunityScanner
+
+# Fields of each (symbol, exchange) quote slot in the shared matrix
+QUOTE_FIELDS = ('bid', 'ask', 'exchange_ts', 'received_at')
+BID, ASK, EXCHANGE_TS, RECEIVED_AT = range(len(QUOTE_FIELDS))
+
+# Per-process counters kept in shared memory: one row per shard worker, the last row for the executor
+STAT_FIELDS = ('batches', 'rows', 'opportunities')
+
+
+# Function to split n symbols into `shards` contiguous, near-equal (start, stop) ranges
+def shard_ranges(n, shards):
+    shards = max(1, min(shards, n))
+    size, extra = divmod(n, shards)
+    ranges, start = [], 0
+    for i in range(shards):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+# Best bid/ask per (symbol, exchange) in one shared memory block that every
+# process maps as NumPy arrays without copying. Each symbol row has a sequence
+# number used as a seqlock: the single writer makes it odd, writes, then makes
+# it even again; readers copy a block of rows and keep only the rows whose
+# sequence was even and unchanged across the copy. `seen` holds, per row, the
+# sequence number a shard worker last scanned, so a restarted worker carries
+# on where the one before it stopped instead of rescanning every row.
+class QuoteMatrix:
+    def __init__(self, n_symbols, n_exchanges, n_stats=0, name=None):
+        self.shape = (n_symbols, n_exchanges, len(QUOTE_FIELDS))
+        quotes_size = 8 * n_symbols * n_exchanges * len(QUOTE_FIELDS)
+        seq_size = 8 * n_symbols
+        seen_size = 8 * n_symbols
+        stats_size = 8 * n_stats * len(STAT_FIELDS)
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, quotes_size + seq_size + seen_size + stats_size))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.quotes = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)
+        self.seq = np.ndarray((n_symbols,), dtype=np.int64, buffer=self.shm.buf, offset=quotes_size)
+        self.seen = np.ndarray((n_symbols,), dtype=np.int64, buffer=self.shm.buf, offset=quotes_size + seq_size)
+        self.stats = np.ndarray((n_stats, len(STAT_FIELDS)), dtype=np.int64, buffer=self.shm.buf,
+                                offset=quotes_size + seq_size + seen_size)
+        if self.owner:
+            self.quotes.fill(np.nan)
+            self.seq.fill(0)
+            self.seen.fill(0)
+            self.stats.fill(0)
+
+    # What another process needs to attach to the same block
+    @property
+    def layout(self):
+        return self.shape[0], self.shape[1], self.stats.shape[0], self.shm.name
+
+    @classmethod
+    def attach(cls, layout):
+        n_symbols, n_exchanges, n_stats, name = layout
+        return cls(n_symbols, n_exchanges, n_stats, name)
+
+    def write(self, row, column, bid, ask, exchange_ts=math.nan, received_at=None):
+        self.seq[row] += 1
+        self.quotes[row, column] = (bid, ask, exchange_ts, time.time() if received_at is None else received_at)
+        self.seq[row] += 1
+
+    # Bulk write from index arrays (rows must be unique), e.g. a batch of ticker pushes
+    def write_many(self, rows, columns, bids, asks, exchange_ts=math.nan, received_at=None):
+        self.seq[rows] += 1
+        self.quotes[rows, columns, BID] = bids
+        self.quotes[rows, columns, ASK] = asks
+        self.quotes[rows, columns, EXCHANGE_TS] = exchange_ts
+        self.quotes[rows, columns, RECEIVED_AT] = time.time() if received_at is None else received_at
+        self.seq[rows] += 1
+
+    # Copy rows start:stop; returns (sequence numbers, quotes, mask of rows that were not mid-write)
+    def read(self, start, stop):
+        before = self.seq[start:stop].copy()
+        block = self.quotes[start:stop].copy()
+        consistent = (before == self.seq[start:stop]) & (before % 2 == 0)
+        return before, block, consistent
+
+    def close(self):
+        # The views must go before the mapping can be closed
+        self.quotes = self.seq = self.seen = self.stats = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# Default execution handler: log the opportunity
+def log_opportunity(opportunity):
+    logging.info('Sharded opportunity: %s', opportunity, extra={'event': 'opportunity'})
+
+
+# Shard worker process: poll the shard's sequence numbers, scan only the rows
+# that changed since the last pass and queue what it finds for the executor.
+# The rows' last scanned sequence numbers live in the shared matrix and are
+# updated only after the opportunities are queued, so a restarted worker
+# skips rows its predecessor already scanned (no standing opportunity is
+# queued twice) but still scans the ones that changed in between.
+def run_worker(index, layout, symbols, exchanges, start, stop, fee_rates, min_spread_pct, opportunities, stop_event,
+               poll_interval):
+    matrix = QuoteMatrix.attach(layout)
+    scanner = OpportunityScanner(symbols, exchanges, fee_rates)
+    seen = matrix.seen[start:stop]  # 0: never written
+    stats = matrix.stats[index]
+    try:
+        while not stop_event.is_set():
+            sequences, block, consistent = matrix.read(start, stop)
+            changed = np.flatnonzero(consistent & (sequences != seen))
+            if not changed.size:
+                # Rows caught mid-write are simply read again on the next pass
+                time.sleep(poll_interval)
+                continue
+            scanner.bids[changed] = block[changed, :, BID]
+            scanner.asks[changed] = block[changed, :, ASK]
+            found = scanner.scan(min_spread_pct, rows=changed)
+            for opportunity in found:
+                opportunities.put(opportunity)
+            seen[changed] = sequences[changed]
+            stats += (1, changed.size, len(found))
+    finally:
+        del seen, stats
+        matrix.close()
+
+
+# Execution process: the only consumer of the shards' opportunities, so
+# orders are placed one at a time no matter how many workers detect them
+def run_executor(layout, opportunities, handler, stop_event, log_file):
+    if log_file:
+        configure_logging(log_file)
+    matrix = QuoteMatrix.attach(layout)
+    stats = matrix.stats[-1]
+    try:
+        while True:
+            try:
+                opportunity = opportunities.get(timeout=0.1)
+            except queue.Empty:
+                if stop_event.is_set():
+                    break
+                continue
+            try:
+                handler(opportunity)
+            except Exception as e:
+                logging.error(f"Error executing {opportunity}: {e}")
+            stats[2] += 1
+    finally:
+        del stats
+        matrix.close()
+
+
+# Runs detection for many symbols across processes: symbols are split into
+# contiguous shards, one worker process each, all reading the same shared
+# quote matrix, and every opportunity goes to a single execution process.
+# The supervisor is the matrix's only writer (publish) and restarts workers
+# that die (check). handler must be a module-level function so it can be
+# sent to the execution process.
+class ShardSupervisor:
+    def __init__(self, symbols, exchanges, workers=None, fee_rates=DEFAULT_FEE_RATE, min_spread_pct=0.0,
+                 handler=log_opportunity, poll_interval=0.0005, log_file=None, start_method='spawn'):
+        self.symbols = list(symbols)
+        self.exchanges = list(exchanges)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.exchange_index = {exchange: j for j, exchange in enumerate(self.exchanges)}
+        self.shards = shard_ranges(len(self.symbols), workers or os.cpu_count() or 1)
+        self.fee_rates = fee_rates
+        self.min_spread_pct = min_spread_pct
+        self.handler = handler
+        self.poll_interval = poll_interval
+        self.log_file = log_file
+        self._context = multiprocessing.get_context(start_method)
+        self.matrix = None
+        self.workers = []
+        self.executor = None
+
+    def start(self):
+        self.matrix = QuoteMatrix(len(self.symbols), len(self.exchanges), len(self.shards) + 1)
+        self.opportunities = self._context.Queue()
+        self.stop_event = self._context.Event()
+        self.workers = [self._start_worker(index) for index in range(len(self.shards))]
+        self.executor = self._context.Process(
+            target=run_executor, name='arbitrage-executor', daemon=True,
+            args=(self.matrix.layout, self.opportunities, self.handler, self.stop_event, self.log_file),
+        )
+        self.executor.start()
+        logging.info(f"Started {len(self.shards)} shard workers for {len(self.symbols)} symbols")
+        return self
+
+    def _start_worker(self, index):
+        start, stop = self.shards[index]
+        process = self._context.Process(
+            target=run_worker, name=f'arbitrage-shard-{index}', daemon=True,
+            args=(index, self.matrix.layout, self.symbols[start:stop], self.exchanges, start, stop, self.fee_rates,
+                  self.min_spread_pct, self.opportunities, self.stop_event, self.poll_interval),
+        )
+        process.start()
+        return process
+
+    def publish(self, symbol, exchange, bid, ask, exchange_ts=math.nan, received_at=None):
+        self.matrix.write(self.symbol_index[symbol], self.exchange_index[exchange], bid, ask, exchange_ts, received_at)
+
+    def publish_many(self, rows, columns, bids, asks, exchange_ts=math.nan, received_at=None):
+        self.matrix.write_many(rows, columns, bids, asks, exchange_ts, received_at)
+
+    # Restart any worker that exited; returns the restarted shard indices
+    def check(self):
+        restarted = []
+        for index, process in enumerate(self.workers):
+            if not process.is_alive() and not self.stop_event.is_set():
+                logging.error(f"Shard worker {index} exited with code {process.exitcode}; restarting it")
+                self.workers[index] = self._start_worker(index)
+                restarted.append(index)
+        return restarted
+
+    def stats(self):
+        rows = self.matrix.stats.tolist()
+        return {
+            'workers': [dict(zip(STAT_FIELDS, row)) for row in rows[:-1]],
+            'executed': rows[-1][2],
+        }
+
+    # Stop the workers, let the executor drain the queue, then free the shared memory
+    def stop(self, timeout=5.0):
+        self.stop_event.set()
+        for process in self.workers + [self.executor]:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.opportunities.close()
+        self.matrix.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,143 @@
+from bisect import bisect_left
+
+DEFAULT_FEE_RATE = 0.001  # 0.1% taker fee, as in calculate_fees
+
+
+# Net profit of buying `quantity` at buy_price and selling it at sell_price,
+# with fees charged as a rate on each leg's notional
+def net_profit(buy_price, sell_price, quantity, buy_fee_rate=DEFAULT_FEE_RATE, sell_fee_rate=DEFAULT_FEE_RATE):
+    return (sell_price * (1 - sell_fee_rate) - buy_price * (1 + buy_fee_rate)) * quantity
+
+
+# L2 order book kept up to date with incremental level updates. Prices are held
+# in sorted arrays next to a price -> quantity map, so an update is a dict write
+# plus a binary search, and walking the book never needs a sort.
+class OrderBook:
+    def __init__(self, bids=(), asks=()):
+        self._bid_prices = []  # ascending; best bid is last
+        self._ask_prices = []  # ascending; best ask is first
+        self._bids = {}
+        self._asks = {}
+        self.apply_snapshot(bids, asks)
+
+    def apply_snapshot(self, bids, asks):
+        self._bids = {float(price): float(quantity) for price, quantity in bids if float(quantity) > 0}
+        self._asks = {float(price): float(quantity) for price, quantity in asks if float(quantity) > 0}
+        self._bid_prices = sorted(self._bids)
+        self._ask_prices = sorted(self._asks)
+
+    # Set the quantity at one price level; a quantity of 0 removes the level
+    def update(self, side, price, quantity):
+        price = float(price)
+        quantity = float(quantity)
+        levels, prices = (self._bids, self._bid_prices) if side == 'bid' else (self._asks, self._ask_prices)
+        if quantity <= 0:
+            if levels.pop(price, None) is not None:
+                del prices[bisect_left(prices, price)]
+        else:
+            if price not in levels:
+                prices.insert(bisect_left(prices, price), price)
+            levels[price] = quantity
+
+    # Apply a depth diff: lists of [price, quantity] pairs per side
+    def apply_updates(self, bids=(), asks=()):
+        for price, quantity in bids:
+            self.update('bid', price, quantity)
+        for price, quantity in asks:
+            self.update('ask', price, quantity)
+
+    @property
+    def best_bid(self):
+        return self._bid_prices[-1] if self._bid_prices else None
+
+    @property
+    def best_ask(self):
+        return self._ask_prices[0] if self._ask_prices else None
+
+    # Levels best first as (price, quantity)
+    def bids(self):
+        for price in reversed(self._bid_prices):
+            yield price, self._bids[price]
+
+    def asks(self):
+        for price in self._ask_prices:
+            yield price, self._asks[price]
+
+
+# Outcome of sizing a buy-here, sell-there trade against both books
+class SizingResult:
+    __slots__ = ('quantity', 'buy_cost', 'sell_proceeds', 'net_profit', 'levels', 'buy_venue', 'sell_venue',
+                 'buy_price', 'sell_price')
+
+    def __init__(self, quantity=0.0, buy_cost=0.0, sell_proceeds=0.0, net_profit=0.0, levels=0):
+        self.quantity = quantity
+        self.buy_cost = buy_cost            # quote spent, fees included
+        self.sell_proceeds = sell_proceeds  # quote received, fees deducted
+        self.net_profit = net_profit
+        self.levels = levels                # price levels consumed across both books
+        self.buy_venue = None               # venues of the two books, set by callers that know them
+        self.sell_venue = None
+        self.buy_price = None               # best ask of the buy book and best bid of the sell book
+        self.sell_price = None
+
+    @property
+    def avg_buy_price(self):
+        return self.buy_cost / self.quantity if self.quantity else None
+
+    @property
+    def avg_sell_price(self):
+        return self.sell_proceeds / self.quantity if self.quantity else None
+
+    def __repr__(self):
+        return f'SizingResult(quantity={self.quantity:.8f}, net_profit={self.net_profit:.4f})'
+
+
+# Walk the asks of buy_book and the bids of sell_book together and return the
+# quantity that maximises net profit after fees. Every unit filled at a later
+# level is worth less than the one before, so profit is maximised by filling
+# while the marginal unit is still profitable. slippage_rate widens every
+# price by that fraction as a buffer against the book moving before the fill;
+# max_quantity (base) and max_cost (quote, fees included) cap the size.
+def optimal_size(buy_book, sell_book, buy_fee_rate=DEFAULT_FEE_RATE, sell_fee_rate=DEFAULT_FEE_RATE,
+                 max_quantity=None, max_cost=None, slippage_rate=0.0):
+    result = SizingResult()
+    asks = buy_book.asks()
+    bids = sell_book.bids()
+    ask = next(asks, None)
+    bid = next(bids, None)
+    if ask is None or bid is None:
+        return result
+    ask_price, ask_left = ask
+    bid_price, bid_left = bid
+    result.levels = 2
+    while True:
+        unit_cost = ask_price * (1 + slippage_rate) * (1 + buy_fee_rate)
+        unit_proceeds = bid_price * (1 - slippage_rate) * (1 - sell_fee_rate)
+        if unit_proceeds <= unit_cost:
+            break
+        take = min(ask_left, bid_left)
+        if max_quantity is not None:
+            take = min(take, max_quantity - result.quantity)
+        if max_cost is not None:
+            take = min(take, (max_cost - result.buy_cost) / unit_cost)
+        if take <= 0:
+            break
+        result.quantity += take
+        result.buy_cost += take * unit_cost
+        result.sell_proceeds += take * unit_proceeds
+        ask_left -= take
+        bid_left -= take
+        if ask_left <= 0:
+            ask = next(asks, None)
+            if ask is None:
+                break
+            ask_price, ask_left = ask
+            result.levels += 1
+        if bid_left <= 0:
+            bid = next(bids, None)
+            if bid is None:
+                break
+            bid_price, bid_left = bid
+            result.levels += 1
+    result.net_profit = result.sell_proceeds - result.buy_cost
+    return result
@@ -0,0 +1,142 @@
+import functools
+import logging
+import time
+
+from crypto_arbitrage_bot import market_data, metrics, orders, reporting
+from crypto_arbitrage_bot.config import settings
+from crypto_arbitrage_bot.engine import Engine
+from crypto_arbitrage_bot.market_stream import executable_prices
+from crypto_arbitrage_bot.pricing import (
+    FEE_RATE, calculate_depth_sizing, calculate_position_size, evaluate_opportunity,
+)
+
+# Engine loop: strategy evaluation, order placement and reporting each run on their own lane
+engine = Engine(lanes=('strategy', 'orders', 'reporting'))
+
+# Binary TickRecorder for backtesting, opened by main() when TICK_RECORD_FILE is set
+tick_recorder = None
+
+
+# Function to size a trade against both order books (None if depth is unavailable)
+def fetch_depth_sizing(budget):
+    try:
+        price_fetcher = market_data.get_price_fetcher()
+        binance_book = price_fetcher.submit(market_data.get_binance_order_book)
+        kucoin_book = price_fetcher.submit(market_data.get_kucoin_order_book)
+        return calculate_depth_sizing(binance_book.result(), kucoin_book.result(), budget)
+    except Exception as e:
+        logging.error(f"Error fetching order books, sizing from quoted prices: {e}")
+        return None
+
+
+# Function to evaluate a trade between the venues (buy at buy_price on
+# buy_venue, sell at sell_price on sell_venue) and record any opportunity
+def evaluate_arbitrage(buy_venue, buy_price, sell_venue, sell_price):
+    prices = {buy_venue: buy_price, sell_venue: sell_price}
+    logging.info('Binance BTC/USDT Price: $%s', prices['Binance'], extra={'event': 'quote', 'venue': 'Binance'})
+    logging.info('Kucoin BTC/USDT Price: $%s', prices['KuCoin'], extra={'event': 'quote', 'venue': 'KuCoin'})
+    detected_at = time.monotonic()
+
+    capital = 50  # Example capital amount (USDT), adjust as needed
+    allocation_percentage = 50  # Allocate 100% of capital per trade
+    position_value = calculate_position_size(capital, allocation_percentage)  # USDT
+
+    # Same decision as the backtest: threshold, then size against both order
+    # books, falling back to the quoted prices if depth is unavailable
+    opportunity = evaluate_opportunity(buy_venue, buy_price, sell_venue, sell_price, 10, position_value,
+                                       FEE_RATE, settings.slippage_rate, functools.partial(fetch_depth_sizing, position_value))
+    if opportunity is None:
+        return
+    metrics.opportunities.inc()
+    binance_price, kucoin_price = opportunity.price('Binance'), opportunity.price('KuCoin')
+    quantity, profit = opportunity.quantity, opportunity.profit
+
+    # Check for stop-loss
+    if opportunity.stop_loss:
+        logging.info('Stop-loss triggered! Loss exceeds $5.', extra={'event': 'stop_loss'})
+        return
+
+    # When trading live, check the in-memory inventory: USDT to buy with on one
+    # venue, BTC to sell on the other
+    shortfall = None
+    if settings.trading_enabled:
+        shortfall = market_data.inventory.shortfall(opportunity.buy_venue, opportunity.sell_venue, 'BTC', 'USDT',
+                                                    quantity, opportunity.buy_price, FEE_RATE)
+    if shortfall is not None:
+        venue, asset, missing = shortfall
+        logging.info('%s is %.8f %s short of a %.8f BTC trade', venue, missing, asset, quantity,
+                     extra={'event': 'insufficient_funds', 'venue': venue})
+        orders.handle_insufficient_funds(venue)
+        engine.post('reporting', reporting.log_and_print_results, binance_price, kucoin_price, profit,
+                    f'insufficient {asset} on {venue}')
+        return
+
+    # Place both legs on the orders lane when live trading is enabled
+    if settings.trading_enabled and profit > 0:
+        engine.post('orders', orders.execute_trade, opportunity.buy_venue, quantity, opportunity.buy_price,
+                    opportunity.sell_price, detected_at)
+
+    # Log, print and save results on the reporting lane so file I/O never delays detection
+    engine.post('reporting', reporting.log_and_print_results, binance_price, kucoin_price, profit)
+
+
+# Function to record a compared pair for backtesting: the executable prices
+# when the quotes cross, otherwise each venue's mid
+def record_tick(binance_quote, kucoin_quote, trade):
+    if trade is None:
+        tick_recorder.record(time.time(), binance_quote.mid, kucoin_quote.mid)
+        return
+    buy_venue, buy_price, _, sell_price = trade
+    if buy_venue == 'Binance':
+        tick_recorder.record(time.time(), buy_price, sell_price)
+    else:
+        tick_recorder.record(time.time(), sell_price, buy_price)
+
+
+# Function to execute arbitrage trading logic
+def execute_arbitrage():
+    try:
+        quotes = market_data.get_price_fetcher().fetch_pair('Binance', 'KuCoin')
+        if quotes is None:
+            return  # Quotes stale or too far apart to compare, wait for the next tick
+        binance_quote, kucoin_quote = quotes
+
+        if binance_quote is not None and kucoin_quote is not None:
+            # Compare what a trade would execute at: the ask where we buy, the bid where we sell
+            trade = executable_prices(binance_quote, kucoin_quote)
+            metrics.last_tick.set(time.time())
+            if tick_recorder is not None:
+                record_tick(binance_quote, kucoin_quote, trade)
+            if trade is not None:
+                evaluate_arbitrage(*trade)
+        else:
+            logging.error("Failed to fetch prices from one or both exchanges")
+            market_data.handle_network_failure('Binance' if binance_quote is None else 'KuCoin')
+    except Exception as e:
+        logging.error(f"Unexpected error in execute_arbitrage: {e}")
+        market_data.handle_network_failure('Arbitrage Execution')
+
+
+# Function to run the arbitrage check on every top-of-book change from the push
+# feeds; pairs the stream guard finds stale or invalid are dropped
+def on_top_of_book_change(venue, books):
+    if 'Binance' not in books or 'KuCoin' not in books:
+        return
+    try:
+        binance_book, kucoin_book = books['Binance'], books['KuCoin']
+        trade = executable_prices(binance_book, kucoin_book)
+        if tick_recorder is not None:
+            record_tick(binance_book, kucoin_book, trade)
+        if trade is not None and market_data.get_stream_guard().check(binance_book, kucoin_book) is None:
+            # Evaluate on the strategy lane: sizing fetches order books and must not block the feeds
+            engine.post('strategy', evaluate_streamed, binance_book, kucoin_book, trade)
+    except Exception as e:
+        logging.error(f"Unexpected error in streaming arbitrage check: {e}")
+
+
+# Function to evaluate a streamed cross on the strategy lane. The books are
+# checked again first: one that aged past MAX_QUOTE_AGE while the evaluation
+# waited behind others in the lane is no longer traded on.
+def evaluate_streamed(binance_book, kucoin_book, trade):
+    if market_data.get_stream_guard().check(binance_book, kucoin_book) is None:
+        evaluate_arbitrage(*trade)
@@ -0,0 +1,162 @@
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from crypto_arbitrage_bot.trade_totals import PERIODS, TIME_FORMAT, PeriodTotals
+
+JOURNAL_HEADER = ["Time", "Binance BTC/USDT Price", "Kucoin BTC/USDT Price", "Difference", "Profit", "Result", "Recommendation"]
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+# Append-only trade journal with a single background writer thread. Rows are
+# queued by the trading code and written in batches, once `max_batch` rows are
+# pending or `flush_interval` seconds after the first pending row, through one
+# file handle that stays open. Period views (daily, weekly, monthly) are read
+# back from the journal instead of being written as separate files.
+# `on_batch(rows)`, if given, is called on the writer thread after each batch
+# is written, e.g. to load the same rows into a TradeStore.
+class TradeJournal:
+    def __init__(self, path='trades_journal.csv', max_batch=100, flush_interval=1.0, on_batch=None):
+        self.path = path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.on_batch = on_batch
+        self.rows_written = 0
+        self.batches_written = 0
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='trade-journal', daemon=True)
+            self._thread.start()
+        return self
+
+    # Queue a row for writing; returns immediately
+    def append(self, row):
+        if self._thread is None:
+            self.start()
+        self._queue.put(list(row))
+
+    # Hand a control item to the writer and wait up to `timeout` seconds for
+    # it; returns False if the writer died or did not get to it in time
+    def _control(self, control, timeout):
+        done = threading.Event()
+        self._queue.put((control, done))
+        deadline = time.monotonic() + timeout
+        while not done.wait(min(0.1, max(0.0, deadline - time.monotonic()))):
+            if not self._thread.is_alive():
+                logging.error(f"Trade journal writer for {self.path} has stopped; queued rows were not written")
+                return False
+            if time.monotonic() >= deadline:
+                logging.error(f"Trade journal writer for {self.path} did not respond within {timeout} s")
+                return False
+        return True
+
+    # Block until every row queued so far is on disk; returns False on timeout
+    def flush(self, timeout=10.0):
+        if self._thread is None:
+            return True
+        return self._control(_FLUSH, timeout)
+
+    def close(self, timeout=10.0):
+        if self._thread is None:
+            return True
+        closed = self._control(_CLOSE, timeout)
+        self._thread.join(timeout if closed else 0)
+        self._thread = None
+        return closed
+
+    def _run(self):
+        with open(self.path, mode='a', newline='') as file:
+            writer = csv.writer(file)
+            if file.tell() == 0:
+                writer.writerow(JOURNAL_HEADER)
+                file.flush()
+            batch = []
+            deadline = None
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                control = item[0] if isinstance(item, tuple) else None
+                if isinstance(item, list):
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    if len(batch) < self.max_batch:
+                        continue
+                # Batch full, flush interval elapsed, or an explicit flush/close
+                if batch:
+                    try:
+                        writer.writerows(batch)
+                        file.flush()
+                        self.rows_written += len(batch)
+                        self.batches_written += 1
+                    except OSError as e:
+                        logging.error(f"Error writing trade journal {self.path}: {e}")
+                    if self.on_batch is not None:
+                        try:
+                            self.on_batch(batch)
+                        except Exception as e:
+                            logging.error(f"Error in trade journal batch hook: {e}")
+                    batch = []
+                deadline = None
+                if control is not None:
+                    item[1].set()
+                    if control is _CLOSE:
+                        return
+
+    # Iterate over journal rows (dicts keyed by JOURNAL_HEADER) in the given period
+    def iter_period(self, period, now=None):
+        key_fn = PERIODS[period]
+        key = key_fn(now or datetime.now())
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, mode='r', newline='') as file:
+            for row in csv.DictReader(file):
+                try:
+                    when = datetime.strptime(row['Time'], TIME_FORMAT)
+                except (KeyError, ValueError, TypeError):
+                    continue
+                if key_fn(when) == key:
+                    yield row
+
+    # Same result as calculate_trade_summaries on a period file
+    def summarize(self, period, now=None):
+        totals = PeriodTotals(period)
+        for row in self.iter_period(period, now):
+            totals.add(float(row['Profit'].replace('$', '')))
+        return totals.summary()
+
+    # Merge a period view of the journal into a standalone CSV file. Rows the
+    # file already holds that the journal does not (written before the
+    # journal existed, or by hand) are kept; the result is sorted by time and
+    # replaces the file atomically.
+    def export_period(self, period, path, now=None):
+        rows = [tuple(row.get(name, '') for name in JOURNAL_HEADER) for row in self.iter_period(period, now)]
+        unseen = Counter(rows)
+        kept = []
+        if os.path.exists(path):
+            with open(path, mode='r', newline='') as file:
+                for row in csv.DictReader(file):
+                    row = tuple(row.get(name) or '' for name in JOURNAL_HEADER)
+                    if unseen[row]:
+                        unseen[row] -= 1
+                    else:
+                        kept.append(row)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(JOURNAL_HEADER)
+            writer.writerows(sorted(kept + rows, key=lambda row: row[0]))
+        os.replace(tmp_path, path)
@@ -0,0 +1,142 @@
+import csv
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from crypto_arbitrage_bot.trade_totals import TIME_FORMAT
+
+# Result codes
+RESULT_FAILED = 0
+RESULT_SUCCESSFUL = 1
+RESULT_LABELS = {RESULT_FAILED: 'Failed', RESULT_SUCCESSFUL: 'Successful'}
+
+# Direction codes
+DIRECTION_BUY_KUCOIN_SELL_BINANCE = 0
+DIRECTION_BUY_BINANCE_SELL_KUCOIN = 1
+DIRECTION_LABELS = {
+    DIRECTION_BUY_KUCOIN_SELL_BINANCE: 'Buy on Kucoin and sell on Binance',
+    DIRECTION_BUY_BINANCE_SELL_KUCOIN: 'Buy on Binance and sell on Kucoin',
+}
+
+PERIOD_NAMES = ('daily', 'weekly', 'monthly', 'quarterly', 'semiannual', 'yearly')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    binance_price REAL NOT NULL,
+    kucoin_price REAL NOT NULL,
+    difference REAL NOT NULL,
+    profit REAL NOT NULL,
+    result INTEGER NOT NULL,
+    direction INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trades_ts ON trades (ts);
+"""
+
+
+# Build a typed trade record: (epoch seconds, binance price, kucoin price,
+# difference, profit, result code, direction code)
+def make_trade(ts, binance_price, kucoin_price, profit):
+    result = RESULT_SUCCESSFUL if profit >= 0.01 else RESULT_FAILED
+    if binance_price > kucoin_price:
+        direction = DIRECTION_BUY_KUCOIN_SELL_BINANCE
+    else:
+        direction = DIRECTION_BUY_BINANCE_SELL_KUCOIN
+    return (ts, binance_price, kucoin_price, abs(binance_price - kucoin_price), profit, result, direction)
+
+
+# Convert a trade CSV / journal row (Time, $prices, ..., $profit, ...) to a typed record
+def trade_from_csv_row(row):
+    ts = time.mktime(datetime.strptime(row[0], TIME_FORMAT).timetuple())
+    binance_price = float(row[1].replace('$', ''))
+    kucoin_price = float(row[2].replace('$', ''))
+    profit = float(row[4].replace('$', ''))
+    return make_trade(ts, binance_price, kucoin_price, profit)
+
+
+# Return the (start, end) epoch range of the period containing `now` (local time)
+def period_bounds(period, now=None):
+    now = now or datetime.now()
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'daily':
+        start = day
+        end = start + timedelta(days=1)
+    elif period == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        end = start + timedelta(days=7)
+    else:
+        months = {'monthly': 1, 'quarterly': 3, 'semiannual': 6, 'yearly': 12}[period]
+        first_month = (now.month - 1) // months * months + 1
+        start = day.replace(month=first_month, day=1)
+        end_month = first_month + months
+        end = start.replace(year=start.year + (end_month - 1) // 12, month=(end_month - 1) % 12 + 1)
+    return time.mktime(start.timetuple()), time.mktime(end.timetuple())
+
+
+# Typed SQLite trade store. Prices and profit are REAL, result and direction are
+# integer codes and time is an indexed epoch column, so any period summary is a
+# single range query instead of a parse of every CSV row.
+class TradeStore:
+    def __init__(self, path='trades.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def insert_many(self, trades):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO trades (ts, binance_price, kucoin_price, difference, profit, result, direction) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', trades)
+
+    # Journal batch hook: store rows in the journal's CSV layout
+    def insert_csv_rows(self, rows):
+        self.insert_many([trade_from_csv_row(row) for row in rows])
+
+    # Import a legacy trade CSV (daily/weekly/monthly/... files); returns rows imported
+    def import_csv(self, path):
+        trades = []
+        with open(path, mode='r', newline='') as file:
+            reader = csv.reader(file)
+            next(reader, None)  # header
+            for row in reader:
+                try:
+                    trades.append(trade_from_csv_row(row))
+                except (IndexError, ValueError):
+                    continue
+        self.insert_many(trades)
+        return len(trades)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM trades').fetchone()[0]
+
+    # (total_profit, successful, failed, losses) for trades with start <= ts < end
+    def summarize(self, start, end):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT COALESCE(SUM(profit), 0), '
+                'COALESCE(SUM(result = ?), 0), '
+                'COALESCE(SUM(result != ?), 0), '
+                'COALESCE(SUM(CASE WHEN profit < 0 THEN -profit ELSE 0 END), 0) '
+                'FROM trades WHERE ts >= ? AND ts < ?',
+                (RESULT_SUCCESSFUL, RESULT_SUCCESSFUL, start, end)).fetchone()
+        return float(row[0]), int(row[1]), int(row[2]), float(row[3])
+
+    def summarize_period(self, period, now=None):
+        return self.summarize(*period_bounds(period, now))
+
+    # Typed rows (see make_trade) with start <= ts < end, oldest first
+    def trades(self, start, end):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT ts, binance_price, kucoin_price, difference, profit, result, direction '
+                'FROM trades WHERE ts >= ? AND ts < ? ORDER BY ts', (start, end)).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,130 @@
+import csv
+import logging
+import os
+from datetime import datetime
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# Period key functions: two timestamps belong to the same period when their keys match
+def daily_key(when):
+    return when.strftime('%Y-%m-%d')
+
+
+def weekly_key(when):
+    year, week, _ = when.isocalendar()
+    return f'{year}-W{week:02d}'
+
+
+def monthly_key(when):
+    return when.strftime('%Y-%m')
+
+
+PERIODS = {
+    'daily': daily_key,
+    'weekly': weekly_key,
+    'monthly': monthly_key,
+}
+
+
+# Profit and trade counts for one period, updated one trade at a time with the
+# same rules as calculate_trade_summaries in bot.py
+class PeriodTotals:
+    __slots__ = ('key', 'total_profit', 'successful_trades', 'failed_trades', 'total_losses')
+
+    def __init__(self, key, total_profit=0.0, successful_trades=0, failed_trades=0, total_losses=0.0):
+        self.key = key
+        self.total_profit = total_profit
+        self.successful_trades = successful_trades
+        self.failed_trades = failed_trades
+        self.total_losses = total_losses
+
+    def add(self, profit):
+        self.total_profit += profit
+        if profit >= 0.01:
+            self.successful_trades += 1
+        else:
+            self.failed_trades += 1
+            if profit < 0:
+                self.total_losses += abs(profit)
+
+    # Same shape as calculate_trade_summaries: (total_profit, successful, failed, losses)
+    def summary(self):
+        return self.total_profit, self.successful_trades, self.failed_trades, self.total_losses
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# In-memory daily/weekly/monthly totals. Recording a trade is O(1); the totals
+# roll over to zero when a new period starts. After each trade `on_change` is
+# called with to_dict(), which the bot persists in the state store so the
+# totals survive restarts without re-reading the trade logs.
+class RunningTotals:
+    def __init__(self, on_change=None, periods=PERIODS):
+        self.on_change = on_change
+        self.periods = dict(periods)
+        self.totals = {}
+        self.reset()
+
+    def reset(self, now=None):
+        now = now or datetime.now()
+        self.totals = {period: PeriodTotals(key_fn(now)) for period, key_fn in self.periods.items()}
+
+    def _current(self, period, now):
+        key = self.periods[period](now)
+        totals = self.totals[period]
+        if totals.key != key:
+            totals = self.totals[period] = PeriodTotals(key)
+        return totals
+
+    def record(self, profit, when=None):
+        when = when or datetime.now()
+        for period in self.periods:
+            self._current(period, when).add(profit)
+        if self.on_change is not None:
+            self.on_change(self.to_dict())
+
+    def summary(self, period, now=None):
+        return self._current(period, now or datetime.now()).summary()
+
+    def to_dict(self):
+        return {period: totals.to_dict() for period, totals in self.totals.items()}
+
+    # Load totals saved from to_dict(); returns False if they are missing or unreadable
+    def load(self, saved):
+        if not saved:
+            return False
+        try:
+            totals = {period: PeriodTotals(**saved[period]) for period in self.periods}
+        except (KeyError, TypeError) as e:
+            logging.error(f"Ignoring unreadable saved totals: {e}")
+            return False
+        self.totals = totals
+        return True
+
+    # Rebuild one period's totals from a trade CSV, counting only rows in the current period
+    def rebuild_from_log(self, period, log_file, now=None):
+        totals = PeriodTotals(self.periods[period](now or datetime.now()))
+        if os.path.exists(log_file):
+            with open(log_file, mode='r', newline='') as file:
+                for row in csv.DictReader(file):
+                    try:
+                        when = datetime.strptime(row['Time'], TIME_FORMAT)
+                        profit = float(row['Profit'].replace('$', ''))
+                    except (KeyError, ValueError, AttributeError):
+                        continue
+                    if self.periods[period](when) == totals.key:
+                        totals.add(profit)
+        self.totals[period] = totals
+
+    # Startup: use the saved totals if there are any, otherwise rebuild once
+    # from the logs given as {period: log_file} and save the result
+    def restore(self, saved, log_files, now=None):
+        if self.load(saved):
+            return False
+        for period, log_file in log_files.items():
+            self.rebuild_from_log(period, log_file, now)
+        if self.on_change is not None:
+            self.on_change(self.to_dict())
+        return True
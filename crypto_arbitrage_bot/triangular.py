@@ -0,0 +1,164 @@
+import math
+
+DEFAULT_FEE_RATE = 0.001  # 0.1% taker fee, as in calculate_fees
+
+
+# A profitable currency cycle on one venue, e.g. USDT -> BTC -> ETH -> USDT.
+# `legs` are (symbol, side) pairs in trading order; `rate` is what one unit of
+# the start currency turns into after every fee.
+class Cycle:
+    __slots__ = ('currencies', 'legs', 'rate')
+
+    def __init__(self, currencies, legs, rate):
+        self.currencies = currencies
+        self.legs = legs
+        self.rate = rate
+
+    @property
+    def profit_pct(self):
+        return self.rate - 1
+
+    def __repr__(self):
+        path = ' -> '.join(self.currencies + self.currencies[:1])
+        return f'Cycle({path}, profit={self.profit_pct:.4%})'
+
+
+# Rate graph over every market of one venue. Each market BASE/QUOTE gives two
+# directed edges: QUOTE -> BASE (buy at the ask) and BASE -> QUOTE (sell at the
+# bid), weighted -log(rate after fee), so a profitable cycle is a cycle of
+# negative total weight. All triangles are enumerated once up front and indexed
+# by market, so a quote update re-sums only the triangles through that market.
+class TriangularArbitrage:
+    def __init__(self, markets, fee_rate=DEFAULT_FEE_RATE, min_profit=0.0):
+        # markets: iterable of (symbol, base, quote) or (symbol, base, quote, fee_rate)
+        self.min_profit = min_profit
+        self._min_log_profit = -math.log1p(min_profit)
+        self.weights = {}     # (from, to) -> -log(rate); inf until quoted
+        self.quotes = {}      # symbol -> last (bid, ask)
+        self.edge_market = {}  # (from, to) -> (symbol, side)
+        self.market_edges = {}  # symbol -> (buy edge, sell edge, fee rate)
+        for market in markets:
+            symbol, base, quote = market[:3]
+            fee = market[3] if len(market) > 3 and market[3] is not None else fee_rate
+            buy, sell = (quote, base), (base, quote)
+            self.market_edges[symbol] = (buy, sell, fee)
+            self.edge_market[buy] = (symbol, 'buy')
+            self.edge_market[sell] = (symbol, 'sell')
+            self.weights[buy] = self.weights[sell] = math.inf
+        self.cycles = self._find_triangles()
+        self.market_cycles = {symbol: [] for symbol in self.market_edges}
+        for index, cycle in enumerate(self.cycles):
+            for symbol in {self.edge_market[edge][0] for edge in cycle}:
+                self.market_cycles[symbol].append(index)
+
+    # Build from ccxt load_markets() output: active spot markets only, with each
+    # market's own taker fee when ccxt knows it
+    @classmethod
+    def from_ccxt_markets(cls, markets, fee_rate=DEFAULT_FEE_RATE, min_profit=0.0):
+        selected = [
+            (symbol, market['base'], market['quote'], market.get('taker'))
+            for symbol, market in markets.items()
+            if market.get('active', True) is not False and market.get('spot', True)
+        ]
+        return cls(selected, fee_rate, min_profit)
+
+    # Every directed 3-cycle a -> b -> c -> a, each listed once (rotated to start at its smallest currency)
+    def _find_triangles(self):
+        successors = {}
+        for source, target in self.edge_market:
+            successors.setdefault(source, set()).add(target)
+        triangles = []
+        for a, a_next in successors.items():
+            for b in a_next:
+                if b <= a:
+                    continue
+                for c in successors.get(b, ()):
+                    if c > a and c != b and a in successors.get(c, ()):
+                        triangles.append(((a, b), (b, c), (c, a)))
+        return triangles
+
+    @property
+    def currencies(self):
+        return {currency for edge in self.edge_market for currency in edge}
+
+    # Returns False when the quote is unchanged, so its triangles need no re-check
+    def _set_quote(self, symbol, bid, ask):
+        if self.quotes.get(symbol) == (bid, ask):
+            return False
+        self.quotes[symbol] = (bid, ask)
+        buy, sell, fee = self.market_edges[symbol]
+        self.weights[buy] = -math.log((1 - fee) / ask) if ask and ask > 0 else math.inf
+        self.weights[sell] = -math.log(bid * (1 - fee)) if bid and bid > 0 else math.inf
+        return True
+
+    def _cycle(self, index, weight):
+        edges = self.cycles[index]
+        return Cycle([edge[0] for edge in edges], [self.edge_market[edge] for edge in edges], math.exp(-weight))
+
+    # Re-evaluate the given triangles and return those above min_profit, best first
+    def _evaluate(self, indices):
+        weights = self.weights
+        threshold = self._min_log_profit
+        found = []
+        for index in indices:
+            first, second, third = self.cycles[index]
+            weight = weights[first] + weights[second] + weights[third]
+            if weight < threshold:
+                found.append((weight, index))
+        found.sort()
+        return [self._cycle(index, weight) for weight, index in found]
+
+    # Apply one market's best bid/ask and return the profitable triangles through it
+    def update(self, symbol, bid, ask):
+        if symbol not in self.market_edges or not self._set_quote(symbol, bid, ask):
+            return []
+        return self._evaluate(self.market_cycles[symbol])
+
+    # Apply a batch of quotes ({symbol: (bid, ask)} or ccxt fetch_tickers()
+    # output) and evaluate each triangle through a changed market once
+    def update_many(self, quotes):
+        affected = set()
+        for symbol, quote in quotes.items():
+            if symbol not in self.market_edges:
+                continue
+            bid, ask = (quote.get('bid'), quote.get('ask')) if isinstance(quote, dict) else quote
+            if self._set_quote(symbol, bid, ask):
+                affected.update(self.market_cycles[symbol])
+        return self._evaluate(affected)
+
+    # Every profitable triangle in the current graph
+    def scan(self):
+        return self._evaluate(range(len(self.cycles)))
+
+    # Bellman-Ford over the whole graph for a negative cycle of any length,
+    # returned as a Cycle, or None. O(V * E): for periodic full checks, not per quote.
+    def find_negative_cycle(self):
+        edges = [(source, target, weight) for (source, target), weight in self.weights.items() if weight != math.inf]
+        if not edges:
+            return None
+        # A virtual source at distance 0 to every node finds cycles in any component
+        distance = {currency: 0.0 for currency in self.currencies}
+        predecessor = {}
+        updated = None
+        for _ in range(len(distance)):
+            updated = None
+            for source, target, weight in edges:
+                if distance[source] + weight < distance[target] - 1e-12:
+                    distance[target] = distance[source] + weight
+                    predecessor[target] = source
+                    updated = target
+            if updated is None:
+                return None
+        # Walk back far enough to be inside the cycle, then collect it
+        node = updated
+        for _ in range(len(distance)):
+            node = predecessor[node]
+        currencies = [node]
+        current = predecessor[node]
+        while current != node:
+            currencies.append(current)
+            current = predecessor[current]
+        currencies.reverse()
+        edges = list(zip(currencies, currencies[1:] + currencies[:1]))
+        weight = sum(self.weights[edge] for edge in edges)
+        return Cycle(currencies, [self.edge_market[edge] for edge in edges], math.exp(-weight))
@@ -3,23 +3,26 @@ from setuptools import setup, find_packages
 setup(
     name='crypto_arbitrage_bot',
     version='0.1.0',
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests']),
+    py_modules=['bot'],
     install_requires=[
-        'binance',
-        'bybit',
+        'python-binance',
+        'ccxt',
+        'python-dotenv',
         'requests',
-        'schedule',
         'tabulate',
+        'websockets',
+        'numpy',
     ],
     entry_points={
         'console_scripts': [
-            'crypto_arbitrage_bot=bot:main',
+            'crypto_arbitrage_bot=crypto_arbitrage_bot.main:main',
         ],
     },
     license='MIT',
     author='Your Name',
     author_email='your.email@example.com',
-    description='A crypto arbitrage bot for Binance and Bybit.',
+    description='A crypto arbitrage bot for Binance and KuCoin.',
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
     url='https://github.com/yourusername/crypto_arbitrage_bot',
@@ -28,5 +31,5 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.9',
 )
@@ -1,6 +1,12 @@
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 from bot import calculate_profit, calculate_fees
 
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class TestArbitrage(unittest.TestCase):
 
     def test_calculate_profit(self):
@@ -10,10 +16,30 @@ class TestArbitrage(unittest.TestCase):
         profit = calculate_profit(binance_price, bybit_price, quantity)
         self.assertGreater(profit, 0)
 
+    def test_calculate_profit_is_symmetric(self):
+        self.assertEqual(calculate_profit(50000, 49900, 0.5), calculate_profit(49900, 50000, 0.5))
+        self.assertAlmostEqual(calculate_profit(50000, 49900, 1), 50000 * 0.999 - 49900 * 1.001)
+
+    def test_calculate_profit_negative_inside_fees(self):
+        self.assertLess(calculate_profit(50000, 49990, 1), 0)
+
     def test_calculate_fees(self):
         price = 50000
         fee = calculate_fees(price, 'Binance')
         self.assertEqual(fee, 50)  # 0.1% of 50000 is 50
 
+
+class TestImport(unittest.TestCase):
+
+    def test_import_has_no_side_effects(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            env = {key: value for key, value in os.environ.items() if not key.startswith(('BINANCE_', 'KUCOIN_'))}
+            env['PYTHONPATH'] = ROOT
+            code = ("import sys, bot; from crypto_arbitrage_bot import clients; "
+                    "assert clients._sessions is None; "
+                    "assert not {'ccxt', 'binance', 'requests', 'tabulate', 'dotenv'} & set(sys.modules)")
+            subprocess.run([sys.executable, '-c', code], cwd=workdir, env=env, check=True, timeout=30)
+            self.assertEqual(os.listdir(workdir), [])
+
 if __name__ == '__main__':
     unittest.main()
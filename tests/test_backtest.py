@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from crypto_arbitrage_bot.backtest import (
+    Backtest, BacktestParams, SimulatedClock, TickRecorder, convert_csv_to_binary, read_ticks, sweep,
+)
+from crypto_arbitrage_bot.sizing import net_profit
+
+TICKS = [
+    (1720000000.0, 50000.0, 50000.0),
+    (1720000001.0, 50000.0, 50200.0),  # 200 spread, profitable
+    (1720000002.0, 50100.0, 50000.0),  # 100 spread, eaten by the 0.2% round-trip fees
+    (1720000003.0, 50000.0, 50015.0),  # 15 spread, a loss
+    (1720000010.0, 50000.0, 50300.0),
+]
+
+
+class TestTickFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.dir.name, name)
+
+    def test_binary_round_trip(self):
+        recorder = TickRecorder(self.path('ticks.bin'), buffer_ticks=2)
+        for tick in TICKS:
+            recorder.record(*tick)
+        recorder.close()
+        self.assertEqual(recorder.ticks_written, len(TICKS))
+        self.assertEqual(list(read_ticks(self.path('ticks.bin'))), TICKS)
+        # Reopening appends without writing a second header
+        recorder = TickRecorder(self.path('ticks.bin'))
+        recorder.record(*TICKS[0])
+        recorder.close()
+        self.assertEqual(list(read_ticks(self.path('ticks.bin'))), TICKS + TICKS[:1])
+
+    def test_torn_last_tick_is_dropped(self):
+        recorder = TickRecorder(self.path('ticks.bin'))
+        for tick in TICKS[:2]:
+            recorder.record(*tick)
+        recorder.close()
+        with open(self.path('ticks.bin'), 'ab') as file:
+            file.write(b'\x00' * 10)  # the recorder died mid-write
+        self.assertEqual(list(read_ticks(self.path('ticks.bin'))), TICKS[:2])
+        # Recording resumes on a tick boundary
+        recorder = TickRecorder(self.path('ticks.bin'))
+        recorder.record(*TICKS[2])
+        recorder.close()
+        self.assertEqual(list(read_ticks(self.path('ticks.bin'))), TICKS[:3])
+
+    def test_csv_and_trade_log_formats(self):
+        with open(self.path('ticks.csv'), 'w') as file:
+            file.write('timestamp,binance_price,kucoin_price\n')
+            for tick in TICKS:
+                file.write(','.join(map(repr, tick)) + '\n')
+        self.assertEqual(list(read_ticks(self.path('ticks.csv'))), TICKS)
+        self.assertEqual(convert_csv_to_binary(self.path('ticks.csv'), self.path('ticks.bin')), len(TICKS))
+        self.assertEqual(list(read_ticks(self.path('ticks.bin'))), TICKS)
+
+        with open(self.path('log.csv'), 'w') as file:
+            file.write('Time,Binance BTC/USDT Price,Kucoin BTC/USDT Price,Difference,Profit,Result,Recommendation\n')
+            file.write('2024-07-13 19:02:34,$58788.25,$58798.5,$10.25,$0.00,Failed,Buy on Binance and sell on Kucoin\n')
+        (tick,) = read_ticks(self.path('log.csv'))
+        self.assertEqual(tick[1:], (58788.25, 58798.5))
+
+
+class TestBacktest(unittest.TestCase):
+
+    def test_replays_strategy_decisions(self):
+        clock = SimulatedClock()
+        result = Backtest(BacktestParams(threshold=10), clock).run(TICKS)
+        self.assertEqual((result.ticks, result.evaluated, result.opportunities), (5, 5, 4))
+        self.assertEqual(result.totals.successful_trades, 2)
+        self.assertEqual(result.totals.failed_trades, 2)
+        expected = sum(net_profit(b, s, 25 / b) for b, s in [(50000, 50200), (50000, 50100), (50000, 50015), (50000, 50300)])
+        self.assertAlmostEqual(result.total_profit, expected)
+        self.assertEqual(clock(), 1720000010.0)
+        self.assertEqual(sum(day.successful_trades for day in result.daily.values()), 2)
+
+    def test_tick_interval_uses_simulated_time(self):
+        result = Backtest(BacktestParams(tick_interval=5)).run(TICKS)
+        self.assertEqual(result.evaluated, 2)  # t=0 and t=10
+        self.assertEqual(result.opportunities, 1)
+
+    def test_sweep_across_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ticks.bin')
+            recorder = TickRecorder(path)
+            for tick in TICKS:
+                recorder.record(*tick)
+            recorder.close()
+            results = sweep(path, {'threshold': [10, 150], 'fee_rate': [0.001, 0.0]}, processes=2)
+        self.assertEqual([(r.params.threshold, r.params.fee_rate) for r in results],
+                         [(10, 0.001), (10, 0.0), (150, 0.001), (150, 0.0)])
+        self.assertEqual([r.opportunities for r in results], [4, 4, 2, 2])
+        self.assertGreater(results[1].total_profit, results[0].total_profit)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+from crypto_arbitrage_bot import checkpoint
+from crypto_arbitrage_bot.checkpoint import StateStore
+from crypto_arbitrage_bot.inventory import Inventory
+from crypto_arbitrage_bot.trade_totals import RunningTotals
+
+
+class TestStateStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        checkpoint.close_state()
+        shutil.rmtree(self.directory)
+
+    def store(self, **kwargs):
+        kwargs.setdefault('fsync', False)
+        store = StateStore(self.directory, **kwargs)
+        store.restore()
+        return store.start()
+
+    def test_state_survives_a_restart(self):
+        store = self.store()
+        store.record('counters', {'successful_trades': 1, 'total_profit': 1.5})
+        store.record('counters', {'successful_trades': 1, 'total_profit': 0.25})
+        store.record('order_open', {'id': 'a', 'quantity': 0.001})
+        store.record('order_open', {'id': 'b', 'quantity': 0.002})
+        store.record('order_closed', {'id': 'a'})
+        store.record('balances', {'venue': 'Binance', 'balances': {'BTC': [0.5, 0.0], 'USDT': [100.0, 0.0]}})
+        store.record('balances', {'venue': 'Binance', 'balances': {'USDT': [90.0, 1.0]}})
+        store.close()
+
+        state = StateStore(self.directory).restore()
+        self.assertEqual(state['counters'], {'successful_trades': 2, 'total_profit': 1.75})
+        self.assertEqual(list(state['orders']), ['b'])
+        self.assertEqual(state['inventory'], {'Binance': {'BTC': [0.5, 0.0], 'USDT': [90.0, 1.0]}})
+
+    def test_log_is_replayed_without_a_snapshot(self):
+        store = self.store()
+        store.record('counters', {'failed_trades': 1})
+        store.flush()
+        self.assertFalse(os.path.exists(store.snapshot_path))
+        # No close(): as if the process had been killed
+        restored = StateStore(self.directory)
+        self.assertEqual(restored.restore()['counters'], {'failed_trades': 1})
+        self.assertEqual(restored.seq, 1)
+        store.close()
+
+    def test_replace_drops_assets_the_exchange_no_longer_reports(self):
+        store = self.store()
+        store.record('balances', {'venue': 'KuCoin', 'balances': {'BTC': [1, 0], 'ETH': [2, 0]}})
+        store.record('balances', {'venue': 'KuCoin', 'balances': {'BTC': [1.5, 0]}, 'replace': True})
+        self.assertEqual(store.snapshot('inventory'), {'KuCoin': {'BTC': [1.5, 0]}})
+        store.close()
+
+    def test_torn_last_record_is_cut_off(self):
+        store = self.store()
+        store.record('counters', {'failed_trades': 1})
+        store.flush()
+        with open(store.wal_path, 'ab') as file:
+            file.write(b'{"seq":2,"kind":"coun')
+        store._thread = None  # abandon the writer without compacting
+
+        restored = self.store()
+        self.assertEqual(restored.state['counters'], {'failed_trades': 1})
+        restored.record('counters', {'failed_trades': 1})
+        restored.flush()
+        self.assertEqual(StateStore(self.directory).restore()['counters'], {'failed_trades': 2})
+        restored.close()
+
+    def test_compaction_folds_the_log_into_a_snapshot(self):
+        store = self.store(compact_every=10, max_batch=5)
+        for _ in range(23):
+            store.record('counters', {'total_profit': 1})
+        store.flush()
+        self.assertGreaterEqual(store.compactions, 2)
+        with open(store.wal_path) as file:
+            self.assertLess(len(file.readlines()), 10)
+        self.assertEqual(StateStore(self.directory).restore()['counters'], {'total_profit': 23})
+        store.close()
+
+    def test_records_already_in_the_snapshot_are_skipped(self):
+        store = self.store()
+        for _ in range(3):
+            store.record('counters', {'total_profit': 1})
+        store.flush()
+        # Bot stopped after writing the snapshot but before truncating the log
+        store._write_snapshot()
+        store.record('counters', {'total_profit': 1})
+        store.flush()
+        restored = StateStore(self.directory)
+        self.assertEqual(restored.restore()['counters'], {'total_profit': 4})
+        self.assertEqual(restored.snapshot_seq, 3)
+        store.close()
+
+    def test_restart_is_fast_and_does_not_rescan_history(self):
+        store = self.store(compact_every=20000)
+        for i in range(50000):
+            store.record('counters', {'total_profit': 0.01, 'successful_trades': 1})
+            if i % 10 == 0:
+                store.record('balances', {'venue': 'Binance', 'balances': {'USDT': [1000.0 - i * 0.01, 0.0]}})
+        store.flush()
+        started = time.perf_counter()
+        state = StateStore(self.directory).restore()
+        elapsed = time.perf_counter() - started
+        self.assertEqual(state['counters']['successful_trades'], 50000)
+        self.assertLess(elapsed, 1.0)
+        store.close()
+
+    def test_inventory_changes_are_persisted(self):
+        checkpoint.open_state(self.directory, fsync=False)
+        inventory = Inventory(on_change=checkpoint.record_balances)
+        inventory.reconcile('Binance', {'BTC': (0.1, 0.0), 'USDT': (1000.0, 0.0)})
+        inventory.apply_fill('Binance', 'BTC', 'USDT', 'buy', 0.01, 50000, 0.001)
+        checkpoint.close_state()
+
+        with open(os.path.join(self.directory, checkpoint.SNAPSHOT_FILE)) as file:
+            saved = json.load(file)['state']['inventory']
+        restored = Inventory()
+        restored.load(saved)
+        self.assertAlmostEqual(restored.free('Binance', 'BTC'), 0.11)
+        self.assertAlmostEqual(restored.free('Binance', 'USDT'), 1000.0 - 500.5)
+        self.assertFalse(restored.ready('Binance'))
+
+    def test_period_totals_are_persisted(self):
+        checkpoint.open_state(self.directory, fsync=False)
+        now = datetime.now()
+        totals = RunningTotals(on_change=checkpoint.record_totals)
+        totals.record(4.0, now)
+        totals.record(-1.0, now)
+        checkpoint.close_state()
+
+        restored = RunningTotals()
+        self.assertFalse(restored.restore(StateStore(self.directory).restore()['totals'], {}))
+        self.assertEqual(restored.summary('monthly', now), (3.0, 1, 1, 1.0))
+
+    def test_snapshot_from_before_a_section_existed(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, checkpoint.SNAPSHOT_FILE), 'w') as file:
+            json.dump({'seq': 1, 'state': {'counters': {'failed_trades': 1}, 'orders': {}, 'inventory': {}}}, file)
+        store = self.store()
+        self.assertEqual(store.snapshot('totals'), {})
+        store.record('totals', {'daily': {'key': '2024-07-08'}})
+        self.assertEqual(store.snapshot('totals'), {'daily': {'key': '2024-07-08'}})
+        store.close()
+
+    def test_record_without_an_open_store_does_nothing(self):
+        checkpoint.record('counters', {'total_profit': 1})
+        self.assertEqual(checkpoint.snapshot('counters'), {})
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+import unittest
+from crypto_arbitrage_bot.engine import Engine
+
+
+def run_for(engine, seconds):
+    async def main():
+        asyncio.get_event_loop().call_later(seconds, engine.stop)
+        await engine.run()
+    asyncio.run(main())
+
+
+class TestEngine(unittest.TestCase):
+
+    def test_sub_second_interval(self):
+        engine = Engine()
+        ticks = []
+        engine.every(0.05, lambda: ticks.append(time.monotonic()), name='tick')
+        run_for(engine, 0.53)
+        self.assertGreaterEqual(len(ticks), 9)
+        self.assertLess(engine.stats['tick'].max_lag, 0.05)
+
+    def test_overrun_is_detected_and_skipped(self):
+        engine = Engine()
+        stats = engine.every(0.05, lambda: time.sleep(0.12), name='slow')
+        run_for(engine, 0.5)
+        self.assertGreater(stats.overruns, 0)
+        self.assertLess(stats.runs, 10)
+
+    def test_deadline_miss(self):
+        engine = Engine()
+        stats = engine.every(0.05, lambda: time.sleep(0.1), deadline=0.02, name='late')
+        run_for(engine, 0.4)
+        self.assertGreater(stats.deadline_misses, 0)
+
+    def test_slow_lane_does_not_block_strategy(self):
+        engine = Engine()
+        ticks = []
+        engine.every(0.05, lambda: ticks.append(1), lane='strategy', name='detect')
+        engine.every(0.05, lambda: time.sleep(0.6), lane='reporting', name='report')
+        run_for(engine, 0.5)
+        self.assertGreaterEqual(len(ticks), 8)
+
+    def test_post_runs_on_lane_thread(self):
+        engine = Engine()
+        threads = []
+        engine.every(0.05, lambda: engine.post('reporting', lambda: threads.append(threading.current_thread().name)),
+                     name='poster')
+        run_for(engine, 0.2)
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith('lane-reporting') for name in threads))
+
+    def test_post_runs_inline_when_stopped(self):
+        engine = Engine()
+        calls = []
+        engine.post('reporting', calls.append, 1)
+        self.assertEqual(calls, [1])
+
+if __name__ == '__main__':
+    unittest.main()
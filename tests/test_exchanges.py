@@ -0,0 +1,225 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from crypto_arbitrage_bot.exchanges import (
+    BinanceAdapter, BlockingExchangeAdapter, ExchangeAdapter, ExchangeError, InsufficientFunds, KucoinAdapter,
+    NetworkError, OrderRejected, SimulatedExchange,
+)
+from crypto_arbitrage_bot.exchanges.binance import BINANCE_UNKNOWN_ORDER
+from crypto_arbitrage_bot.inventory import Inventory
+from crypto_arbitrage_bot.rate_limiter import NETWORK_ERRORS
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class BinanceAPIException(Exception):
+    def __init__(self, code):
+        super().__init__(f'APIError(code={code})')
+        self.code = code
+
+
+class OrderNotFound(Exception):
+    pass
+
+
+class RequestTimeout(Exception):
+    pass
+
+
+# Run scheduled requests inline instead of through the venue schedulers
+def direct(venue, lane, endpoint, fn, *args, max_wait=None, **kwargs):
+    return fn(*args, **kwargs)
+
+
+class TestSimulatedExchange(unittest.TestCase):
+
+    def exchange(self, **kwargs):
+        kwargs.setdefault('balances', {'BTC': 1.0, 'USDT': 10000.0})
+        exchange = SimulatedExchange('Sim', **kwargs)
+        exchange.set_book('BTC/USDT', bids=[(99, 1), (98, 2)], asks=[(101, 1), (102, 2)])
+        return exchange
+
+    def test_market_buy_walks_the_book_and_charges_the_fee(self):
+        exchange = self.exchange(fee_rate=0.001)
+        fill = run(exchange.create_order('BTC/USDT', 'buy', 2))
+        self.assertEqual((fill.quantity, fill.status), (2, 'filled'))
+        self.assertAlmostEqual(fill.price, 101.5)
+        self.assertAlmostEqual(fill.fee, 0.203)
+        self.assertAlmostEqual(exchange.free('BTC'), 3.0)
+        self.assertAlmostEqual(exchange.free('USDT'), 10000 - 203 - 0.203)
+        self.assertEqual(list(exchange.books['BTC/USDT'].asks()), [(102.0, 1.0)])
+
+    def test_limit_order_fills_only_up_to_its_price(self):
+        exchange = self.exchange()
+        fill = run(exchange.create_order('BTC/USDT', 'sell', 5, price=98.5))
+        self.assertEqual((fill.quantity, fill.price, fill.status), (1, 99, 'partial'))
+        with self.assertRaises(OrderRejected):
+            run(exchange.create_order('BTC/USDT', 'buy', 1, price=100))
+
+    def test_orders_are_found_by_client_id(self):
+        exchange = self.exchange()
+        fill = run(exchange.create_order('BTC/USDT', 'buy', 0.5, client_id='abc'))
+        self.assertIs(run(exchange.fetch_order('BTC/USDT', 'abc')), fill)
+        self.assertIsNone(run(exchange.fetch_order('BTC/USDT', 'def')))
+
+    def test_orders_beyond_the_balance_are_rejected_untouched(self):
+        exchange = self.exchange(balances={'BTC': 0.5, 'USDT': 50.0})
+        for side in ('buy', 'sell'):
+            with self.assertRaises(InsufficientFunds):
+                run(exchange.create_order('BTC/USDT', side, 1))
+        self.assertEqual((exchange.free('BTC'), exchange.free('USDT')), (0.5, 50.0))
+        self.assertEqual(exchange.books['BTC/USDT'].best_ask, 101)
+        self.assertEqual(exchange.orders_rejected, 2)
+
+    def test_inventory_tracks_the_exchange_without_drift(self):
+        exchange = self.exchange(fee_rate=0.002)
+        inventory = Inventory()
+        inventory.reconcile('Sim', run(exchange.fetch_balances()))
+        for side, quantity in (('buy', 1.5), ('sell', 0.7), ('buy', 0.2)):
+            exchange.set_mid('BTC/USDT', 100, levels=5, size=1)
+            fill = run(exchange.create_order('BTC/USDT', side, quantity))
+            inventory.apply_fill('Sim', 'BTC', 'USDT', fill.side, fill.quantity, fill.price, exchange.fee_rate)
+        self.assertEqual(inventory.reconcile('Sim', run(exchange.fetch_balances())), {})
+
+    def test_requests_wait_for_the_latency(self):
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        exchange = self.exchange(latency=0.05, jitter=0.01, sleep=sleep, seed=1)
+        run(exchange.fetch_order_book('BTC/USDT'))
+        run(exchange.fetch_balances())
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(all(0.05 <= delay <= 0.06 for delay in delays))
+        self.assertEqual(exchange.requests, 2)
+
+    def test_quotes_carry_the_exchange_clock(self):
+        exchange = self.exchange(clock_offset=0.25, clock=lambda: 1000.0)
+        quote = run(exchange.fetch_quote('BTC/USDT'))
+        self.assertEqual((quote.venue, quote.bid, quote.ask), ('Sim', 99, 101))
+        self.assertEqual((quote.exchange_ts, quote.received_at), (1000.25, 1000.0))
+
+    def test_failures_are_retryable_network_errors(self):
+        exchange = self.exchange(error_rate=1.0)
+        with self.assertRaises(NetworkError) as raised:
+            run(exchange.fetch_quote('BTC/USDT'))
+        self.assertIn(type(raised.exception).__name__, NETWORK_ERRORS)
+        self.assertEqual(exchange.free('BTC'), 1.0)
+
+    def test_unknown_market(self):
+        with self.assertRaises(ExchangeError):
+            run(self.exchange().fetch_quote('ETH/USDT'))
+
+
+@mock.patch('crypto_arbitrage_bot.clients.request', side_effect=direct)
+class TestVenueAdapters(unittest.TestCase):
+
+    def test_binance_quote_and_balances(self, _):
+        client = mock.Mock()
+        client.get_ticker.return_value = {'bidPrice': '100.5', 'askPrice': '100.7', 'closeTime': 1700000000000}
+        client.get_account.return_value = {'balances': [{'asset': 'BTC', 'free': '0.5', 'locked': '0.1'}]}
+        adapter = BinanceAdapter(client)
+        quote = run(adapter.fetch_quote('BTC/USDT'))
+        client.get_ticker.assert_called_once_with(symbol='BTCUSDT')
+        self.assertEqual((quote.bid, quote.ask, quote.exchange_ts), (100.5, 100.7, 1700000000.0))
+        self.assertEqual(adapter.balances(), {'BTC': (0.5, 0.1)})
+
+    def test_binance_limit_order_is_immediate_or_cancel(self, _):
+        client = mock.Mock()
+        client.create_order.return_value = {'orderId': 7, 'status': 'PARTIALLY_FILLED', 'executedQty': '0.4',
+                                            'fills': [{'price': '100', 'qty': '0.1'}, {'price': '101', 'qty': '0.3'}]}
+        fill = BinanceAdapter(client, fee_rate=0.001).order('BTC/USDT', 'buy', 1, price=101)
+        client.create_order.assert_called_once_with(symbol='BTCUSDT', side='BUY', quantity=1, type='LIMIT',
+                                                    timeInForce='IOC', price='101.000000')
+        self.assertEqual((fill.quantity, fill.order_id, fill.status), (0.4, 7, 'partial'))
+        self.assertAlmostEqual(fill.price, 100.75)
+        self.assertAlmostEqual(fill.fee, 0.4 * 100.75 * 0.001)
+
+    def test_binance_unfilled_order_is_rejected(self, _):
+        client = mock.Mock()
+        client.create_order.return_value = {'orderId': 8, 'status': 'EXPIRED', 'executedQty': '0'}
+        with self.assertRaises(OrderRejected):
+            BinanceAdapter(client).order('BTC/USDT', 'sell', 1, price=200)
+
+    # What ccxt's KuCoin create_order actually returns: the id and nothing about the fill
+    def kucoin_ack(self, order_id):
+        return {'id': order_id, 'clientOrderId': None, 'status': None, 'filled': None, 'average': None, 'fee': None,
+                'info': {'orderId': order_id}}
+
+    def test_kucoin_order_reads_the_fill_back(self, _):
+        client = mock.Mock()
+        client.create_order.return_value = self.kucoin_ack('k1')
+        client.fetch_order.side_effect = [
+            {'id': 'k1', 'status': 'open', 'filled': 0.4, 'average': 99.0, 'fee': None},
+            {'id': 'k1', 'status': 'closed', 'filled': 1.0, 'average': 99.5, 'fee': {'cost': 0.05, 'currency': 'USDT'}},
+        ]
+        client.fetch_order_book.return_value = {'bids': [[99, 1]], 'asks': [[100, 2]]}
+        adapter = KucoinAdapter(client, settle_delay=0)
+        fill = run(adapter.create_order('BTC/USDT', 'sell', 1))
+        client.create_order.assert_called_once_with('BTC/USDT', 'market', 'sell', 1, None, {})
+        client.fetch_order.assert_called_with('k1', 'BTC/USDT')
+        self.assertEqual((fill.quantity, fill.price, fill.fee, fill.status, fill.order_id),
+                         (1.0, 99.5, 0.05, 'filled', 'k1'))
+        book = adapter.order_book('BTC/USDT', 5)
+        self.assertEqual((book.best_bid, book.best_ask), (99, 100))
+
+    def test_kucoin_base_asset_fee_and_unfilled_order(self, _):
+        client = mock.Mock()
+        client.create_order.return_value = self.kucoin_ack('k2')
+        client.fetch_order.return_value = {'id': 'k2', 'status': 'closed', 'filled': 0.5, 'average': 100.0,
+                                           'fee': {'cost': 0.0005, 'currency': 'BTC'}}
+        fill = KucoinAdapter(client).order('BTC/USDT', 'buy', 1)
+        self.assertEqual((fill.quantity, fill.status), (0.5, 'partial'))
+        self.assertAlmostEqual(fill.fee, 0.05)
+        client.fetch_order.return_value = {'id': 'k2', 'status': 'canceled', 'filled': 0.0}
+        with self.assertRaises(OrderRejected):
+            KucoinAdapter(client).order('BTC/USDT', 'buy', 1, price=90)
+
+    def test_kucoin_order_that_cannot_be_read_back_is_still_accepted(self, _):
+        client = mock.Mock()
+        client.create_order.return_value = self.kucoin_ack('k3')
+        client.fetch_order.side_effect = RequestTimeout('timed out')
+        fill = KucoinAdapter(client, settle_delay=0).order('BTC/USDT', 'buy', 0.01, client_id='abc')
+        client.create_order.assert_called_once_with('BTC/USDT', 'market', 'buy', 0.01, None, {'clientOid': 'abc'})
+        self.assertEqual((fill.order_id, fill.status, fill.quantity, fill.price), ('k3', 'unknown', 0.01, None))
+
+    def test_binance_lookup_by_client_id(self, _):
+        client = mock.Mock()
+        client.get_order.return_value = {'orderId': 5, 'side': 'SELL', 'status': 'FILLED', 'executedQty': '0.01',
+                                          'cummulativeQuoteQty': '500.5'}
+        adapter = BinanceAdapter(client)
+        fill = adapter.find_order('BTC/USDT', 'abc')
+        client.get_order.assert_called_once_with(symbol='BTCUSDT', origClientOrderId='abc')
+        self.assertEqual((fill.side, fill.quantity, fill.order_id, fill.status), ('sell', 0.01, 5, 'filled'))
+        self.assertAlmostEqual(fill.price, 50050.0)
+        client.get_order.return_value = {'status': 'EXPIRED', 'executedQty': '0'}
+        self.assertIsNone(adapter.find_order('BTC/USDT', 'abc'))
+        client.get_order.side_effect = BinanceAPIException(BINANCE_UNKNOWN_ORDER)
+        self.assertIsNone(adapter.find_order('BTC/USDT', 'abc'))
+        client.get_order.side_effect = RequestTimeout('timed out')
+        with self.assertRaises(RequestTimeout):
+            adapter.find_order('BTC/USDT', 'abc')
+
+    def test_kucoin_lookup_by_client_id(self, _):
+        client = mock.Mock()
+        client.fetch_order.return_value = {'id': 'k1', 'side': 'buy', 'status': 'closed', 'filled': 0.01, 'average': 50000.0}
+        adapter = KucoinAdapter(client)
+        fill = adapter.find_order('BTC/USDT', 'abc')
+        client.fetch_order.assert_called_once_with(None, 'BTC/USDT', {'clientOid': 'abc'})
+        self.assertEqual((fill.order_id, fill.side, fill.quantity, fill.status), ('k1', 'buy', 0.01, 'filled'))
+        client.fetch_order.side_effect = OrderNotFound('no such order')
+        self.assertIsNone(adapter.find_order('BTC/USDT', 'abc'))
+
+    def test_adapters_must_implement_the_interface(self, _):
+        with self.assertRaises(TypeError):
+            ExchangeAdapter()
+        with self.assertRaises(TypeError):
+            type('Partial', (BlockingExchangeAdapter,), {'quote': lambda self, symbol, max_wait=None: None})()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import time
+import unittest
+from unittest import mock
+from crypto_arbitrage_bot.executor import DualLegExecutor, Leg
+
+
+def mock_client(delay=0.0, fail=False):
+    client = mock.Mock()
+
+    def create_order(symbol, side, quantity):
+        time.sleep(delay)
+        if fail:
+            raise IOError(f'{side} rejected')
+        return {'symbol': symbol, 'side': side, 'quantity': quantity}
+    client.create_order.side_effect = create_order
+    return client
+
+
+def leg(venue, side, client, quantity=0.01, lookup=None):
+    opposite = 'sell' if side == 'buy' else 'buy'
+    return Leg(venue, side, 'BTC/USDT', quantity,
+               lambda symbol, qty, client_id: client.create_order(symbol, side, qty),
+               lambda symbol, qty, client_id: client.create_order(symbol, opposite, qty),
+               lookup)
+
+
+class TestDualLegExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = DualLegExecutor(retries=1)
+
+    def tearDown(self):
+        self.executor.close()
+
+    def test_legs_are_submitted_concurrently(self):
+        kucoin, binance = mock_client(delay=0.2), mock_client(delay=0.2)
+        started = time.monotonic()
+        report = self.executor.execute(leg('KuCoin', 'buy', kucoin), leg('Binance', 'sell', binance))
+        self.assertLess(time.monotonic() - started, 0.35)
+        self.assertTrue(report.ok)
+        self.assertFalse(report.exposed)
+        self.assertGreaterEqual(self.executor.latency['KuCoin'].last, 0.2)
+        self.assertEqual(self.executor.latency['Binance'].count, 1)
+
+    def test_failed_leg_is_retried_then_filled_leg_unwound(self):
+        kucoin, binance = mock_client(), mock_client(fail=True)
+        report = self.executor.execute(leg('KuCoin', 'buy', kucoin), leg('Binance', 'sell', binance))
+        self.assertFalse(report.ok)
+        self.assertEqual(binance.create_order.call_count, 2)
+        self.assertEqual(report.sell.attempts, 2)
+        self.assertTrue(report.unwind.ok)
+        self.assertEqual(kucoin.create_order.call_args_list[-1], mock.call('BTC/USDT', 'sell', 0.01))
+        self.assertFalse(report.exposed)
+        self.assertEqual(self.executor.latency['Binance'].failures, 2)
+
+    def test_retry_completes_hedge(self):
+        binance = mock_client()
+        binance.create_order.side_effect = [None, {'id': 2}]
+        report = self.executor.execute(leg('KuCoin', 'buy', mock_client()), leg('Binance', 'sell', binance))
+        self.assertTrue(report.ok)
+        self.assertIsNone(report.unwind)
+
+    def test_failed_unwind_is_exposed(self):
+        kucoin = mock_client()
+        kucoin.create_order.side_effect = [{'id': 1}, IOError('down')]
+        report = self.executor.execute(leg('KuCoin', 'buy', kucoin), leg('Binance', 'sell', mock_client(fail=True)))
+        self.assertTrue(report.exposed)
+
+    def test_timed_out_order_that_was_accepted_is_not_resent(self):
+        binance = mock_client()
+        binance.create_order.side_effect = TimeoutError('read timed out')
+        lookup = mock.Mock(return_value={'id': 7, 'status': 'FILLED'})
+        kucoin = mock_client()
+        report = self.executor.execute(leg('KuCoin', 'buy', kucoin), leg('Binance', 'sell', binance, lookup=lookup))
+        self.assertTrue(report.ok)
+        self.assertEqual(binance.create_order.call_count, 1)
+        self.assertEqual(report.sell.order, {'id': 7, 'status': 'FILLED'})
+        lookup.assert_called_once_with('BTC/USDT', report.sell.client_id)
+        self.assertEqual(kucoin.create_order.call_count, 1)  # nothing unwound
+
+    def test_timed_out_order_that_was_never_accepted_is_resent(self):
+        binance = mock_client()
+        binance.create_order.side_effect = [TimeoutError('read timed out'), {'id': 8}]
+        lookup = mock.Mock(return_value=None)
+        report = self.executor.execute(leg('KuCoin', 'buy', mock_client()),
+                                       leg('Binance', 'sell', binance, lookup=lookup))
+        self.assertTrue(report.ok)
+        self.assertEqual(binance.create_order.call_count, 2)
+        self.assertEqual(report.sell.order, {'id': 8})
+
+    def test_unresolved_order_is_neither_resent_nor_unwound(self):
+        binance = mock_client()
+        binance.create_order.side_effect = ConnectionResetError('reset by peer')
+        lookup = mock.Mock(side_effect=ConnectionResetError('still down'))
+        kucoin = mock_client()
+        report = self.executor.execute(leg('KuCoin', 'buy', kucoin), leg('Binance', 'sell', binance, lookup=lookup))
+        self.assertTrue(report.sell.unknown)
+        self.assertTrue(report.exposed)
+        self.assertIsNone(report.unwind)
+        self.assertEqual(binance.create_order.call_count, 1)
+        self.assertEqual(kucoin.create_order.call_count, 1)
+
+    def test_every_submission_gets_its_own_client_id(self):
+        client_ids = []
+
+        def place(symbol, quantity, client_id):
+            client_ids.append(client_id)
+            return None if len(client_ids) == 2 else {'id': client_id}
+
+        self.executor.execute(Leg('KuCoin', 'buy', 'BTC/USDT', 0.01, place), Leg('Binance', 'sell', 'BTCUSDT', 0.01, place))
+        self.assertEqual(len(client_ids), 3)
+        self.assertEqual(len(set(client_ids)), 3)
+
+    def test_client_ids_are_announced_before_each_order_is_sent(self):
+        submitted, sent = [], []
+        kucoin = mock_client()
+        kucoin.create_order.side_effect = lambda symbol, side, quantity: sent.append(side) or {'side': side}
+        on_submit = mock.Mock(side_effect=lambda role, leg, client_id: submitted.append((role, len(sent), client_id)))
+        report = self.executor.execute(leg('KuCoin', 'buy', kucoin), leg('Binance', 'sell', mock_client(fail=True)),
+                                       on_submit)
+        self.assertEqual([role for role, _, _ in submitted if role != 'sell'], ['buy', 'unwind'])
+        self.assertEqual(len([role for role, _, _ in submitted if role == 'sell']), 2)
+        self.assertIn(('buy', 0, report.buy.client_id), submitted)
+        self.assertIn(('unwind', 1, report.unwind.client_id), submitted)
+
+    def test_both_legs_failing_leaves_nothing_to_unwind(self):
+        report = self.executor.execute(leg('KuCoin', 'buy', mock_client(fail=True)),
+                                       leg('Binance', 'sell', mock_client(fail=True)))
+        self.assertFalse(report.ok)
+        self.assertFalse(report.exposed)
+        self.assertIsNone(report.unwind)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from crypto_arbitrage_bot.exchanges.base import fill_price, fill_quantity
+from crypto_arbitrage_bot.inventory import Inventory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.inventory = Inventory(clock=self.clock)
+        self.inventory.reconcile('Binance', {'USDT': (1000.0, 0.0), 'BTC': (0.01, 0.0)})
+        self.inventory.reconcile('KuCoin', {'USDT': (50.0, 0.0), 'BTC': (0.02, 0.005)})
+
+    def test_funds_check_uses_quote_on_buy_venue_and_base_on_sell_venue(self):
+        self.assertTrue(self.inventory.can_afford('Binance', 'KuCoin', 'BTC', 'USDT', 0.015, 50000, 0.001))
+        # 0.015 BTC costs 750 USDT: KuCoin only has 50
+        venue, asset, missing = self.inventory.shortfall('KuCoin', 'Binance', 'BTC', 'USDT', 0.015, 50000, 0.001)
+        self.assertEqual((venue, asset), ('KuCoin', 'USDT'))
+        self.assertAlmostEqual(missing, 750.75 - 50)
+        # Locked BTC cannot be sold
+        self.assertEqual(self.inventory.shortfall('Binance', 'KuCoin', 'BTC', 'USDT', 0.021, 100, 0)[:2], ('KuCoin', 'BTC'))
+
+    def test_fills_update_balances_locally(self):
+        self.inventory.apply_fill('Binance', 'BTC', 'USDT', 'buy', 0.01, 50000, 0.001)
+        self.inventory.apply_fill('KuCoin', 'BTC', 'USDT', 'sell', 0.01, 50100, 0.001)
+        self.assertAlmostEqual(self.inventory.free('Binance', 'BTC'), 0.02)
+        self.assertAlmostEqual(self.inventory.free('Binance', 'USDT'), 1000 - 500.5)
+        self.assertAlmostEqual(self.inventory.free('KuCoin', 'BTC'), 0.01)
+        self.assertAlmostEqual(self.inventory.free('KuCoin', 'USDT'), 50 + 501 * 0.999)
+
+    def test_reconcile_reports_drift_and_skips_stale_snapshots(self):
+        self.clock.now = 10.0
+        self.inventory.apply_fill('Binance', 'BTC', 'USDT', 'buy', 0.01, 50000)
+        # Requested before the fill: applying it would undo the fill
+        self.assertIsNone(self.inventory.reconcile('Binance', {'USDT': (1000.0, 0.0), 'BTC': (0.01, 0.0)}, fetched_at=5.0))
+        self.assertAlmostEqual(self.inventory.free('Binance', 'BTC'), 0.02)
+        drift = self.inventory.reconcile('Binance', {'USDT': (500.0, 0.0), 'BTC': (0.0199, 0.0)}, fetched_at=11.0)
+        self.assertEqual(set(drift), {'BTC'})
+        self.assertAlmostEqual(drift['BTC'], -0.0001)
+        self.assertEqual(self.inventory.free('Binance', 'BTC'), 0.0199)
+        self.assertEqual(self.inventory.age('Binance'), 0.0)
+        self.assertFalse(self.inventory.ready('OKX'))
+
+
+class TestFillParsing(unittest.TestCase):
+
+    def test_binance_and_ccxt_acknowledgements(self):
+        binance = {'executedQty': '0.003', 'fills': [{'price': '50000', 'qty': '0.001'}, {'price': '50003', 'qty': '0.002'}]}
+        self.assertAlmostEqual(fill_quantity(binance, 0.005), 0.003)
+        self.assertAlmostEqual(fill_price(binance, 1.0), 50002.0)
+        ccxt = {'id': '1', 'filled': 0.002, 'average': 50010.0}
+        self.assertEqual((fill_quantity(ccxt, 1), fill_price(ccxt, 1)), (0.002, 50010.0))
+        self.assertEqual((fill_quantity({'id': '1'}, 0.004), fill_price({'id': '1'}, 49990.0)), (0.004, 49990.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+from crypto_arbitrage_bot.config import configure_logging, settings, stop_logging
+from crypto_arbitrage_bot.pricing import calculate_fees, is_arbitrage_opportunity
+
+
+class FormattedOn:
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self):
+        self.thread = threading.current_thread().name
+        return 'value'
+
+
+class TestQueueLogging(unittest.TestCase):
+
+    def setUp(self):
+        root = logging.getLogger()
+        self.saved = (list(root.handlers), root.level, settings.log_format, settings.log_level)
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'bot.log')
+
+    def tearDown(self):
+        stop_logging()
+        root = logging.getLogger()
+        handlers, level, settings.log_format, settings.log_level = self.saved
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+        self.dir.cleanup()
+
+    def read_lines(self):
+        stop_logging()  # drains the queue
+        with open(self.path) as file:
+            return file.read().splitlines()
+
+    def test_formatting_happens_on_the_listener_thread(self):
+        configure_logging(self.path)
+        value = FormattedOn()
+        logging.info('Deferred %s', value)
+        self.assertEqual(self.read_lines()[0].split(' - ', 2)[2], 'Deferred value')
+        self.assertIsNotNone(value.thread)
+        self.assertNotEqual(value.thread, threading.current_thread().name)
+
+    def test_fee_logging_is_level_gated(self):
+        configure_logging(self.path)
+        value = FormattedOn()
+        self.assertEqual(calculate_fees(50000, 'Binance'), 50.0)
+        logging.debug('Never formatted %s', value)
+        self.assertEqual(self.read_lines(), [])
+        self.assertIsNone(value.thread)
+
+    def test_json_records_carry_event_and_arguments(self):
+        settings.log_format = 'json'
+        configure_logging(self.path)
+        self.assertTrue(is_arbitrage_opportunity(50000.0, 50025.5, threshold=10))
+        (line,) = self.read_lines()
+        entry = json.loads(line)
+        self.assertEqual(entry['event'], 'opportunity')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['args'], [50000.0, 50025.5, 25.5])
+        self.assertIn('Difference: $25.50', entry['message'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import unittest
+
+import websockets  # noqa: F401 -- an install requirement: fail here rather than skip the transport test
+
+from crypto_arbitrage_bot.market_stream import (
+    MarketStream, ReplayTransport, TopOfBook, VenueFeed, WebSocketTransport, executable_prices,
+    parse_binance_book_ticker, parse_kucoin_ticker, serve_replay,
+)
+
+
+def binance_message(bid, ask):
+    return json.dumps({'u': 1, 's': 'BTCUSDT', 'b': str(bid), 'B': '1.0', 'a': str(ask), 'A': '2.0'})
+
+
+def kucoin_message(bid, ask):
+    return json.dumps({'type': 'message', 'topic': '/market/ticker:BTC-USDT', 'data': {
+        'bestBid': str(bid), 'bestBidSize': '0.5', 'bestAsk': str(ask), 'bestAskSize': '0.7'}})
+
+
+class TestMarketStream(unittest.TestCase):
+
+    def test_parsers(self):
+        self.assertEqual(parse_binance_book_ticker(binance_message(100, 101)), (100.0, 101.0, 1.0, 2.0))
+        self.assertEqual(parse_kucoin_ticker(kucoin_message(99, 100)), (99.0, 100.0, 0.5, 0.7))
+        self.assertIsNone(parse_kucoin_ticker(json.dumps({'type': 'welcome', 'id': 'x'})))
+
+    def test_fires_only_on_top_of_book_change(self):
+        changes = []
+
+        def on_change(venue, books):
+            changes.append((venue, books[venue].bid, books[venue].ask))
+
+        stream = MarketStream([
+            VenueFeed('Binance', ReplayTransport([
+                binance_message(100, 101), binance_message(100, 101), binance_message(102, 103),
+            ]), parse_binance_book_ticker),
+            VenueFeed('KuCoin', ReplayTransport([
+                json.dumps({'type': 'welcome'}), kucoin_message(99, 100),
+            ]), parse_kucoin_ticker),
+        ], on_change)
+        asyncio.run(stream.run())
+
+        self.assertEqual(sorted(changes), [('Binance', 100.0, 101.0), ('Binance', 102.0, 103.0), ('KuCoin', 99.0, 100.0)])
+
+    def test_dropped_feed_leaves_the_books(self):
+        seen = []
+
+        def on_change(venue, books):
+            seen.append((venue, sorted(books)))
+
+        # Binance's replay ends at once; KuCoin keeps sending after it has gone
+        stream = MarketStream([
+            VenueFeed('Binance', ReplayTransport([binance_message(100, 101)]), parse_binance_book_ticker),
+            VenueFeed('KuCoin', ReplayTransport([kucoin_message(99, 100), kucoin_message(98, 99)], delay=0.01),
+                      parse_kucoin_ticker),
+        ], on_change)
+        asyncio.run(stream.run())
+
+        self.assertEqual(seen, [('Binance', ['Binance']), ('KuCoin', ['KuCoin']), ('KuCoin', ['KuCoin'])])
+        self.assertEqual(stream.books, {})
+
+    def test_executable_prices(self):
+        binance = TopOfBook('Binance', 105, 106)
+        kucoin = TopOfBook('KuCoin', 99, 100)
+        # Buy on KuCoin at its ask, sell on Binance at its bid, whichever order they come in
+        self.assertEqual(executable_prices(binance, kucoin), ('KuCoin', 100, 'Binance', 105))
+        self.assertEqual(executable_prices(kucoin, binance), ('KuCoin', 100, 'Binance', 105))
+
+    def test_uncrossed_books_are_not_executable(self):
+        binance = TopOfBook('Binance', 50000, 50012)
+        kucoin = TopOfBook('KuCoin', 50000, 50012)
+        self.assertIsNone(executable_prices(binance, kucoin))
+        self.assertIsNone(executable_prices(TopOfBook('Binance', 50000, 50012), TopOfBook('KuCoin', 50005, 50020)))
+
+
+class TestWebSocketTransport(unittest.TestCase):
+
+    def test_stream_over_a_local_websocket_server(self):
+        changes = []
+
+        async def scenario():
+            server = await serve_replay([binance_message(100, 101), binance_message(100, 101),
+                                         binance_message(102, 103)], port=0)
+            port = server.sockets[0].getsockname()[1]
+
+            def on_change(venue, books):
+                changes.append((venue, books[venue].bid, books[venue].ask))
+                if len(changes) == 2:
+                    stream.stop()
+
+            stream = MarketStream([VenueFeed('Binance', WebSocketTransport(f'ws://127.0.0.1:{port}'),
+                                             parse_binance_book_ticker)], on_change, reconnect_delay=0.01)
+            try:
+                await asyncio.wait_for(stream.run(), 10)
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(scenario())
+        self.assertEqual(changes, [('Binance', 100.0, 101.0), ('Binance', 102.0, 103.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import urllib.request
+
+from crypto_arbitrage_bot import metrics
+from crypto_arbitrage_bot.metrics import Registry, start_metrics_server
+from crypto_arbitrage_bot.price_fetcher import ConcurrentPriceFetcher
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        latency = registry.histogram('fetch_seconds', 'Fetch latency', ('venue',), buckets=(0.01, 0.1, 1.0))
+        child = latency.labels('Binance')
+        for value in (0.005, 0.01, 0.05, 0.5, 3.0):
+            child.observe(value)
+        text = registry.render()
+        self.assertIn('# TYPE fetch_seconds histogram', text)
+        self.assertIn('fetch_seconds_bucket{venue="Binance",le="0.01"} 2', text)
+        self.assertIn('fetch_seconds_bucket{venue="Binance",le="0.1"} 3', text)
+        self.assertIn('fetch_seconds_bucket{venue="Binance",le="1.0"} 4', text)
+        self.assertIn('fetch_seconds_bucket{venue="Binance",le="+Inf"} 5', text)
+        self.assertIn('fetch_seconds_count{venue="Binance"} 5', text)
+        self.assertIn('fetch_seconds_sum{venue="Binance"} 3.565', text)
+
+    def test_counters_gauges_and_labels(self):
+        registry = Registry()
+        fills = registry.counter('fills', 'Fills', ('venue', 'side'))
+        fills.labels('KuCoin', 'buy').inc()
+        fills.labels('KuCoin', 'buy').inc(2)
+        up = registry.gauge('up', 'Up')
+        up.set(1)
+        text = registry.render()
+        self.assertIn('fills_total{venue="KuCoin",side="buy"} 3.0', text)
+        self.assertIn('up 1', text)
+        with self.assertRaises(ValueError):
+            fills.labels('KuCoin')
+        with self.assertRaises(ValueError):
+            registry.counter('fills', 'Duplicate')
+
+    def test_endpoint_serves_registry(self):
+        registry = Registry()
+        registry.counter('opportunities', 'Opportunities').inc()
+        server = start_metrics_server(0, metrics_registry=registry)
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.server_port}/metrics') as response:
+                self.assertTrue(response.headers['Content-Type'].startswith('text/plain'))
+                self.assertIn('opportunities_total 1.0', response.read().decode())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_price_fetcher_records_latency_and_skew(self):
+        latency = metrics.fetch_latency.labels('Venue A')
+        before_latency, before_skew = latency.count, metrics.quote_skew._default.count
+        fetcher = ConcurrentPriceFetcher({'Venue A': lambda: 100.0, 'Venue B': lambda: 101.0})
+        try:
+            self.assertEqual(fetcher.fetch_pair('Venue A', 'Venue B'), (100.0, 101.0))
+        finally:
+            fetcher.close()
+        self.assertEqual(latency.count, before_latency + 1)
+        self.assertEqual(metrics.quote_skew._default.count, before_skew + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
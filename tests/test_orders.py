@@ -0,0 +1,138 @@
+import unittest
+from unittest import mock
+
+from crypto_arbitrage_bot import market_data, orders
+from crypto_arbitrage_bot.exchanges import Fill
+from crypto_arbitrage_bot.executor import Leg
+
+
+# Run scheduled requests inline instead of through the venue schedulers
+def direct(venue, lane, endpoint, fn, *args, max_wait=None, **kwargs):
+    return fn(*args, **kwargs)
+
+
+class BinanceAPIException(Exception):
+    def __init__(self, code):
+        super().__init__(f'APIError(code={code})')
+        self.code = code
+
+
+class RequestTimeout(Exception):
+    pass
+
+
+@mock.patch('crypto_arbitrage_bot.clients.request', side_effect=direct)
+class TestOrders(unittest.TestCase):
+
+    def test_client_order_ids_are_sent(self, _):
+        binance, kucoin = mock.Mock(), mock.Mock()
+        orders.place_binance_buy_order(binance, 'BTCUSDT', 0.01, 'abc')
+        binance.create_order.assert_called_once_with(symbol='BTCUSDT', quantity=0.01, side='BUY', type='MARKET',
+                                                     newClientOrderId='abc')
+        orders.place_kucoin_sell_order(kucoin, 'BTC/USDT', 0.01, 'def')
+        kucoin.create_order.assert_called_once_with('BTC/USDT', 'market', 'sell', 0.01, None, {'clientOid': 'def'})
+
+    def test_kucoin_fill_is_read_back(self, _):
+        client = mock.Mock()
+        client.create_order.return_value = {'id': 'k1', 'filled': None, 'average': None}
+        client.fetch_order.return_value = {'id': 'k1', 'status': 'closed', 'filled': 0.01, 'average': 50010.0}
+        fill = orders.place_kucoin_buy_order(client, 'BTC/USDT', 0.01, 'abc')
+        client.fetch_order.assert_called_once_with('k1', 'BTC/USDT')
+        self.assertEqual((fill.quantity, fill.price), (0.01, 50010.0))
+        # Accepted but unreadable: still an accepted order
+        client.fetch_order.side_effect = RequestTimeout('timed out')
+        self.assertEqual(orders.place_kucoin_buy_order(client, 'BTC/USDT', 0.01, 'def').order_id, 'k1')
+
+    def test_rejection_returns_none_but_a_timeout_is_raised(self, _):
+        client = mock.Mock()
+        client.create_order.side_effect = BinanceAPIException(-2010)
+        self.assertIsNone(orders.place_binance_sell_order(client, 'BTCUSDT', 0.01, 'abc'))
+        client.create_order.side_effect = None
+        client.create_order.return_value = {'orderId': 3, 'status': 'EXPIRED', 'executedQty': '0'}
+        self.assertIsNone(orders.place_binance_sell_order(client, 'BTCUSDT', 0.01, 'abc'))
+        client.create_order.side_effect = RequestTimeout('timed out')
+        with self.assertRaises(RequestTimeout):
+            orders.place_binance_sell_order(client, 'BTCUSDT', 0.01, 'abc')
+
+    def test_legs_place_and_look_up_through_the_venue_adapters(self, _):
+        binance, kucoin = mock.Mock(), mock.Mock()
+        binance.create_order.return_value = {'orderId': 1, 'status': 'FILLED', 'executedQty': '0.01',
+                                             'cummulativeQuoteQty': '500.0'}
+        binance.get_order.side_effect = BinanceAPIException(-2013)
+        with mock.patch.object(market_data.binance, '_client', binance), \
+                mock.patch.object(market_data.kucoin, '_client', kucoin):
+            leg = orders.binance_leg('buy', 0.01)
+            fill = leg.place(leg.symbol, leg.quantity, 'abc')
+            self.assertIsNone(leg.lookup(leg.symbol, 'def'))
+            leg.unwind(leg.symbol, leg.quantity, 'ghi')
+        binance.create_order.assert_any_call(symbol='BTCUSDT', side='BUY', quantity=0.01, type='MARKET',
+                                             newClientOrderId='abc')
+        self.assertEqual((fill.venue, fill.quantity, fill.price), ('Binance', 0.01, 50000.0))
+        self.assertEqual(binance.create_order.call_args.kwargs['side'], 'SELL')
+        self.assertEqual(orders.kucoin_leg('sell', 0.01).lookup, market_data.kucoin.find_order)
+
+
+@mock.patch('crypto_arbitrage_bot.checkpoint.record')
+class TestTradeState(unittest.TestCase):
+
+    def recorded(self, record, kind):
+        return [call.args[1] for call in record.call_args_list if call.args[0] == kind]
+
+    def test_client_ids_and_acknowledgements_are_persisted(self, record):
+        client_ids = []
+
+        def place(symbol, quantity, client_id):
+            client_ids.append(client_id)
+            # Client ids must be on disk before the order goes out
+            self.assertIn(client_id, [data[role]['client_id'] for data in self.recorded(record, 'order_update')
+                                      for role in ('buy', 'sell') if role in data])
+            return Fill('Binance' if symbol == 'BTCUSDT' else 'KuCoin', symbol, None, quantity, 50000.0,
+                        order_id=len(client_ids))
+
+        legs = {venue: Leg(venue, side, symbol, 0.01, place)
+                for venue, side, symbol in (('KuCoin', 'buy', 'BTC/USDT'), ('Binance', 'sell', 'BTCUSDT'))}
+        with mock.patch.object(orders, 'kucoin_leg', return_value=legs['KuCoin']), \
+                mock.patch.object(orders, 'binance_leg', return_value=legs['Binance']), \
+                mock.patch.object(orders, 'record_fill'):
+            report = orders.execute_trade('KuCoin', 0.01, 50000, 50100)
+        self.assertTrue(report.ok)
+        final = self.recorded(record, 'order_update')[-1]
+        self.assertEqual(final['status'], 'done')
+        self.assertEqual(final['buy']['client_id'], report.buy.client_id)
+        self.assertEqual((final['sell']['venue'], final['sell']['status'], final['sell']['filled']),
+                         ('Binance', 'filled', 0.01))
+        self.assertEqual(self.recorded(record, 'order_closed'), [{'id': final['id']}])
+
+    def test_restart_reconciles_open_trades_on_the_exchanges(self, record):
+        open_orders = {
+            'balanced': {'buy_venue': 'KuCoin', 'status': 'exposed',
+                         'buy': {'venue': 'KuCoin', 'symbol': 'BTC/USDT', 'side': 'buy', 'client_id': 'b1'},
+                         'sell': {'venue': 'Binance', 'symbol': 'BTCUSDT', 'side': 'sell', 'client_id': 's1'}},
+            'one-sided': {'buy_venue': 'KuCoin',
+                          'buy': {'venue': 'KuCoin', 'symbol': 'BTC/USDT', 'side': 'buy', 'client_id': 'b2'},
+                          'sell': {'venue': 'Binance', 'symbol': 'BTCUSDT', 'side': 'sell', 'client_id': 's2'}},
+            'unreachable': {'buy_venue': 'Binance',
+                            'buy': {'venue': 'Binance', 'symbol': 'BTCUSDT', 'side': 'buy', 'client_id': 'b3'}},
+        }
+        exchange = {'b1': Fill('KuCoin', 'BTC/USDT', 'buy', 0.01, 50000.0, order_id='k1'),
+                    's1': Fill('Binance', 'BTCUSDT', 'sell', 0.01, 50100.0, order_id=9),
+                    'b2': Fill('KuCoin', 'BTC/USDT', 'buy', 0.01, 50000.0, order_id='k2'), 's2': None}
+
+        def find(venue, symbol, client_id):
+            if client_id == 'b3':
+                raise RequestTimeout('timed out')
+            return exchange[client_id]
+
+        with mock.patch.object(orders, 'find_order', side_effect=find), self.assertLogs(level='INFO') as logs:
+            orders.report_open_orders(open_orders)
+        self.assertEqual(self.recorded(record, 'order_closed'), [{'id': 'balanced'}, {'id': 'one-sided'}])
+        (update,) = self.recorded(record, 'order_update')
+        self.assertEqual(update, {'id': 'unreachable'})
+        output = '\n'.join(logs.output)
+        self.assertIn('INFO:root:Trade balanced was exposed', output)
+        self.assertIn('left +0.01000000 BTC open', output)
+        self.assertIn('checked again on the next start', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
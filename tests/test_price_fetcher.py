@@ -0,0 +1,50 @@
+import time
+import unittest
+from crypto_arbitrage_bot.price_fetcher import ConcurrentPriceFetcher
+
+
+def slow_price(price, delay):
+    def fetch():
+        time.sleep(delay)
+        return price
+    return fetch
+
+
+class TestConcurrentPriceFetcher(unittest.TestCase):
+
+    def test_fetches_run_concurrently(self):
+        fetcher = ConcurrentPriceFetcher({
+            'Binance': slow_price(50000, 0.2),
+            'KuCoin': slow_price(49900, 0.2),
+            'Other': slow_price(49950, 0.2),
+        })
+        started = time.monotonic()
+        quotes = fetcher.fetch_all()
+        elapsed = time.monotonic() - started
+        fetcher.close()
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(quotes['Binance'].price, 50000)
+        self.assertGreaterEqual(quotes['KuCoin'].latency, 0.2)
+
+    def test_fetch_pair_returns_prices(self):
+        fetcher = ConcurrentPriceFetcher({'Binance': lambda: 50000, 'KuCoin': lambda: 49900})
+        self.assertEqual(fetcher.fetch_pair('Binance', 'KuCoin'), (50000, 49900))
+        fetcher.close()
+
+    def test_fetch_pair_rejects_skewed_quotes(self):
+        fetcher = ConcurrentPriceFetcher({
+            'Binance': slow_price(50000, 0.0),
+            'KuCoin': slow_price(49900, 0.2),
+        }, max_skew=0.05)
+        self.assertIsNone(fetcher.fetch_pair('Binance', 'KuCoin'))
+        fetcher.close()
+
+    def test_failed_venue_is_none(self):
+        def broken():
+            raise IOError('timeout')
+        fetcher = ConcurrentPriceFetcher({'Binance': lambda: 50000, 'KuCoin': broken})
+        self.assertEqual(fetcher.fetch_pair('Binance', 'KuCoin'), (50000, None))
+        fetcher.close()
+
+if __name__ == '__main__':
+    unittest.main()
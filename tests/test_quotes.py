@@ -0,0 +1,75 @@
+import unittest
+
+from crypto_arbitrage_bot.price_fetcher import ConcurrentPriceFetcher
+from crypto_arbitrage_bot.quotes import Quote, QuoteGuard
+
+
+class TestQuoteGuard(unittest.TestCase):
+
+    def setUp(self):
+        self.guard = QuoteGuard(max_age=2.0, max_skew=0.5)
+
+    def warm_up(self, venue, clock_offset, delays):
+        # Quotes produced at local times 0, 1, 2 ... reaching us after `delays`
+        for produced, delay in enumerate(delays):
+            self.guard.observe(Quote(venue, 'BTC/USDT', 100, 101, exchange_ts=produced + clock_offset,
+                                     received_at=produced + delay))
+
+    def test_offset_is_the_least_delayed_sample(self):
+        self.warm_up('Binance', 3.0, [0.2, 0.05, 0.4, 0.1])
+        self.assertAlmostEqual(self.guard.offsets['Binance'], 3.0 - 0.05)
+        quote = Quote('Binance', 'BTC/USDT', 100, 101, exchange_ts=13.0, received_at=10.3)
+        self.assertAlmostEqual(self.guard.produced_at(quote), 10.05)
+
+    def test_fresh_pair_passes(self):
+        self.warm_up('Binance', 3.0, [0.05] * 4)
+        self.warm_up('KuCoin', -1.5, [0.08] * 4)
+        binance = Quote('Binance', 'BTC/USDT', 100, 101, exchange_ts=13.0, received_at=10.05)
+        kucoin = Quote('KuCoin', 'BTC/USDT', 99, 100, exchange_ts=8.6, received_at=10.2)
+        self.assertIsNone(self.guard.check(binance, kucoin, now=10.3))
+
+    def test_quote_stale_at_the_exchange_is_dropped(self):
+        # Just received, but the exchange produced it 3 s earlier than its clock says is current
+        self.warm_up('Binance', 3.0, [0.05] * 4)
+        self.warm_up('KuCoin', -1.5, [0.05] * 4)
+        binance = Quote('Binance', 'BTC/USDT', 100, 101, exchange_ts=10.0, received_at=10.05)
+        kucoin = Quote('KuCoin', 'BTC/USDT', 99, 100, exchange_ts=8.5, received_at=10.05)
+        self.assertEqual(self.guard.check(binance, kucoin, now=10.1), 'stale')
+        self.assertEqual(self.guard.dropped['stale'], 1)
+
+    def test_quotes_produced_too_far_apart_are_dropped(self):
+        self.warm_up('Binance', 0.0, [0.05] * 4)
+        self.warm_up('KuCoin', 0.0, [0.05] * 4)
+        binance = Quote('Binance', 'BTC/USDT', 100, 101, exchange_ts=9.0, received_at=10.0)
+        kucoin = Quote('KuCoin', 'BTC/USDT', 99, 100, exchange_ts=10.0, received_at=10.05)
+        self.assertEqual(self.guard.check(binance, kucoin, now=10.1), 'skew')
+
+    def test_local_age_applies_without_exchange_timestamps(self):
+        binance = Quote('Binance', 'BTC/USDT', 100, 101, received_at=5.0)
+        kucoin = Quote('KuCoin', 'BTC/USDT', 99, 100, received_at=5.1)
+        self.assertIsNone(self.guard.check(binance, kucoin, now=6.0))
+        self.assertEqual(self.guard.check(binance, kucoin, now=8.0), 'stale')
+
+    def test_crossed_or_missing_book_is_invalid(self):
+        good = Quote('Binance', 'BTC/USDT', 100, 101, received_at=5.0)
+        self.assertEqual(self.guard.check(good, Quote('KuCoin', 'BTC/USDT', 101, 100, received_at=5.0), now=5.0), 'invalid')
+        self.assertEqual(self.guard.check(good, Quote('KuCoin', 'BTC/USDT', None, 100, received_at=5.0), now=5.0), 'invalid')
+
+    def test_price_fetcher_applies_the_guard(self):
+        now = [10.0]
+        guard = QuoteGuard(max_age=1.0, clock=lambda: now[0])
+        fetcher = ConcurrentPriceFetcher({
+            'Binance': lambda: Quote('Binance', 'BTC/USDT', 100, 101, received_at=10.0),
+            'KuCoin': lambda: Quote('KuCoin', 'BTC/USDT', 99, 100, received_at=10.0),
+        }, guard=guard)
+        try:
+            binance, kucoin = fetcher.fetch_pair('Binance', 'KuCoin')
+            self.assertEqual((binance.bid, kucoin.ask), (100, 100))
+            now[0] = 12.0
+            self.assertIsNone(fetcher.fetch_pair('Binance', 'KuCoin'))
+        finally:
+            fetcher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
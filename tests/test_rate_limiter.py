@@ -0,0 +1,138 @@
+import threading
+import time
+import unittest
+
+from crypto_arbitrage_bot.rate_limiter import (
+    BALANCES, ORDERS, QUOTES, RateLimitTimeout, RequestScheduler, TokenBucket, is_retryable,
+)
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f'HTTP {status_code}')
+        self.response = type('Response', (), {'status_code': status_code, 'headers': headers or {}})()
+
+
+class NetworkError(Exception):
+    pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_refill_and_sync(self):
+        bucket = TokenBucket('weight', 6000, 60, now=0.0, headroom=0.5)
+        self.assertEqual(bucket.capacity, 3000)
+        bucket.tokens = 0
+        bucket.refill(1.0)
+        self.assertAlmostEqual(bucket.tokens, 50)
+        self.assertAlmostEqual(bucket.wait_time(100, reserve=0), 1.0)
+        bucket.refill(100.0)
+        self.assertEqual(bucket.tokens, 3000)
+        bucket.sync(remaining=1200)  # exchange says 4800 of 6000 used
+        self.assertEqual(bucket.tokens, 600)
+
+
+class TestRequestScheduler(unittest.TestCase):
+
+    def scheduler(self, limits=None, **kwargs):
+        self.clock = FakeClock()
+        return RequestScheduler('Binance', limits or {'weight': (100, 1)}, clock=self.clock, sleep=self.clock.sleep,
+                                rng=lambda: 1.0, **kwargs)
+
+    def test_retries_with_backoff(self):
+        scheduler = self.scheduler()
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise NetworkError('reset')
+            return 'ok'
+        self.assertEqual(scheduler.call(BALANCES, {'weight': 1}, flaky), 'ok')
+        self.assertEqual(self.clock.sleeps, [0.25, 0.5])
+        self.assertEqual(scheduler.stats[BALANCES].retries, 2)
+        self.assertEqual(scheduler.consecutive_failures, 0)
+
+    def test_orders_only_retry_rate_limits(self):
+        scheduler = self.scheduler()
+        attempts = []
+
+        def timeout():
+            attempts.append(1)
+            raise NetworkError('timed out')
+        with self.assertRaises(NetworkError):
+            scheduler.call(ORDERS, {'weight': 1}, timeout)
+        self.assertEqual(len(attempts), 1)  # may have reached the exchange; never resent
+
+        def rate_limited():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise HTTPError(429, {'Retry-After': '2'})
+            return 'filled'
+        self.assertEqual(scheduler.call(ORDERS, {'weight': 1}, rate_limited), 'filled')
+        self.assertGreaterEqual(scheduler.banned_until, 2.0)
+
+    def test_non_retryable_errors_raise(self):
+        self.assertFalse(is_retryable(HTTPError(400)))
+        self.assertTrue(is_retryable(HTTPError(503)))
+        scheduler = self.scheduler()
+        with self.assertRaises(HTTPError):
+            scheduler.call(QUOTES, {'weight': 1}, lambda: (_ for _ in ()).throw(HTTPError(400)))
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_lane_reserve_and_max_wait(self):
+        scheduler = RequestScheduler('Binance', {'weight': (10, 1000)})
+        for _ in range(7):
+            scheduler.call(BALANCES, {'weight': 1}, lambda: None)
+        # Balances may not dip into the last 30%, quotes into the last 10%
+        with self.assertRaises(RateLimitTimeout):
+            scheduler.call(BALANCES, {'weight': 1}, lambda: None, max_wait=0.01)
+        scheduler.call(QUOTES, {'weight': 1}, lambda: None, max_wait=0.01)
+        scheduler.call(ORDERS, {'weight': 2}, lambda: None, max_wait=0.01)
+
+    def test_orders_are_served_before_waiting_quotes(self):
+        scheduler = RequestScheduler('Binance', {'weight': (10, 0.5)})
+        scheduler.buckets['weight'].tokens = 0
+        served = []
+        threads = [threading.Thread(target=scheduler.call, args=(QUOTES, {'weight': 5}, served.append, 'quote'))]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=scheduler.call, args=(ORDERS, {'weight': 5}, served.append, 'order')))
+        threads[1].start()
+        for thread in threads:
+            thread.join(2)
+        self.assertEqual(served, ['order', 'quote'])
+
+    def test_response_headers_drive_buckets(self):
+        scheduler = self.scheduler({'weight': (6000, 60)}, headroom=0.8)
+        response = type('Response', (), {'status_code': 200, 'headers': {'X-MBX-USED-WEIGHT-1M': '5400'}})()
+        scheduler.on_response(response)
+        self.assertAlmostEqual(scheduler.buckets['weight'].tokens, 480)
+        response = type('Response', (), {'status_code': 429, 'headers': {'Retry-After': '30'}})()
+        scheduler.on_response(response)
+        self.assertEqual(scheduler.banned_until, 30.0)
+
+    def test_cool_down_only_holds_market_data(self):
+        scheduler = RequestScheduler('Binance', {'weight': (100, 1)}, rng=lambda: 1.0)
+        scheduler.consecutive_failures = 3
+        self.assertEqual(scheduler.cool_down(), 2.0)
+        scheduler.call(ORDERS, {'weight': 1}, lambda: None, max_wait=0.01)
+        with self.assertRaises(RateLimitTimeout):
+            scheduler.call(QUOTES, {'weight': 1}, lambda: None, max_wait=0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from crypto_arbitrage_bot.scanner import OpportunityScanner
+
+
+class TestOpportunityScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.scanner = OpportunityScanner(['BTC/USDT', 'ETH/USDT'], ['Binance', 'KuCoin', 'OKX'])
+
+    def test_finds_fee_adjusted_spread(self):
+        self.scanner.update('BTC/USDT', 'Binance', 50200, 50210)
+        self.scanner.update('BTC/USDT', 'KuCoin', 49890, 49900)
+        opportunities = self.scanner.scan()
+        self.assertEqual(len(opportunities), 1)
+        best = opportunities[0]
+        self.assertEqual((best.symbol, best.buy_exchange, best.sell_exchange), ('BTC/USDT', 'KuCoin', 'Binance'))
+        self.assertAlmostEqual(best.net_spread, 50200 * 0.999 - 49900 * 1.001)
+
+    def test_fees_remove_thin_spreads(self):
+        self.scanner.update('BTC/USDT', 'Binance', 50010, 50011)
+        self.scanner.update('BTC/USDT', 'KuCoin', 49999, 50000)
+        self.assertEqual(self.scanner.scan(), [])
+
+    def test_ranked_and_limited(self):
+        self.scanner.update('BTC/USDT', 'Binance', 50200, 50210)
+        self.scanner.update('BTC/USDT', 'KuCoin', 49890, 49900)
+        self.scanner.update('ETH/USDT', 'OKX', 3100, 3101)
+        self.scanner.update('ETH/USDT', 'KuCoin', 2990, 3000)
+        self.scanner.update('ETH/USDT', 'Binance', 3040, 3041)
+        ranked = self.scanner.scan()
+        self.assertEqual([(o.symbol, o.buy_exchange, o.sell_exchange) for o in ranked[:2]],
+                         [('ETH/USDT', 'KuCoin', 'OKX'), ('ETH/USDT', 'Binance', 'OKX')])
+        spreads = [o.net_spread_pct for o in ranked]
+        self.assertEqual(spreads, sorted(spreads, reverse=True))
+        self.assertEqual(len(self.scanner.scan(limit=1)), 1)
+        self.assertEqual(self.scanner.scan(limit=1)[0].symbol, 'ETH/USDT')
+
+    def test_scan_restricted_to_rows(self):
+        self.scanner.update('BTC/USDT', 'Binance', 50200, 50210)
+        self.scanner.update('BTC/USDT', 'KuCoin', 49890, 49900)
+        self.scanner.update('ETH/USDT', 'OKX', 3100, 3101)
+        self.scanner.update('ETH/USDT', 'KuCoin', 2990, 3000)
+        self.assertEqual({o.symbol for o in self.scanner.scan(rows=[1])}, {'ETH/USDT'})
+        only_btc = self.scanner.scan(rows=[0])
+        self.assertEqual([(o.symbol, o.buy_exchange, o.buy_price) for o in only_btc], [('BTC/USDT', 'KuCoin', 49900)])
+
+if __name__ == '__main__':
+    unittest.main()
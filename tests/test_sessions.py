@@ -0,0 +1,83 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+try:
+    import requests
+    from crypto_arbitrage_bot.sessions import ExchangeSessionRegistry
+except ImportError:
+    requests = None
+
+
+class TickerHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        body = b'{"price": "50000"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeClient:
+    def __init__(self, http, url):
+        self.http = http
+        self.url = url
+        self.markets_loads = 0
+
+    def ticker(self):
+        return self.http.get(self.url + '/ticker').json()
+
+    def load_markets(self):
+        self.markets_loads += 1
+        return {'BTC/USDT': {}}
+
+
+@unittest.skipIf(requests is None, 'requests is not installed')
+class TestExchangeSessionRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), TickerHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{self.server.server_port}'
+        self.created = 0
+
+        def factory(http):
+            self.created += 1
+            return FakeClient(http, url)
+        self.registry = ExchangeSessionRegistry(markets_ttl=60)
+        self.registry.register('KuCoin', factory, markets_loader=lambda client: client.load_markets())
+
+    def tearDown(self):
+        self.registry.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_single_lazy_client_per_venue(self):
+        self.assertEqual(self.created, 0)
+        self.assertIs(self.registry.get('KuCoin'), self.registry.get('KuCoin'))
+        self.assertEqual(self.created, 1)
+
+    def test_connections_are_reused(self):
+        client = self.registry.get('KuCoin')
+        for _ in range(5):
+            self.assertEqual(client.ticker(), {'price': '50000'})
+        stats = self.registry.stats()['KuCoin']
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['connections_opened'], 1)
+
+    def test_markets_are_cached(self):
+        self.registry.warm_up()
+        self.registry.markets('KuCoin')
+        self.assertEqual(self.registry.get('KuCoin').markets_loads, 1)
+        self.registry.markets('KuCoin', reload=True)
+        self.assertEqual(self.registry.get('KuCoin').markets_loads, 2)
+        self.assertTrue(self.registry.stats()['KuCoin']['markets_cached'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import functools
+import os
+import tempfile
+import time
+import unittest
+
+import numpy
+
+from crypto_arbitrage_bot.sharding import QuoteMatrix, ShardSupervisor, shard_ranges
+
+
+# Execution handler for the supervisor test: runs in the executor process
+def append_opportunity(path, opportunity):
+    with open(path, 'a') as file:
+        file.write(f'{opportunity.symbol},{opportunity.buy_exchange},{opportunity.sell_exchange}\n')
+
+
+class TestQuoteMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = QuoteMatrix(4, 2, n_stats=2)
+        self.reader = QuoteMatrix.attach(self.matrix.layout)
+
+    def tearDown(self):
+        self.reader.close()
+        self.matrix.close()
+
+    def test_shard_ranges_cover_every_symbol(self):
+        self.assertEqual(shard_ranges(10, 3), [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(shard_ranges(2, 8), [(0, 1), (1, 2)])
+        self.assertEqual(shard_ranges(5, 1), [(0, 5)])
+
+    def test_writes_are_visible_through_an_attached_mapping(self):
+        self.matrix.write(1, 0, 100.0, 101.0, exchange_ts=5.0, received_at=6.0)
+        sequences, block, consistent = self.reader.read(0, 4)
+        self.assertEqual(sequences.tolist(), [0, 2, 0, 0])
+        self.assertTrue(consistent.all())
+        self.assertEqual(block[1, 0].tolist(), [100.0, 101.0, 5.0, 6.0])
+        self.assertTrue(numpy.isnan(block[0, 0, 0]))
+
+    def test_rows_mid_write_are_not_consistent(self):
+        self.matrix.write(2, 1, 50.0, 51.0)
+        self.matrix.seq[2] += 1  # writer in the middle of its next update
+        sequences, _, consistent = self.reader.read(0, 4)
+        self.assertEqual(consistent.tolist(), [True, True, False, True])
+
+    def test_write_many(self):
+        self.matrix.write_many([0, 3], [1, 0], [10.0, 30.0], [11.0, 31.0], received_at=1.0)
+        sequences, block, _ = self.reader.read(0, 4)
+        self.assertEqual(sequences.tolist(), [2, 0, 0, 2])
+        self.assertEqual(block[3, 0, :2].tolist(), [30.0, 31.0])
+
+
+class TestShardSupervisor(unittest.TestCase):
+
+    def test_workers_send_opportunities_to_the_executor(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'executed.csv')
+            symbols = [f'SYM{i}/USDT' for i in range(6)]
+            supervisor = ShardSupervisor(symbols, ['Binance', 'KuCoin'], workers=2,
+                                         handler=functools.partial(append_opportunity, path))
+            with supervisor:
+                for symbol in symbols:
+                    supervisor.publish(symbol, 'Binance', 100.0, 100.01)
+                    supervisor.publish(symbol, 'KuCoin', 100.0, 100.01)
+                # One symbol in each shard becomes cheap on KuCoin
+                supervisor.publish('SYM1/USDT', 'KuCoin', 95.0, 95.01)
+                supervisor.publish('SYM4/USDT', 'KuCoin', 95.0, 95.01)
+                deadline = time.monotonic() + 30
+                while supervisor.stats()['executed'] < 2 and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                stats = supervisor.stats()
+            with open(path) as file:
+                executed = sorted(file.read().splitlines())
+        self.assertEqual(executed, ['SYM1/USDT,KuCoin,Binance', 'SYM4/USDT,KuCoin,Binance'])
+        self.assertEqual(len(stats['workers']), 2)
+        self.assertEqual(sum(worker['opportunities'] for worker in stats['workers']), 2)
+        self.assertGreaterEqual(sum(worker['rows'] for worker in stats['workers']), 6)
+
+    def test_restarted_worker_does_not_requeue_standing_opportunities(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'executed.csv')
+            symbols = [f'SYM{i}/USDT' for i in range(4)]
+            supervisor = ShardSupervisor(symbols, ['Binance', 'KuCoin'], workers=2,
+                                         handler=functools.partial(append_opportunity, path))
+
+            def wait_for(executed):
+                deadline = time.monotonic() + 30
+                while supervisor.stats()['executed'] < executed and time.monotonic() < deadline:
+                    time.sleep(0.05)
+
+            with supervisor:
+                supervisor.publish('SYM0/USDT', 'Binance', 100.0, 100.01)
+                supervisor.publish('SYM0/USDT', 'KuCoin', 95.0, 95.01)
+                wait_for(1)
+                self.assertEqual(supervisor.check(), [])
+                supervisor.workers[0].terminate()
+                supervisor.workers[0].join()
+                # Changed while the shard had no worker
+                supervisor.publish('SYM1/USDT', 'Binance', 100.0, 100.01)
+                supervisor.publish('SYM1/USDT', 'KuCoin', 95.0, 95.01)
+                self.assertEqual(supervisor.check(), [0])
+                self.assertTrue(supervisor.workers[0].is_alive())
+                wait_for(2)
+                time.sleep(0.2)
+            with open(path) as file:
+                executed = file.read().splitlines()
+        self.assertEqual(executed, ['SYM0/USDT,KuCoin,Binance', 'SYM1/USDT,KuCoin,Binance'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from crypto_arbitrage_bot.sizing import OrderBook, net_profit, optimal_size
+
+
+class TestOrderBook(unittest.TestCase):
+
+    def test_incremental_updates(self):
+        book = OrderBook(bids=[['100', '1'], ['99', '2']], asks=[['101', '1'], ['102', '3']])
+        self.assertEqual((book.best_bid, book.best_ask), (100.0, 101.0))
+        book.apply_updates(bids=[['100.5', '0.5'], ['100', '0']], asks=[['101', '0'], ['101.5', '2']])
+        self.assertEqual((book.best_bid, book.best_ask), (100.5, 101.5))
+        self.assertEqual(list(book.bids()), [(100.5, 0.5), (99.0, 2.0)])
+        self.assertEqual(list(book.asks()), [(101.5, 2.0), (102.0, 3.0)])
+
+
+class TestOptimalSize(unittest.TestCase):
+
+    def test_net_profit_uses_fee_rates(self):
+        self.assertAlmostEqual(net_profit(49900, 50000, 1), 50000 * 0.999 - 49900 * 1.001)
+        self.assertLess(net_profit(50000, 50010, 1), 0)
+
+    def test_stops_when_marginal_unit_is_unprofitable(self):
+        buy_book = OrderBook(asks=[[100, 1], [100.5, 1], [103, 5]])
+        sell_book = OrderBook(bids=[[102, 1.5], [101, 1], [99, 5]])
+        result = optimal_size(buy_book, sell_book, buy_fee_rate=0.001, sell_fee_rate=0.001)
+        # 100 -> 102 (1.0), 100.5 -> 102 (0.5), 100.5 -> 101 (0.5); 103 -> 101 loses
+        self.assertAlmostEqual(result.quantity, 2.0)
+        expected = (net_profit(100, 102, 1, 0.001, 0.001) + net_profit(100.5, 102, 0.5, 0.001, 0.001)
+                    + net_profit(100.5, 101, 0.5, 0.001, 0.001))
+        self.assertAlmostEqual(result.net_profit, expected)
+        self.assertGreater(result.avg_sell_price, result.avg_buy_price)
+
+    def test_budget_and_quantity_caps(self):
+        buy_book = OrderBook(asks=[[100, 10]])
+        sell_book = OrderBook(bids=[[110, 10]])
+        by_cost = optimal_size(buy_book, sell_book, 0, 0, max_cost=250)
+        self.assertAlmostEqual(by_cost.quantity, 2.5)
+        self.assertAlmostEqual(by_cost.buy_cost, 250)
+        by_quantity = optimal_size(buy_book, sell_book, 0, 0, max_quantity=1)
+        self.assertAlmostEqual(by_quantity.net_profit, 10)
+
+    def test_crossed_fees_or_empty_book_give_zero(self):
+        self.assertEqual(optimal_size(OrderBook(asks=[[100, 1]]), OrderBook(bids=[[100.1, 1]])).quantity, 0)
+        self.assertEqual(optimal_size(OrderBook(), OrderBook(bids=[[110, 1]])).quantity, 0)
+
+if __name__ == '__main__':
+    unittest.main()
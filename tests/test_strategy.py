@@ -0,0 +1,162 @@
+import time
+import unittest
+from unittest import mock
+
+from crypto_arbitrage_bot import market_data, orders, pricing, reporting, strategy
+from crypto_arbitrage_bot.inventory import Inventory
+from crypto_arbitrage_bot.market_stream import TopOfBook
+from crypto_arbitrage_bot.quotes import Quote
+from crypto_arbitrage_bot.sizing import OrderBook, SizingResult
+
+
+class TestStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = Inventory()
+        for venue in ('Binance', 'KuCoin'):
+            self.inventory.reconcile(venue, {'BTC': (1.0, 0.0), 'USDT': (100000.0, 0.0)})
+        patches = [
+            mock.patch.object(strategy, 'engine'),
+            mock.patch.object(market_data, 'inventory', self.inventory),
+            # No order books: size from the quoted prices
+            mock.patch.object(market_data, 'get_price_fetcher', side_effect=RuntimeError('offline')),
+            mock.patch.object(strategy.settings, 'trading_enabled', True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.engine = strategy.engine
+
+    def posted(self, lane):
+        return [call.args[1:] for call in self.engine.post.call_args_list if call.args[0] == lane]
+
+    def test_uncrossed_books_are_not_an_opportunity(self):
+        books = {'Binance': TopOfBook('Binance', 50000, 50012), 'KuCoin': TopOfBook('KuCoin', 50000, 50012)}
+        strategy.on_top_of_book_change('Binance', books)
+        self.engine.post.assert_not_called()
+
+    def test_stale_streamed_books_are_dropped(self):
+        stale = time.monotonic() - strategy.settings.max_quote_age - 1
+        books = {'Binance': TopOfBook('Binance', 50400, 50401, received_at=stale),
+                 'KuCoin': TopOfBook('KuCoin', 49999, 50000)}
+        strategy.on_top_of_book_change('KuCoin', books)
+        self.engine.post.assert_not_called()
+
+        # Fresh when the cross was seen, stale by the time the strategy lane gets to it
+        books['Binance'] = TopOfBook('Binance', 50400, 50401)
+        strategy.on_top_of_book_change('Binance', books)
+        (evaluation,) = self.posted('strategy')
+        books['Binance'].received_at = stale
+        with mock.patch.object(strategy, 'evaluate_arbitrage') as evaluate:
+            strategy.evaluate_streamed(*evaluation[1:])
+        evaluate.assert_not_called()
+
+    def test_polled_uncrossed_quotes_are_not_evaluated(self):
+        fetcher = mock.Mock()
+        fetcher.fetch_pair.return_value = (Quote('Binance', 'BTC/USDT', 49000, 51000),
+                                           Quote('KuCoin', 'BTC/USDT', 49500, 50500))
+        with mock.patch.object(market_data, 'get_price_fetcher', return_value=fetcher), \
+                mock.patch.object(strategy, 'evaluate_arbitrage') as evaluate:
+            strategy.execute_arbitrage()
+        evaluate.assert_not_called()
+
+    def test_trade_is_sent_in_the_direction_of_the_cross(self):
+        books = {'Binance': TopOfBook('Binance', 50400, 50401), 'KuCoin': TopOfBook('KuCoin', 49999, 50000)}
+        strategy.on_top_of_book_change('KuCoin', books)
+        self.assertEqual(self.posted('strategy'), [(strategy.evaluate_streamed, books['Binance'], books['KuCoin'],
+                                                    ('KuCoin', 50000, 'Binance', 50400))])
+
+        strategy.evaluate_streamed(*self.posted('strategy')[0][1:])
+        (trade,) = self.posted('orders')
+        self.assertEqual(trade[0], orders.execute_trade)
+        self.assertEqual((trade[1], trade[3], trade[4]), ('KuCoin', 50000, 50400))
+        (result,) = self.posted('reporting')
+        self.assertEqual(result[:3], (reporting.log_and_print_results, 50400, 50000))
+
+    def test_trade_follows_the_direction_the_books_were_sized_in(self):
+        # The quotes said buy on KuCoin, but by the time the books arrive Binance is the cheap side
+        books = {market_data.get_binance_order_book: OrderBook([(49990, 1)], [(50000, 1)]),
+                 market_data.get_kucoin_order_book: OrderBook([(50500, 1)], [(50510, 1)])}
+        fetcher = mock.Mock()
+        fetcher.submit.side_effect = lambda fn: mock.Mock(result=mock.Mock(return_value=books[fn]))
+        with mock.patch.object(market_data, 'get_price_fetcher', return_value=fetcher):
+            strategy.evaluate_arbitrage('KuCoin', 50000, 'Binance', 50400)
+        (trade,) = self.posted('orders')
+        self.assertEqual((trade[1], trade[3], trade[4]), ('Binance', 50000, 50500))
+        self.assertGreater(trade[2], 0)
+        (result,) = self.posted('reporting')
+        self.assertEqual(result[1:3], (50000, 50500))
+
+    def test_books_without_a_profitable_size_are_not_traded(self):
+        # The quotes cross by $300, but the books have closed the gap: depth says nothing is profitable
+        books = {market_data.get_binance_order_book: OrderBook([(50000, 1)], [(50001, 1)]),
+                 market_data.get_kucoin_order_book: OrderBook([(49999, 1)], [(50000, 1)])}
+        fetcher = mock.Mock()
+        fetcher.submit.side_effect = lambda fn: mock.Mock(result=mock.Mock(return_value=books[fn]))
+        with mock.patch.object(market_data, 'get_price_fetcher', return_value=fetcher):
+            strategy.evaluate_arbitrage('Binance', 50000, 'KuCoin', 50300)
+        self.engine.post.assert_not_called()
+        self.assertIsNone(pricing.evaluate_opportunity('Binance', 50000, 'KuCoin', 50300, 10, 25,
+                                                       size=lambda: SizingResult()))
+
+    def test_opportunity_without_funds_is_still_recorded(self):
+        self.inventory.set_balance('KuCoin', 'USDT', 1.0)
+        strategy.evaluate_arbitrage('KuCoin', 50000, 'Binance', 50400)
+        self.assertEqual(self.posted('orders'), [])
+        (result,) = self.posted('reporting')
+        self.assertEqual(result[0], reporting.log_and_print_results)
+        self.assertEqual(result[-1], 'insufficient USDT on KuCoin')
+
+    def test_funds_are_only_checked_when_trading_on_loaded_balances(self):
+        self.inventory.set_balance('KuCoin', 'USDT', 1.0)
+        with mock.patch.object(strategy.settings, 'trading_enabled', False):
+            strategy.evaluate_arbitrage('KuCoin', 50000, 'Binance', 50400)
+        (result,) = self.posted('reporting')
+        self.assertEqual(len(result), 4)  # recorded without an untraded reason
+
+        # KuCoin's balances have not been fetched yet: only Binance's BTC is checked
+        self.engine.reset_mock()
+        inventory = Inventory()
+        inventory.reconcile('Binance', {'BTC': (1.0, 0.0)})
+        with mock.patch.object(market_data, 'inventory', inventory):
+            strategy.evaluate_arbitrage('KuCoin', 50000, 'Binance', 50400)
+        self.assertEqual(len(self.posted('orders')), 1)
+
+    def test_wrong_way_prices_are_ignored(self):
+        strategy.evaluate_arbitrage('Binance', 50012, 'KuCoin', 50000)
+        self.engine.post.assert_not_called()
+
+
+class TestReporting(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(reporting, 'open_trade_logs'),
+            mock.patch.object(reporting, 'running_totals'),
+            mock.patch.object(reporting, 'save_to_journal'),
+            mock.patch.object(reporting.checkpoint, 'record'),
+            mock.patch.object(reporting.settings, 'headless', True),
+        ]
+        for name in reporting.COUNTERS:
+            patches.append(mock.patch.object(reporting, name, 0))
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_untraded_opportunities_use_no_capital(self):
+        reporting.log_and_print_results(50400, 50000, 3.5, 'insufficient USDT on KuCoin')
+        self.assertEqual((reporting.failed_trades, reporting.amount_used), (1, 0))
+        reporting.log_and_print_results(50400, 50000, 3.5)
+        self.assertEqual((reporting.successful_trades, reporting.amount_used), (1, 50))
+
+    def test_totals_are_logged_with_lazy_arguments(self):
+        reporting.running_totals.summary.return_value = (12.5, 3, 1, 0.25)
+        with self.assertLogs(level='INFO') as logs:
+            reporting.log_totals()
+        self.assertEqual([record.getMessage() for record in logs.records][0],
+                         'Daily Total Profit: $12.50, Successful Trades: 3, Failed Trades: 1, Total Losses: $0.25')
+        self.assertTrue(all(record.args for record in logs.records))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import csv
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from crypto_arbitrage_bot.trade_journal import JOURNAL_HEADER, TradeJournal
+
+
+def trade_row(when, profit):
+    return [when, '$56364.42', '$56347.1', '$17.32', f'${profit:.2f}', 'Successful' if profit >= 0.01 else 'Failed', 'Buy on Kucoin and sell on Binance']
+
+
+class TestTradeJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'journal.csv')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_rows(self, path=None):
+        with open(path or self.path, newline='') as file:
+            return list(csv.reader(file))
+
+    def test_batches_rows_into_one_write(self):
+        journal = TradeJournal(self.path, max_batch=10, flush_interval=60).start()
+        for _ in range(25):
+            journal.append(trade_row('2024-07-08 10:00:00', 1))
+        journal.close()
+        rows = self.read_rows()
+        self.assertEqual(rows[0], JOURNAL_HEADER)
+        self.assertEqual(len(rows), 26)
+        self.assertEqual(journal.batches_written, 3)
+
+    def test_flushes_after_interval(self):
+        journal = TradeJournal(self.path, max_batch=1000, flush_interval=0.05).start()
+        journal.append(trade_row('2024-07-08 10:00:00', 1))
+        time.sleep(0.3)
+        self.assertEqual(len(self.read_rows()), 2)
+        journal.close()
+
+    def test_period_views(self):
+        journal = TradeJournal(self.path).start()
+        journal.append(trade_row('2024-07-10 10:00:00', 2.0))
+        journal.append(trade_row('2024-07-08 10:00:00', -1.0))
+        journal.append(trade_row('2024-07-01 10:00:00', 5.0))
+        journal.append(trade_row('2024-06-30 10:00:00', 7.0))
+        journal.flush()
+        now = datetime(2024, 7, 10, 12, 0, 0)
+        self.assertEqual(journal.summarize('daily', now), (2.0, 1, 0, 0))
+        self.assertEqual(journal.summarize('weekly', now), (1.0, 1, 1, 1.0))
+        self.assertEqual(journal.summarize('monthly', now), (6.0, 2, 1, 1.0))
+        view = os.path.join(self.tmpdir.name, 'monthly.csv')
+        journal.export_period('monthly', view, now)
+        self.assertEqual(len(self.read_rows(view)), 4)
+        journal.close()
+
+    def test_export_keeps_rows_the_journal_never_saw(self):
+        view = os.path.join(self.tmpdir.name, 'daily.csv')
+        with open(view, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(JOURNAL_HEADER)
+            writer.writerow(trade_row('2024-07-09 09:00:00', 3.0))   # from before the journal
+            writer.writerow(trade_row('2024-07-10 08:00:00', 1.0))   # already exported
+        journal = TradeJournal(self.path).start()
+        journal.append(trade_row('2024-07-10 08:00:00', 1.0))
+        journal.append(trade_row('2024-07-10 10:00:00', 2.0))
+        journal.flush()
+        now = datetime(2024, 7, 10, 12, 0, 0)
+        for _ in range(2):
+            journal.export_period('daily', view, now)
+            self.assertEqual([row[0] for row in self.read_rows(view)[1:]],
+                             ['2024-07-09 09:00:00', '2024-07-10 08:00:00', '2024-07-10 10:00:00'])
+        journal.close()
+
+    def test_flush_and_close_give_up_on_a_dead_writer(self):
+        journal = TradeJournal(self.path)
+        journal._run = lambda: None
+        journal.start()._thread.join()
+        journal.append(trade_row('2024-07-08 10:00:00', 1))
+        started = time.monotonic()
+        self.assertFalse(journal.flush(timeout=5))
+        self.assertFalse(journal.close(timeout=5))
+        self.assertLess(time.monotonic() - started, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+from crypto_arbitrage_bot import reporting
+from crypto_arbitrage_bot.trade_journal import TradeJournal
+from crypto_arbitrage_bot.trade_store import (
+    DIRECTION_BUY_KUCOIN_SELL_BINANCE, RESULT_FAILED, RESULT_SUCCESSFUL, TradeStore, make_trade,
+    period_bounds,
+)
+
+
+def epoch(*args):
+    return time.mktime(datetime(*args).timetuple())
+
+
+class TestTradeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TradeStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_make_trade_is_typed(self):
+        trade = make_trade(1.0, 56364.42, 56347.1, 0.0)
+        self.assertEqual(trade[5], RESULT_FAILED)
+        self.assertEqual(trade[6], DIRECTION_BUY_KUCOIN_SELL_BINANCE)
+        self.assertAlmostEqual(trade[3], 17.32, places=2)
+
+    def test_period_summaries_by_range_query(self):
+        self.store.insert_many([
+            make_trade(epoch(2024, 7, 10, 10), 101, 100, 2.0),
+            make_trade(epoch(2024, 7, 8, 10), 101, 100, -1.0),
+            make_trade(epoch(2024, 6, 30, 10), 101, 100, 5.0),
+            make_trade(epoch(2023, 12, 31, 10), 101, 100, 9.0),
+        ])
+        now = datetime(2024, 7, 10, 12)
+        self.assertEqual(self.store.summarize_period('daily', now), (2.0, 1, 0, 0.0))
+        self.assertEqual(self.store.summarize_period('weekly', now), (1.0, 1, 1, 1.0))
+        self.assertEqual(self.store.summarize_period('monthly', now), (1.0, 1, 1, 1.0))
+        self.assertEqual(self.store.summarize_period('quarterly', now), (1.0, 1, 1, 1.0))
+        self.assertEqual(self.store.summarize_period('semiannual', now), (1.0, 1, 1, 1.0))
+        self.assertEqual(self.store.summarize_period('yearly', now), (6.0, 2, 1, 1.0))
+
+    def test_period_bounds_cross_year(self):
+        start, end = period_bounds('quarterly', datetime(2024, 11, 20))
+        self.assertEqual(start, epoch(2024, 10, 1))
+        self.assertEqual(end, epoch(2025, 1, 1))
+
+    def test_import_legacy_csv(self):
+        path = os.path.join(os.path.dirname(__file__), '..', 'weekly_trades_week_27.csv')
+        imported = self.store.import_csv(path)
+        self.assertGreater(imported, 0)
+        rows = self.store.trades(epoch(2024, 7, 7), epoch(2024, 7, 8))
+        self.assertEqual(len(rows), imported)
+        self.assertTrue(all(row[5] in (RESULT_FAILED, RESULT_SUCCESSFUL) for row in rows))
+
+    def test_journal_batches_feed_store(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            journal = TradeJournal(os.path.join(tmpdir, 'journal.csv'), on_batch=self.store.insert_csv_rows)
+            journal.append(['2024-07-10 10:00:00', '$101', '$100', '$1.00', '$2.00', 'Successful', 'x'])
+            journal.close()
+        self.assertEqual(self.store.summarize_period('daily', datetime(2024, 7, 10)), (2.0, 1, 0, 0.0))
+
+    def test_new_store_is_backfilled_from_the_journal_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            journal_path = os.path.join(tmpdir, 'journal.csv')
+            journal = TradeJournal(journal_path)
+            journal.append(['2024-07-10 10:00:00', '$101', '$100', '$1.00', '$2.00', 'Successful', 'x'])
+            journal.close()
+            with mock.patch.object(reporting, 'TRADE_STORE', os.path.join(tmpdir, 'trades.db')), \
+                    mock.patch.object(reporting, 'TRADE_JOURNAL', journal_path):
+                for _ in range(2):
+                    reporting.open_trade_logs()
+                    count = reporting.trade_store.count()
+                    reporting.trade_journal.close()
+                    reporting.trade_store.close()
+                    reporting.trade_store = reporting.trade_journal = reporting.running_totals = None
+                    self.assertEqual(count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
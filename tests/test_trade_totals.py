@@ -0,0 +1,62 @@
+import csv
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from crypto_arbitrage_bot.trade_totals import RunningTotals
+
+
+class TestRunningTotals(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_record_updates_every_period(self):
+        totals = RunningTotals()
+        now = datetime(2024, 7, 8, 12, 0, 0)
+        totals.reset(now)
+        totals.record(2.5, now)
+        totals.record(0.0, now)
+        totals.record(-1.0, now)
+        for period in ('daily', 'weekly', 'monthly'):
+            self.assertEqual(totals.summary(period, now), (1.5, 1, 2, 1.0))
+
+    def test_rolls_over_on_new_period(self):
+        totals = RunningTotals()
+        totals.record(3.0, datetime(2024, 7, 8, 23, 59, 59))
+        next_day = datetime(2024, 7, 9, 0, 0, 1)
+        self.assertEqual(totals.summary('daily', next_day), (0, 0, 0, 0))
+        self.assertEqual(totals.summary('weekly', next_day)[0], 3.0)
+
+    def test_saved_totals_round_trip(self):
+        now = datetime.now()
+        saved = []
+        totals = RunningTotals(on_change=saved.append)
+        totals.record(4.0, now)
+        restored = RunningTotals()
+        self.assertFalse(restored.restore(saved[-1], {}))
+        self.assertEqual(restored.summary('monthly', now), (4.0, 1, 0, 0))
+
+    def test_unreadable_saved_totals_are_rebuilt(self):
+        totals = RunningTotals()
+        self.assertTrue(totals.restore({'daily': {'key': '2024-07-08', 'bogus': 1}}, {}))
+
+    def test_rebuild_from_log_once(self):
+        log_file = os.path.join(self.tmpdir.name, 'daily.csv')
+        with open(log_file, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Time", "Binance BTC/USDT Price", "Kucoin BTC/USDT Price", "Difference", "Profit", "Result", "Recommendation"])
+            writer.writerow(['2024-07-08 10:00:00', '$56364.42', '$56347.1', '$17.32', '$1.50', 'Successful', 'x'])
+            writer.writerow(['2024-07-07 10:00:00', '$56364.42', '$56347.1', '$17.32', '$9.00', 'Successful', 'x'])
+        now = datetime(2024, 7, 8, 12, 0, 0)
+        saved = []
+        totals = RunningTotals(on_change=saved.append)
+        self.assertTrue(totals.restore({}, {'daily': log_file}, now))
+        self.assertEqual(totals.summary('daily', now), (1.5, 1, 0, 0))
+        self.assertEqual(saved, [totals.to_dict()])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import math
+import unittest
+
+from crypto_arbitrage_bot.triangular import TriangularArbitrage
+
+MARKETS = {
+    'BTC/USDT': {'base': 'BTC', 'quote': 'USDT', 'active': True, 'spot': True, 'taker': 0.001},
+    'ETH/USDT': {'base': 'ETH', 'quote': 'USDT', 'active': True, 'spot': True, 'taker': 0.001},
+    'ETH/BTC': {'base': 'ETH', 'quote': 'BTC', 'active': True, 'spot': True, 'taker': 0.001},
+    'SOL/USDT': {'base': 'SOL', 'quote': 'USDT', 'active': True, 'spot': True, 'taker': 0.001},
+    'DEAD/USDT': {'base': 'DEAD', 'quote': 'USDT', 'active': False, 'spot': True},
+    'BTC/USDT:USDT': {'base': 'BTC', 'quote': 'USDT', 'active': True, 'spot': False},
+}
+
+
+class TestTriangularArbitrage(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = TriangularArbitrage.from_ccxt_markets(MARKETS)
+        # Consistent prices: ETH/BTC = ETH/USDT / BTC/USDT, so fees make every cycle lose
+        self.graph.update_many({'BTC/USDT': (50000, 50001), 'ETH/USDT': (2500, 2500.05), 'ETH/BTC': (0.05, 0.050001),
+                                'SOL/USDT': (150, 150.01)})
+
+    def test_builds_graph_from_active_spot_markets(self):
+        self.assertEqual(set(self.graph.market_edges), {'BTC/USDT', 'ETH/USDT', 'ETH/BTC', 'SOL/USDT'})
+        self.assertEqual(self.graph.currencies, {'BTC', 'ETH', 'USDT', 'SOL'})
+        # BTC, ETH and USDT form one triangle in each direction; SOL is in none
+        self.assertEqual(len(self.graph.cycles), 2)
+        self.assertEqual(self.graph.market_cycles['SOL/USDT'], [])
+
+    def test_no_opportunity_when_prices_are_consistent(self):
+        self.assertEqual(self.graph.scan(), [])
+        self.assertIsNone(self.graph.find_negative_cycle())
+
+    def test_update_finds_profitable_triangle_with_fees(self):
+        # ETH cheap in BTC: USDT -> BTC -> ETH -> USDT gains ~2% before 0.3% fees
+        cycles = self.graph.update('ETH/BTC', 0.0489, 0.049)
+        self.assertEqual(len(cycles), 1)
+        cycle = cycles[0]
+        expected = (1 / 50001) * 0.999 * (1 / 0.049) * 0.999 * 2500 * 0.999
+        self.assertAlmostEqual(cycle.rate, expected)
+        self.assertEqual(cycle.currencies, ['BTC', 'ETH', 'USDT'])
+        self.assertEqual(cycle.legs, [('ETH/BTC', 'buy'), ('ETH/USDT', 'sell'), ('BTC/USDT', 'buy')])
+        self.assertGreater(cycle.profit_pct, 0.01)
+
+    def test_min_profit_filters_small_cycles(self):
+        graph = TriangularArbitrage.from_ccxt_markets(MARKETS, min_profit=0.05)
+        graph.update_many({'BTC/USDT': (50000, 50001), 'ETH/USDT': (2500, 2500.05)})
+        self.assertEqual(graph.update('ETH/BTC', 0.0489, 0.049), [])
+
+    def test_unchanged_or_unrelated_quotes_skip_evaluation(self):
+        self.graph.update('ETH/BTC', 0.0489, 0.049)
+        # Same quote again: nothing re-evaluated
+        self.assertEqual(self.graph.update('ETH/BTC', 0.0489, 0.049), [])
+        self.assertEqual(self.graph.update('SOL/USDT', 151, 151.01), [])
+        self.assertEqual(self.graph.update('XRP/USDT', 0.5, 0.51), [])
+        self.assertEqual(len(self.graph.scan()), 1)
+
+    def test_update_many_accepts_ccxt_tickers(self):
+        cycles = self.graph.update_many({'ETH/BTC': {'bid': 0.0489, 'ask': 0.049, 'last': 0.049}, 'XRP/USDT': {'bid': 1, 'ask': 1}})
+        self.assertEqual([cycle.currencies for cycle in cycles], [['BTC', 'ETH', 'USDT']])
+
+    def test_missing_quotes_never_form_a_cycle(self):
+        graph = TriangularArbitrage.from_ccxt_markets(MARKETS)
+        self.assertEqual(graph.update('ETH/BTC', 0.0489, 0.049), [])
+        self.assertEqual(graph.update('BTC/USDT', 50000, None), [])
+        self.assertEqual(graph.weights[('USDT', 'BTC')], math.inf)
+
+    def test_bellman_ford_finds_longer_cycles(self):
+        markets = [('A/B', 'A', 'B'), ('B/C', 'B', 'C'), ('C/D', 'C', 'D'), ('A/D', 'A', 'D')]
+        graph = TriangularArbitrage(markets, fee_rate=0.0)
+        graph.update_many({'A/B': (1.0, 1.0), 'B/C': (1.0, 1.0), 'C/D': (1.0, 1.0), 'A/D': (1.1, 1.1)})
+        # No triangles exist, but D -> C -> B -> A -> D returns 10%
+        self.assertEqual(graph.cycles, [])
+        cycle = graph.find_negative_cycle()
+        self.assertIsNotNone(cycle)
+        self.assertEqual(len(cycle.currencies), 4)
+        self.assertAlmostEqual(cycle.rate, 1.1)
+
+
+if __name__ == '__main__':
+    unittest.main()